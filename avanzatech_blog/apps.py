@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AvanzatechBlogConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'avanzatech_blog'
+
+    def ready(self):
+        from avanzatech_blog import db  # noqa: F401
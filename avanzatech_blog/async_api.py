@@ -0,0 +1,53 @@
+"""
+Helpers for the native async read endpoints (posts, likes and comments under ``async/``).
+
+The async views are plain Django coroutines, because DRF 3.14 views are sync
+only. They mirror the DRF endpoints: same querysets (avanzatech_blog.visibility),
+same serializers, same permission rules (UserHasReadPermission.can_read) and the
+same JSON error bodies. The user comes from the session with ``request.auser()``;
+HTTP Basic auth is only available on the sync endpoints.
+"""
+from functools import wraps
+
+from django.http import JsonResponse
+from django.views.decorators.http import require_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotAuthenticated
+
+
+def async_api_view(view=None, *, authenticated=False):
+    """
+    Turn an async view ``view(request, user, **kwargs)`` into a GET/HEAD endpoint.
+
+    DRF API exceptions raised by the view become ``{"detail": ...}`` responses.
+
+    Args:
+        view (coroutine function): The view; it receives the resolved user after the request.
+        authenticated (bool): Reject anonymous users, like IsAuthenticated.
+
+    Returns:
+        coroutine function: The wrapped view.
+    """
+    if view is None:
+        return lambda view: async_api_view(view, authenticated=authenticated)
+
+    @require_safe
+    @wraps(view)
+    async def wrapper(request, **kwargs):
+        try:
+            user = await request.auser()
+            # Sync code called by the view (serializers) reads request.user; the lazy one would query again
+            request.user = user
+            if authenticated and not user.is_authenticated:
+                raise NotAuthenticated()
+            data = await view(request, user, **kwargs)
+        except APIException as error:
+            return error_response(error)
+        return JsonResponse(data)
+    return wrapper
+
+
+def error_response(error):
+    # Session auth sends no WWW-Authenticate header, so DRF answers 403 rather than 401
+    status_code = status.HTTP_403_FORBIDDEN if isinstance(error, NotAuthenticated) else error.status_code
+    return JsonResponse({'detail': error.detail}, status=status_code)
@@ -0,0 +1,13 @@
+from django.urls import path
+
+from comments.async_views import comment_list
+from likes.async_views import like_list
+from posts.async_views import post_detail, post_list
+
+# Async mirrors of the read endpoints; served natively under ASGI (see avanzatech_blog.async_api)
+urlpatterns = [
+    path('post/', post_list, name='async-post-list'),
+    path('post/<int:id>', post_detail, name='async-post'),
+    path('likes/', like_list, name='async-like-list'),
+    path('comments/', comment_list, name='async-comment-list'),
+]
@@ -0,0 +1,152 @@
+"""
+Conditional GETs and an optional response cache for the post endpoints.
+
+Versions come from Post.modified_at. Counter updates and team changes bump it
+too (see PostQuerySet.add_to_counter and posts.signals), so every field of the
+payload that can change moves the version:
+
+- detail: the post's id and modified_at.
+- list: the ids of the posts on the page and their newest modified_at, read
+  from the page the view loads anyway, so the version costs no query of its
+  own. In page-number mode the paginator's count, which the page links need
+  already, covers posts added or removed elsewhere in the visible set; in
+  cursor mode the links only depend on whether rows follow either end.
+
+With settings.LIKE_WRITE_BEHIND, the version of the like buffer is added to
+both, since buffered likes are counted in like_count before they are stored.
+
+liked_by_me differs between users who see the same posts, so both versions
+include the requester's id, and cached payloads are per user.
+
+The newest comments of ``?comments=N`` only change when a comment is created
+or deleted, and both update comment_count, which bumps modified_at.
+
+The author's username, shown with ``?expand=author``, is not part of the version.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from likes.buffer import like_buffer
+
+
+def requester_class(user):
+    """
+    Return the group of users that get the same list of posts as this user.
+
+    Authenticated users see the ``team`` posts of their team besides the shared ones,
+    so a non-admin member is keyed by team rather than as "authenticated". Their own
+    ``author`` posts differ between teammates, which the user's id in the version covers.
+
+    Args:
+        user (CustomUser | AnonymousUser): The requesting user.
+
+    Returns:
+        str: 'anonymous', 'admin' or 'team:<team>'.
+    """
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.is_admin:
+        return 'admin'
+    return f'team:{user.team}'
+
+
+def make_etag(*parts):
+    if settings.LIKE_WRITE_BEHIND:
+        parts += (like_buffer.version,)
+    return quote_etag(md5('|'.join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified support for post list and detail views.
+
+    A request whose If-None-Match matches gets a 304 before the page is queried or
+    serialized. When settings.POST_RESPONSE_CACHE is on, serialized payloads are also
+    kept in the cache under the requester class and the version, so a new version
+    never serves an old payload and one class never reads another's (the version
+    includes the user's id, for liked_by_me).
+
+    The list version is built from the page, so the page is queried before the 304;
+    what only the response needs goes in prepare_page(), which a 304 skips.
+    """
+    response_cache_prefix = 'response:posts'
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        etag = make_etag(requester_class(request.user), request.user.pk, *self.list_version(rows),
+                         request.get_full_path())
+
+        def render():
+            self.prepare_page(rows)
+            serializer = self.get_serializer(rows, many=True)
+            if page is None:
+                return Response(serializer.data)
+            return self.get_paginated_response(serializer.data)
+        return self.conditional_response(request, etag, None, render)
+
+    def list_version(self, rows):
+        """
+        Return the parts of the list version that come from the page (see the module docstring).
+        """
+        version = [[row.pk for row in rows], max((row.modified_at for row in rows), default=None)]
+        keyset = getattr(self.paginator, 'keyset', None)
+        if keyset is not None:
+            version += [keyset.has_next, keyset.has_previous]
+        elif getattr(self.paginator, 'page', None) is not None:
+            version.append(self.paginator.page.paginator.count)
+        return version
+
+    def prepare_page(self, rows):
+        """
+        Load what the serializer needs for the rows of a list page; not called for a 304.
+        """
+
+    def retrieve(self, request, *args, **kwargs):
+        # get_object() runs the permission checks, so a 304 is only sent to readers of the post
+        instance = self.get_object()
+        etag = make_etag(instance.pk, request.user.pk, instance.modified_at.isoformat(), request.get_full_path())
+
+        def render():
+            return Response(self.get_serializer(instance).data)
+        return self.conditional_response(request, etag, instance.modified_at.timestamp(), render)
+
+    def conditional_response(self, request, etag, last_modified, render):
+        """
+        Answer 304 when the client already has this version, otherwise render or reuse the payload.
+
+        Args:
+            request (Request): The GET request.
+            etag (str): The quoted ETag of the current version.
+            last_modified (float | None): Timestamp for Last-Modified, if the version has one.
+            render (callable): Returns the full Response.
+
+        Returns:
+            HttpResponseBase: The 304 or the 200 response, with the validators set.
+        """
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is None:
+            response = None
+            key = f'{self.response_cache_prefix}:{requester_class(request.user)}:{etag}'
+            if settings.POST_RESPONSE_CACHE:
+                data = cache.get(key)
+                if data is not None:
+                    response = Response(data)
+            if response is None:
+                response = render()
+                if settings.POST_RESPONSE_CACHE and response.status_code == 200:
+                    cache.set(key, response.data, settings.POST_RESPONSE_CACHE_TIMEOUT)
+        else:
+            response = not_modified
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        # The payload depends on who asks, so shared caches must not reuse it across users
+        response['Cache-Control'] = 'private, no-cache'
+        return response
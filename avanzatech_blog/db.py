@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply settings.SQLITE_PRAGMAS to every new SQLite connection.
+
+    WAL lets readers run while a like or comment is being written, and the busy
+    timeout makes concurrent writers queue on the lock instead of failing.
+
+    Args:
+        sender: The database wrapper class.
+        connection (DatabaseWrapper): The connection that was just opened.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {name} = {value}')
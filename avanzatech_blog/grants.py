@@ -0,0 +1,101 @@
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import transaction
+
+EDIT_CODENAME = 'change_post'
+READ_CODENAME = 'view_post'
+GRANTS_CACHE_TIMEOUT = 60 * 60
+
+# Permission rows do not change while the process is alive, so they are resolved once
+_post_permissions = {}
+
+
+def get_post_permissions():
+    """
+    Return the change_post and view_post Permission rows, resolved once per process.
+
+    The rows are created by the post_migrate signal, so they are missing until the
+    posts app has been migrated; callers must treat an empty mapping as "nothing to do".
+
+    Returns:
+        dict: Mapping of codename to Permission, or an empty dict when either row is missing.
+    """
+    if not _post_permissions:
+        permissions = {permission.codename: permission for permission in Permission.objects.filter(
+            content_type__app_label='posts', content_type__model='post',
+            codename__in=[EDIT_CODENAME, READ_CODENAME])}
+        # Only a complete set is kept, so the rows are looked up again once they exist
+        if len(permissions) == 2:
+            _post_permissions.update(permissions)
+    return _post_permissions
+
+
+def reset_post_permissions(**kwargs):
+    """
+    Forget the resolved Permission rows (they are recreated with new ids after a flush).
+    """
+    _post_permissions.clear()
+
+
+def grants_cache_key(user_id):
+    return f'grants:user:{user_id}'
+
+
+def get_user_grants(user):
+    """
+    Return the post permission codenames granted directly to the user.
+
+    The set is read from the cache and only hits the database when the cache is cold.
+
+    Args:
+        user (CustomUser): The authenticated user.
+
+    Returns:
+        frozenset: The granted codenames, e.g. {'change_post', 'view_post'}.
+    """
+    key = grants_cache_key(user.pk)
+    grants = cache.get(key)
+    if grants is None:
+        grants = frozenset(user.user_permissions.filter(content_type__app_label='posts')
+                           .values_list('codename', flat=True))
+        cache.set(key, grants, GRANTS_CACHE_TIMEOUT)
+    return grants
+
+
+async def aget_user_grants(user):
+    """
+    Async version of get_user_grants, for the async middleware path.
+    """
+    key = grants_cache_key(user.pk)
+    grants = await cache.aget(key)
+    if grants is None:
+        grants = frozenset([codename async for codename in user.user_permissions
+                            .filter(content_type__app_label='posts').values_list('codename', flat=True)])
+        await cache.aset(key, grants, GRANTS_CACHE_TIMEOUT)
+    return grants
+
+
+def invalidate_user_grants(user_ids):
+    """
+    Drop the cached grant sets of the given users, now and once the transaction commits.
+
+    A request served before the commit still reads the old grants and may cache them
+    again, so the keys are dropped a second time in transaction.on_commit.
+    """
+    keys = [grants_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def reconcile_read_grant(user):
+    """
+    Give the read permission to a user that holds the edit permission on posts.
+
+    Adding the permission fires m2m_changed, which refreshes the cached grants.
+
+    Args:
+        user (CustomUser): The user to reconcile.
+    """
+    permissions = get_post_permissions()
+    if permissions:
+        user.user_permissions.add(permissions[READ_CODENAME])
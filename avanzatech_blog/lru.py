@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Thread-safe, process-local mapping that evicts the least recently used entry.
+
+    Entries can expire after a time-to-live given per entry or for the whole cache.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept.
+        ttl (float | None): Default time-to-live in seconds, None for no expiry.
+    """
+
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expires_at(self, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        return None if ttl is None else time.monotonic() + ttl
+
+    def _get_entry(self, key):
+        # Must be called with the lock held
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def _store(self, key, value, ttl):
+        # Must be called with the lock held
+        self._data[key] = (value, self._expires_at(ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                return default
+            self._data.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, ttl=None):
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        """
+        Store value only if key is absent.
+
+        Returns:
+            bool: True if the value was stored.
+        """
+        with self._lock:
+            if self._get_entry(key) is not None:
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def purge_expired(self):
+        """
+        Drop every expired entry.
+        """
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._data.items()
+                       if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._get_entry(key) is not None
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,48 @@
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+
+from avanzatech_blog.query_plans import list_view_plans
+from posts.models import Post
+from user.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Prints the query plans of the post, like and comment lists and fails on full table scans.
+
+    The lists are requested as an anonymous user, a member (the first non-admin user, or
+    --user) and an admin, with and without the cursor pagination and the ?post / ?user filters.
+    Run it against a copy of production data after changing a view's queryset or an index.
+    """
+    help = 'Explain the queries of the list endpoints and report full table scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Username of the member to explain the queries for')
+
+    def handle(self, *args, **options):
+        members = CustomUser.objects.filter(is_admin=False)
+        if options['user']:
+            members = members.filter(username=options['user'])
+        member = members.order_by('pk').first()
+        admin = CustomUser.objects.filter(is_admin=True).order_by('pk').first()
+        if member is None:
+            raise CommandError('No non-admin user to explain the queries for')
+        post_id = Post.objects.values_list('pk', flat=True).first() or 0
+
+        requesters = [('anonymous', AnonymousUser()), ('member', member)]
+        if admin is not None:
+            requesters.append(('admin', admin))
+        full_scans = []
+        for role, user in requesters:
+            for name, sql, plan, scans in list_view_plans(user, post_id=post_id, user_id=member.pk):
+                self.stdout.write(f'{role} / {name}' + (self.style.ERROR(' FULL SCAN') if scans else ''))
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'  {sql}')
+                for line in plan:
+                    self.stdout.write(f'    {line}')
+                full_scans += [(role, name, table) for table in scans]
+
+        if full_scans:
+            raise CommandError('Full table scans: ' + ', '.join(f'{table} ({role} / {name})'
+                                                             for role, name, table in full_scans))
+        self.stdout.write(self.style.SUCCESS('No full table scans'))
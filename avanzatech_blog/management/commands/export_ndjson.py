@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from avanzatech_blog.export import EXPORTS, export_lines, export_queryset, parse_watermark
+
+
+class Command(BaseCommand):
+    """
+    Writes every post, like or comment as NDJSON, to a file or to stdout.
+
+    Rows are streamed in chunks (see avanzatech_blog.export), so the memory used does not
+    depend on the size of the table. The watermark printed at the end is the --since of
+    the next incremental export; consecutive exports overlap, so rows are deduplicated by id.
+    """
+    help = 'Export posts, likes or comments as NDJSON, optionally only the rows modified since a watermark'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--since', help='Only rows modified after this ISO 8601 date and time')
+        parser.add_argument('--output', help='File to write; stdout by default')
+        parser.add_argument('--chunk-size', type=int, help='Rows fetched and written at a time')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = parse_watermark(options['since'])
+            except ValueError as error:
+                raise CommandError(str(error))
+        queryset, watermark = export_queryset(options['kind'], since)
+        lines = export_lines(queryset, options['chunk_size'])
+
+        rows = 0
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                for block in lines:
+                    output.write(block)
+                    rows += block.count('\n')
+        else:
+            for block in lines:
+                self.stdout.write(block, ending='')
+                rows += block.count('\n')
+        # Progress goes to stderr so that stdout only carries the rows
+        self.stderr.write(f'Exported {rows} {options["kind"]}, watermark {watermark.isoformat()}')
@@ -0,0 +1,175 @@
+"""
+Per-endpoint request metrics (settings.REQUEST_METRICS).
+
+RequestMetricsMiddleware records, for every request, the resolved URL name,
+the number of database queries, the time spent in the database, the time spent
+serializing (serializers' to_representation plus rendering the response) and
+the wall time. The last settings.REQUEST_METRICS_WINDOW requests of each
+endpoint are kept in memory, per process, and summarised by
+``metrics/requests/`` for admins.
+
+The sample of the running request lives in a context variable, so queries
+that the async views run in a worker thread are still counted for their request.
+"""
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+current_sample = ContextVar('request_metrics_sample', default=None)
+
+# Upper bounds, in milliseconds, of the wall time histogram buckets
+WALL_TIME_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+METRICS = ('wall_ms', 'db_ms', 'serialization_ms', 'queries')
+
+
+class RequestSample:
+    """
+    Measurements of one request, filled in while it runs.
+    """
+    __slots__ = ('queries', 'db_time', 'serialization_time', 'serializing', 'render_started')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialization_time = 0.0
+        self.serializing = False
+        self.render_started = None
+
+
+def enable_query_recording():
+    """
+    Install record_query on the connections of this thread and on every connection opened later.
+    """
+    for wrapper in connections.all(initialized_only=True):
+        install_query_recorder(wrapper)
+    connection_created.connect(on_connection_created, dispatch_uid='request_metrics')
+
+
+def on_connection_created(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+def install_query_recorder(wrapper):
+    if record_query not in wrapper.execute_wrappers:
+        wrapper.execute_wrappers.append(record_query)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Database execute wrapper that adds the query to the current request's sample, if any.
+
+    Installed on every connection once metrics are enabled (see RequestMetricsMiddleware).
+    """
+    sample = current_sample.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.db_time += time.perf_counter() - start
+        sample.queries += 1
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin that adds to_representation time to the current request's sample.
+
+    Nested serializers (e.g. the expanded author) are part of their parent's time.
+    """
+
+    def to_representation(self, instance):
+        sample = current_sample.get()
+        if sample is None or sample.serializing:
+            return super().to_representation(instance)
+        sample.serializing = True
+        start = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            sample.serialization_time += time.perf_counter() - start
+            sample.serializing = False
+
+
+def percentile(values, fraction):
+    # values must be sorted
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class MetricsStore:
+    """
+    Rolling window of samples per endpoint.
+
+    Each entry is (wall_ms, db_ms, serialization_ms, queries). Percentiles are
+    computed when the report is requested, so recording a request is an append.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.windows = {}
+        self.totals = {}
+
+    def add(self, endpoint, wall_ms, db_ms, serialization_ms, queries):
+        with self.lock:
+            window = self.windows.get(endpoint)
+            if window is None:
+                window = self.windows[endpoint] = deque(maxlen=settings.REQUEST_METRICS_WINDOW)
+                self.totals[endpoint] = 0
+            window.append((wall_ms, db_ms, serialization_ms, queries))
+            self.totals[endpoint] += 1
+
+    def clear(self):
+        with self.lock:
+            self.windows.clear()
+            self.totals.clear()
+
+    def report(self):
+        """
+        Summarise every endpoint's window.
+
+        Returns:
+            dict: endpoint -> {'requests', 'window', one {'mean', 'p50', 'p95', 'p99', 'max'}
+            per metric, 'wall_ms_histogram'}, slowest p95 wall time first.
+        """
+        with self.lock:
+            windows = {endpoint: list(window) for endpoint, window in self.windows.items()}
+            totals = dict(self.totals)
+        report = {}
+        for endpoint, samples in windows.items():
+            entry = {'requests': totals[endpoint], 'window': len(samples)}
+            for index, metric in enumerate(METRICS):
+                values = sorted(sample[index] for sample in samples)
+                entry[metric] = {
+                    'mean': round(sum(values) / len(values), 3),
+                    'p50': round(percentile(values, 0.50), 3),
+                    'p95': round(percentile(values, 0.95), 3),
+                    'p99': round(percentile(values, 0.99), 3),
+                    'max': round(values[-1], 3),
+                }
+            entry['wall_ms_histogram'] = histogram([sample[0] for sample in samples])
+            report[endpoint] = entry
+        return dict(sorted(report.items(), key=lambda item: item[1]['wall_ms']['p95'], reverse=True))
+
+
+def histogram(values):
+    """
+    Count the values per WALL_TIME_BUCKETS bucket, labelled '<=N' and '>N' for the last one.
+    """
+    counts = {f'<={bound}': 0 for bound in WALL_TIME_BUCKETS}
+    counts[f'>{WALL_TIME_BUCKETS[-1]}'] = 0
+    for value in values:
+        for bound in WALL_TIME_BUCKETS:
+            if value <= bound:
+                counts[f'<={bound}'] += 1
+                break
+        else:
+            counts[f'>{WALL_TIME_BUCKETS[-1]}'] += 1
+    return counts
+
+
+request_metrics = MetricsStore()
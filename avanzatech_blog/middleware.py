@@ -1,27 +1,111 @@
-from django.contrib.auth.models import Permission
-from django.contrib.contenttypes.models import ContentType
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from avanzatech_blog.grants import (EDIT_CODENAME, READ_CODENAME, aget_user_grants, get_user_grants,
+                                    reconcile_read_grant)
+from avanzatech_blog.metrics import RequestSample, current_sample, enable_query_recording, request_metrics
 
 class AutoReadPermissionMiddleware:
     """
     Middleware class that automatically grants read permission to users who have edit permission on posts.
+
+    Grants are normally reconciled when the edit permission is added (see user.signals). The middleware
+    only checks the cached grant set and repairs users whose edit permission was stored some other way,
+    so a warm request does not touch the database.
+
+    It runs natively in both stacks, so ASGI requests to async views do not switch to a thread for it.
     """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
-        
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
     def __call__(self, request):
-        content_type = ContentType.objects.get(
-            app_label='posts',
-            model='post')
-        edit_permission = Permission.objects.get(content_type = content_type,
-                                                codename='change_post')
-        if edit_permission in request.user.user_permissions.all():
-            
-            # User has the 'edit' permission on posts - give them read access too.
-            read_permission = Permission.objects.get(content_type = content_type,
-                                                codename='view_post')
-            if read_permission not in request.user.user_permissions.all():
-                request.user.user_permissions.add(read_permission)
-                request.user.save()
-                
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            grants = get_user_grants(user)
+            if EDIT_CODENAME in grants and READ_CODENAME not in grants:
+                # User has the 'edit' permission on posts - give them read access too.
+                reconcile_read_grant(user)
+
         return self.get_response(request)
-    
\ No newline at end of file
+
+    async def __acall__(self, request):
+        auser = getattr(request, 'auser', None)
+        user = await auser() if auser is not None else None
+        if user is not None and user.is_authenticated:
+            grants = await aget_user_grants(user)
+            if EDIT_CODENAME in grants and READ_CODENAME not in grants:
+                await sync_to_async(reconcile_read_grant)(user)
+
+        return await self.get_response(request)
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, database time, serialization time and wall time per URL name.
+
+    Enabled with settings.REQUEST_METRICS; when it is off, Django drops the middleware
+    at startup (MiddlewareNotUsed), so requests do not pay for it. The figures are
+    reported by avanzatech_blog.views.RequestMetricsView (see avanzatech_blog.metrics).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        enable_query_recording()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, sample, start)
+        return response
+
+    async def __acall__(self, request):
+        sample = RequestSample()
+        token = current_sample.set(sample)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_sample.reset(token)
+        self.record(request, sample, start)
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered right after this hook; rendering counts as serialization
+        sample = current_sample.get()
+        if sample is not None:
+            sample.render_started = time.perf_counter()
+            response.add_post_render_callback(lambda response: self.rendered(sample))
+        return response
+
+    def rendered(self, sample):
+        sample.serialization_time += time.perf_counter() - sample.render_started
+
+    def record(self, request, sample, start):
+        wall_time = time.perf_counter() - start
+        match = request.resolver_match
+        endpoint = (match.view_name or match.route) if match is not None else 'unresolved'
+        request_metrics.add(endpoint, wall_time * 1000, sample.db_time * 1000,
+                            sample.serialization_time * 1000, sample.queries)
@@ -0,0 +1,197 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination:
+    """
+    Cursor pagination keyed on (created_at, id), newest first.
+
+    The cursor stores the position of the last row sent, so every page is an
+    indexed range scan with no OFFSET and no COUNT. Rows inserted while a client
+    is paging are newer than the cursor and never shift the following pages.
+
+    Attributes:
+        cursor_query_param (str): Query parameter that carries the cursor.
+        ordering (tuple): Ordering applied to the queryset; id breaks created_at ties.
+    """
+    cursor_query_param = 'cursor'
+    ordering = ('-created_at', '-id')
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, page_size):
+        self.page_size = page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        position, reverse = self.decode_cursor(request)
+
+        if reverse:
+            queryset = queryset.order_by('created_at', 'id')
+            if position is not None:
+                queryset = queryset.filter(Q(created_at__gt=position[0]) |
+                                           Q(created_at=position[0], id__gt=position[1]))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(Q(created_at__lt=position[0]) |
+                                           Q(created_at=position[0], id__lt=position[1]))
+
+        # Una fila extra indica si hay otra pagina en esa direccion
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.page = results
+        return results
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_cursor(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param,
+                                   self.encode_cursor(self.page[0], reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def encode_cursor(self, obj, reverse):
+        raw = f'{obj.created_at.isoformat()}|{obj.pk}|{int(reverse)}'
+        return urlsafe_b64encode(raw.encode()).decode()
+
+    def decode_cursor(self, request):
+        """
+        Return ((created_at, id), reverse) for the cursor in the request, or (None, False).
+
+        Raises:
+            NotFound: If the cursor cannot be decoded.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            created_at, pk, reverse = urlsafe_b64decode(encoded.encode()).decode().split('|')
+            return (datetime.fromisoformat(created_at), int(pk)), reverse == '1'
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class BlogPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset cursor mode.
+
+    Clients keep using ``?page=N`` unchanged. Sending ``?pagination=cursor`` (or
+    following a ``cursor`` link) switches to KeysetPagination, which avoids the
+    OFFSET scan and the COUNT(*) over the permission-filtered set.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    mode_query_param = 'pagination'
+    keyset_pagination_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.use_cursor(request):
+            self.keyset = self.keyset_pagination_class(self.get_page_size(request))
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def use_cursor(self, request):
+        return (request.query_params.get(self.mode_query_param) == 'cursor' or
+                self.keyset_pagination_class.cursor_query_param in request.query_params)
+
+
+class SearchPagination(PageNumberPagination):
+    """
+    Page numbers over ranked search results; the cursor mode does not apply since rank is not a stable key.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class AsyncPagination:
+    """
+    Page-number pagination for the async views, which run outside DRF.
+
+    Reads ``?page`` and ``?page_size`` like BlogPagination and builds the same
+    count/next/previous/results payload, using acount() and ``async for``.
+
+    Attributes:
+        page_size (int): Default page size.
+        max_page_size (int): Upper bound for ``?page_size``.
+    """
+    page_query_param = 'page'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_page_message = 'Invalid page.'
+
+    def __init__(self, page_size=None):
+        self.page_size = page_size or settings.REST_FRAMEWORK['PAGE_SIZE']
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(request.GET[self.page_size_query_param], strict=True, cutoff=self.max_page_size)
+        except (KeyError, ValueError):
+            return self.page_size
+
+    async def paginate_queryset(self, queryset, request):
+        """
+        Return the objects of the requested page.
+
+        Raises:
+            NotFound: If the page number is not a valid page.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.count = await queryset.acount()
+        self.num_pages = max(1, -(-self.count // page_size))
+        try:
+            self.page_number = int(request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+        if not 1 <= self.page_number <= self.num_pages:
+            raise NotFound(self.invalid_page_message)
+        offset = (self.page_number - 1) * page_size
+        return [obj async for obj in queryset[offset:offset + page_size]]
+
+    def get_page_link(self, number):
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
+
+    def get_paginated_data(self, data):
+        return {
+            'count': self.count,
+            'next': self.get_page_link(self.page_number + 1) if self.page_number < self.num_pages else None,
+            'previous': self.get_page_link(self.page_number - 1) if self.page_number > 1 else None,
+            'results': data,
+        }
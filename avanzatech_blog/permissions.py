@@ -1,3 +1,4 @@
+from django.db.models import Q
 from rest_framework.permissions import BasePermission, DjangoObjectPermissions
 from posts.models import Post
 class UserHasEditPermission(BasePermission):
@@ -26,9 +27,10 @@ class UserHasEditPermission(BasePermission):
             elif obj.edit_permission == Post.AUTHENTICATED:
                 return request.user.is_authenticated
             elif obj.edit_permission == Post.TEAM:
-                return request.user.team == obj.author.team
+                # Post.team is the author's team; request.user may be built from token claims
+                return request.user.team == obj.team
             elif obj.edit_permission == Post.AUTHOR:
-                return request.user == obj.author
+                return request.user.pk == obj.author_id
         else:
             # If the user is not authenticated, they can edit posts with 'public' edit permission
             if obj.edit_permission == Post.PUBLIC:
@@ -50,16 +52,34 @@ class UserHasReadPermission(BasePermission):
 
     message = "You do not have permission to perform this action."   
     def has_object_permission(self, request, view, obj):
+        return self.can_read(request.user, obj)
+
+    @staticmethod
+    def can_read(user, obj):
+        """
+        Apply the read rules to one post, without touching the database.
+
+        Shared with the async views (see posts.async_views). Only the user's id, team and
+        is_admin are read, which bearer tokens carry (see avanzatech_blog.tokens), and the
+        post's team copy stands for its author's team.
+
+        Args:
+            user (CustomUser | AnonymousUser): The requesting user.
+            obj (Post): The post.
+
+        Returns:
+            bool: True if the user can read the post.
+        """
         # Comprueba cuales son los permisos de lectura del post
-        if request.user.is_authenticated:
-            if request.user.is_admin:
+        if user.is_authenticated:
+            if user.is_admin:
                 return True
             if obj.read_permission in ['public', 'authenticated']:
                 return True
             if obj.read_permission == 'team':
-                return request.user.team == obj.author.team
+                return user.team == obj.team
             if obj.read_permission == 'author':
-                return request.user == obj.author
+                return user.pk == obj.author_id
         else:
             # Si el usuario no está autenticado, solo puede leer los posts que tienen read_permission igual a 'public'
             if obj.read_permission == 'public':
@@ -67,6 +87,27 @@ class UserHasReadPermission(BasePermission):
 
         return False
 
+    @staticmethod
+    def readable_posts_filter(user):
+        """
+        Express has_object_permission as a filter, so a whole set of posts can be checked in one query.
+
+        Post.team is the copy of the author's team, so the team rule needs no join.
+
+        Args:
+            user (CustomUser | AnonymousUser): The requesting user.
+
+        Returns:
+            Q | None: The filter matching readable posts, or None when every post is readable.
+        """
+        if user.is_authenticated:
+            if user.is_admin:
+                return None
+            return (Q(read_permission__in=[Post.PUBLIC, Post.AUTHENTICATED]) |
+                    Q(read_permission=Post.TEAM, team=user.team) |
+                    Q(read_permission=Post.AUTHOR, author_id=user.pk))
+        return Q(read_permission=Post.PUBLIC)
+
 
 class IsCustomAdminUser(BasePermission):
     """
@@ -0,0 +1,135 @@
+"""
+Query plans of the list endpoints, to check that they are served by indexes.
+
+Each case sends a request to a list view (posts, likes, comments) as a given
+user, captures the SELECTs the view runs and asks the database for their plans.
+A plan step that reads a whole table without an index ("SCAN posts_post" on
+SQLite, "Seq Scan on posts_post" on PostgreSQL) is reported as a full scan,
+unless the query stops after one page (see reads_one_page).
+The ``explain_queries`` command prints the plans and the tests fail on any
+full scan (tests/avanzatech_blog/test_query_plans.py).
+
+SQLite only picks a plan from the indexes it has, so the plans do not depend on
+the amount of data. PostgreSQL uses table statistics and prefers a sequential
+scan on small tables; run the command there against a database of realistic size.
+The tests run on small tables, so on PostgreSQL they turn enable_seqscan off: a
+Seq Scan that remains has no index to use.
+"""
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from comments.views import CommentListView
+from likes.views import LikeListView
+from posts.views import PostCreateView
+
+# (name, view, query string)
+CASES = [
+    ('post list', PostCreateView, ''),
+    ('post list, cursor', PostCreateView, 'pagination=cursor'),
+    ('post list, latest comments', PostCreateView, 'comments=3'),
+    ('like list', LikeListView, ''),
+    ('like list, cursor', LikeListView, 'pagination=cursor'),
+    ('like list by post', LikeListView, 'post_id={post_id}'),
+    ('like list by user', LikeListView, 'user_id={user_id}'),
+    ('comment list', CommentListView, ''),
+    ('comment list, cursor', CommentListView, 'pagination=cursor'),
+    ('comment list by post', CommentListView, 'post={post_id}'),
+    ('comment list by user', CommentListView, 'user={user_id}'),
+]
+
+FULL_SCAN_PATTERNS = {
+    # "SCAN t USING INDEX i" walks an index in order and stops at the page limit
+    'sqlite': re.compile(r'\bSCAN (\w+)(?! USING (?:COVERING )?INDEX)(?:\s|$)'),
+    'postgresql': re.compile(r'\bSeq Scan on (\w+)'),
+}
+# SQLite names the subqueries it runs as co-routines (e.g. "qualify", the filter on a
+# window function); scanning their output does not read a table
+SUBQUERY_PATTERN = re.compile(r'\b(?:CO-ROUTINE|MATERIALIZE) (\w+)')
+
+
+def explain(sql, using=connection):
+    """
+    Return the plan of a SELECT as a list of lines.
+
+    Args:
+        sql (str): A query with its parameters already in place, as captured by CaptureQueriesContext.
+        using (DatabaseWrapper): The connection to ask.
+
+    Returns:
+        list: One line per plan step.
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if using.vendor == 'sqlite' else 'EXPLAIN '
+    with using.cursor() as cursor:
+        cursor.execute(prefix + sql)
+        rows = cursor.fetchall()
+    if using.vendor == 'sqlite':
+        # (id, parent, notused, detail)
+        return [row[-1] for row in rows]
+    return [' '.join(str(value) for value in row) for row in rows]
+
+
+def full_scans(plan, vendor=None):
+    """
+    Return the tables that a plan reads without an index.
+
+    Only SQLite and PostgreSQL plans are checked; other databases return no tables.
+    Scans of a subquery's rows are not reported.
+    """
+    pattern = FULL_SCAN_PATTERNS.get(vendor or connection.vendor)
+    if pattern is None:
+        return []
+    subqueries = {match.group(1) for line in plan for match in SUBQUERY_PATTERN.finditer(line)}
+    return [match.group(1) for line in plan for match in pattern.finditer(line)
+            if match.group(1) not in subqueries]
+
+
+def view_queries(view_class, user, query_string=''):
+    """
+    Run a list view's GET as the user and return the SELECTs it sent.
+
+    Args:
+        view_class (APIView): The view to call.
+        user (CustomUser | AnonymousUser): The requesting user.
+        query_string (str): Query parameters of the request.
+
+    Returns:
+        list: The SQL of every SELECT, with its parameters in place.
+    """
+    request = APIRequestFactory().get(f'/?{query_string}')
+    force_authenticate(request, user=user)
+    with CaptureQueriesContext(connection) as queries:
+        response = view_class.as_view()(request)
+        response.render()
+    return [query['sql'] for query in queries if query['sql'].lstrip().upper().startswith('SELECT')]
+
+
+def reads_one_page(sql, plan):
+    """
+    Tell whether a query stops after its LIMIT: no WHERE and no sort, e.g. the admins' unfiltered page.
+
+    Such a query reads the rows of one page even when its plan is a table scan.
+    """
+    return ' LIMIT ' in sql and ' WHERE ' not in sql and not any('TEMP B-TREE' in line for line in plan)
+
+
+def list_view_plans(user, post_id=0, user_id=0):
+    """
+    Explain the queries of every case in CASES for the user.
+
+    Args:
+        user (CustomUser): The requesting user.
+        post_id (int): Post used by the ``by post`` filters.
+        user_id (int): User used by the ``by user`` filters.
+
+    Returns:
+        list: (case name, sql, plan lines, tables read with a full scan) per query.
+    """
+    results = []
+    for name, view_class, query_string in CASES:
+        for sql in view_queries(view_class, user, query_string.format(post_id=post_id, user_id=user_id)):
+            plan = explain(sql)
+            results.append((name, sql, plan, [] if reads_one_page(sql, plan) else full_scans(plan)))
+    return results
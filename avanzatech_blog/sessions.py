@@ -0,0 +1,75 @@
+"""
+In-process session engine for single-node deployments.
+
+Enable it with SESSION_STORE = 'memory' (or BLOG_SESSION_STORE=memory). Sessions live in a
+per-process LRU, so reading or updating one never touches the database. They are lost on
+restart and are not shared between processes: use 'cached_db' when running several workers.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends.base import CreateError, SessionBase, UpdateError
+
+from avanzatech_blog.lru import LRUCache
+
+_sessions = None
+
+
+def get_session_cache():
+    """
+    Return the process-wide session LRU, created on first use from SESSION_MEMORY_MAX_ENTRIES.
+    """
+    global _sessions
+    if _sessions is None:
+        _sessions = LRUCache(maxsize=settings.SESSION_MEMORY_MAX_ENTRIES)
+    return _sessions
+
+
+class SessionStore(SessionBase):
+    """
+    Session store kept in the process-local LRU.
+    """
+
+    def load(self):
+        session_data = get_session_cache().get(self._get_or_create_session_key())
+        if session_data is not None:
+            return dict(session_data)
+        self._session_key = None
+        return {}
+
+    def create(self):
+        for i in range(10000):
+            self._session_key = self._get_new_session_key()
+            try:
+                self.save(must_create=True)
+            except CreateError:
+                continue
+            self.modified = True
+            return
+        raise RuntimeError("Unable to create a new session key.")
+
+    def save(self, must_create=False):
+        if self.session_key is None:
+            return self.create()
+        sessions = get_session_cache()
+        # Se guarda una copia para que los cambios de la solicitud no se filtren sin save()
+        session_data = dict(self._get_session(no_load=must_create))
+        if must_create:
+            if not sessions.add(self.session_key, session_data, self.get_expiry_age()):
+                raise CreateError
+        elif self.session_key in sessions:
+            sessions.set(self.session_key, session_data, self.get_expiry_age())
+        else:
+            raise UpdateError
+
+    def exists(self, session_key):
+        return bool(session_key) and session_key in get_session_cache()
+
+    def delete(self, session_key=None):
+        if session_key is None:
+            if self.session_key is None:
+                return
+            session_key = self.session_key
+        get_session_cache().delete(session_key)
+
+    @classmethod
+    def clear_expired(cls):
+        get_session_cache().purge_expired()
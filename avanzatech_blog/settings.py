@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+import django
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -41,6 +45,7 @@ INSTALLED_APPS = [
     'posts',
     'comments',
     'likes',
+    'avanzatech_blog.apps.AvanzatechBlogConfig',
     'rest_framework',
     'django_filters',
     'coreapi',
@@ -49,19 +54,28 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'avanzatech_blog.middleware.AutoReadPermissionMiddleware'
+    'avanzatech_blog.middleware.AutoReadPermissionMiddleware',
+    'avanzatech_blog.middleware.RequestMetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'avanzatech_blog.urls'
 
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Session storage:
+# - 'db': every request reads the django_session table
+# - 'cached_db': reads come from the cache, writes go through to the table (default)
+# - 'memory': per-process LRU, no database access; single-node deployments only
+SESSION_STORE = os.environ.get('BLOG_SESSION_STORE', 'cached_db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'memory': 'avanzatech_blog.sessions',
+}[SESSION_STORE]
+SESSION_MEMORY_MAX_ENTRIES = 10000  # Sessions kept per process by the 'memory' store
 SESSION_COOKIE_AGE = 1209600  # 2 weeks, in seconds
 SESSION_COOKIE_SECURE = True  # Send the cookie only over HTTPS
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access to session cookie
@@ -89,13 +103,77 @@ WSGI_APPLICATION = 'avanzatech_blog.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# The backend is picked with BLOG_DB_PROFILE:
+# - 'sqlite' (default): local file, WAL journal and a busy timeout (see avanzatech_blog.db)
+# - 'postgres': connection settings from BLOG_DB_NAME/USER/PASSWORD/HOST/PORT
+# Connections are kept open for CONN_MAX_AGE seconds instead of one per request.
+DB_PROFILE = os.environ.get('BLOG_DB_PROFILE', 'sqlite')
+DB_CONN_MAX_AGE = int(os.environ.get('BLOG_DB_CONN_MAX_AGE', 60))
+# Seconds a SQLite writer waits for the lock before failing with "database is locked"
+SQLITE_BUSY_TIMEOUT = int(os.environ.get('BLOG_SQLITE_BUSY_TIMEOUT', 20))
+# Applied to every new SQLite connection by avanzatech_blog.db.configure_sqlite
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',  # Readers no longer block the writer
+    'synchronous': 'NORMAL',  # Safe with WAL, fsync only at checkpoints
+    'busy_timeout': SQLITE_BUSY_TIMEOUT * 1000,
 }
 
+if DB_PROFILE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('BLOG_DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'OPTIONS': {'timeout': SQLITE_BUSY_TIMEOUT},
+            # The in-memory test database uses a shared cache, where concurrent writers fail
+            # immediately instead of waiting; a file lets the concurrency tests queue on the lock
+            'TEST': {'NAME': BASE_DIR / 'test_db.sqlite3'},
+        }
+    }
+    if django.VERSION >= (5, 1):
+        # Take the write lock when the transaction starts, so the busy timeout applies
+        # instead of a read transaction failing when it tries to upgrade
+        DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+elif DB_PROFILE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('BLOG_DB_NAME', 'avanzatech_blog'),
+            'USER': os.environ.get('BLOG_DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('BLOG_DB_PASSWORD', ''),
+            'HOST': os.environ.get('BLOG_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('BLOG_DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            # Check a reused connection before the request uses it
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    if django.VERSION >= (5, 1) and os.environ.get('BLOG_DB_POOL'):
+        # Native psycopg pool; persistent connections must be off when it is used
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('BLOG_DB_POOL_MIN', 2)),
+            'max_size': int(os.environ.get('BLOG_DB_POOL_MAX', 10)),
+        }
+else:
+    raise ImproperlyConfigured(f"Unknown BLOG_DB_PROFILE '{DB_PROFILE}', use 'sqlite' or 'postgres'")
+
+
+# Password hashing
+# https://docs.djangoproject.com/en/5.0/topics/auth/passwords/
+# BLOG_PASSWORD_HASHER puts another hasher first, e.g. MD5PasswordHasher for the test suite
+# (see tests/conftest.py) or load-test fixtures. Never set it in production: the default
+# PBKDF2 is deliberately slow. Existing hashes keep working with any of the listed hashers.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+if os.environ.get('BLOG_PASSWORD_HASHER'):
+    PASSWORD_HASHERS.insert(0, os.environ['BLOG_PASSWORD_HASHER'])
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -118,8 +196,51 @@ AUTH_PASSWORD_VALIDATORS = [
 REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
-    'DEFAULT_SCHEMA_CLASS':'rest_framework.schemas.coreapi.AutoSchema'
+    'DEFAULT_SCHEMA_CLASS':'rest_framework.schemas.coreapi.AutoSchema',
+    # Session first: its missing WWW-Authenticate keeps anonymous requests at 403
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+        'rest_framework.authentication.BasicAuthentication',
+        'avanzatech_blog.tokens.TokenAuthentication',
+    ],
 }
+# Lifetime in seconds of the bearer tokens issued by user/token/ (avanzatech_blog.tokens)
+API_TOKEN_TTL = 3600
+# Cache holding revoked tokens; the default cache is per process, use a shared one with several workers
+API_TOKEN_REVOCATION_CACHE = 'default'
+# Per-endpoint query count and latency, reported on metrics/requests/ (avanzatech_blog.metrics)
+REQUEST_METRICS = os.environ.get('BLOG_REQUEST_METRICS', '') == '1'
+# Requests kept per endpoint for the percentiles and histograms
+REQUEST_METRICS_WINDOW = 1000
+# Rows fetched per database round trip and written per block by the NDJSON export (avanzatech_blog.export)
+EXPORT_CHUNK_SIZE = 2000
+# Seconds the export watermark is moved back so rows committed after the read are exported next time;
+# must exceed the longest write transaction. Consumers deduplicate the overlap by id
+EXPORT_WATERMARK_MARGIN = 60
+# Maximum number of post ids accepted by the bulk like endpoint (post/like/bulk/)
+LIKE_BULK_MAX_ITEMS = 100
+# Buffer likes/unlikes in the process and write them in batches (likes.buffer)
+LIKE_WRITE_BEHIND = os.environ.get('BLOG_LIKE_WRITE_BEHIND', '') == '1'
+# Seconds between flushes; None disables the flush thread (the buffer is then only written by flush())
+LIKE_WRITE_BEHIND_INTERVAL = 0.5
+# Pending entries that trigger a flush before the interval ends
+LIKE_WRITE_BEHIND_BATCH_SIZE = 5000
+# Keep serialized post list/detail payloads in the cache, per requester class and version
+# (avanzatech_blog.conditional). ETag/304 handling is always on.
+POST_RESPONSE_CACHE = os.environ.get('BLOG_POST_RESPONSE_CACHE', '') == '1'
+POST_RESPONSE_CACHE_TIMEOUT = 60
+# Upper bound of ?comments=N, the newest comments attached to each post of the list
+POST_LATEST_COMMENTS_MAX = 10
+# Fan-out-on-write team timelines for the post list (see posts/timeline.py); after enabling
+# it, fill the timelines with ``python manage.py rebuild_team_timelines``
+POST_TEAM_TIMELINE = os.environ.get('BLOG_POST_TEAM_TIMELINE', '') == '1'
+# Newest team posts kept per timeline; deeper pages use the live query
+POST_TEAM_TIMELINE_DEPTH = 1000
+# Dotted path of the post/search/ backend; None picks SQLite FTS5 or a LIKE fallback (posts.search)
+POST_SEARCH_BACKEND = None
+# Searches matching more posts than this are returned newest first instead of ranked by relevance
+POST_SEARCH_RANK_MAX_MATCHES = 50000
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.0/topics/i18n/
 
@@ -143,3 +264,10 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'user.CustomUser'
+# Session users are read from a per-process LRU instead of one query per request (user/backends.py).
+# ModelBackend loads the users of sessions stored with its path before the cached backend existed;
+# it can go once those are older than SESSION_COOKIE_AGE
+AUTHENTICATION_BACKENDS = ['user.backends.CachedModelBackend', 'django.contrib.auth.backends.ModelBackend']
+# Users kept per process and seconds before a change made by another process is seen
+USER_CACHE_MAX_ENTRIES = 10000
+USER_CACHE_TTL = 60
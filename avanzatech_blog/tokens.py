@@ -0,0 +1,130 @@
+"""
+Signed, expiring bearer tokens for API clients.
+
+A token is issued by ``user/token/`` and sent as ``Authorization: Bearer <token>``.
+It is signed with SECRET_KEY (django.core.signing) and carries the claims the
+permission checks and visibility filters need: the user's id, team and is_admin.
+TokenAuthentication rebuilds the user from them as a CustomUser with only those
+fields loaded, so an authenticated request reads neither a session nor the user
+table. Any other field is loaded from the database on first access, like a
+queryset built with ``only()``.
+
+Tokens expire after settings.API_TOKEN_TTL seconds. Before that they can be
+revoked one by one (``DELETE user/token/``) or all the tokens of a user at once;
+user.signals does the latter when a user's team, is_admin or password changes,
+since the claims would be stale. Revocations are kept in the cache named by
+settings.API_TOKEN_REVOCATION_CACHE until the tokens they cover expire. The
+default cache is local to the process; deployments with several processes must
+point it to a shared cache, or a token revoked in one process stays valid in the
+others.
+"""
+import secrets
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+from user.models import CustomUser
+
+SALT = 'avanzatech_blog.tokens'
+# Fields of the user loaded from the claims, in the model's field order, which from_db() expects
+CLAIM_FIELDS = tuple(field.attname for field in CustomUser._meta.concrete_fields
+                     if field.attname in {'id', 'team', 'is_admin'})
+
+
+def revocation_cache():
+    return caches[settings.API_TOKEN_REVOCATION_CACHE]
+
+
+def issue_token(user):
+    """
+    Sign a token for the user.
+
+    Args:
+        user (CustomUser): The user the token authenticates.
+
+    Returns:
+        str: The token.
+    """
+    claims = {'uid': user.pk, 'team': user.team, 'adm': user.is_admin,
+              'jti': secrets.token_urlsafe(12), 'iat': time.time()}
+    return signing.dumps(claims, salt=SALT)
+
+
+def read_token(token):
+    """
+    Check a token's signature, expiry and revocation.
+
+    Args:
+        token (str): The token sent by the client.
+
+    Returns:
+        dict: The claims.
+
+    Raises:
+        AuthenticationFailed: If the token is invalid, expired or revoked.
+    """
+    try:
+        claims = signing.loads(token, salt=SALT, max_age=settings.API_TOKEN_TTL)
+    except signing.SignatureExpired:
+        raise AuthenticationFailed('Token expired.')
+    except signing.BadSignature:
+        raise AuthenticationFailed('Invalid token.')
+    revoked = revocation_cache().get_many([f'token:{claims["jti"]}', f'token-user:{claims["uid"]}'])
+    if f'token:{claims["jti"]}' in revoked or claims['iat'] <= revoked.get(f'token-user:{claims["uid"]}', 0):
+        raise AuthenticationFailed('Token revoked.')
+    return claims
+
+
+def revoke_token(claims):
+    """
+    Revoke one token, given its claims, until it expires.
+    """
+    remaining = claims['iat'] + settings.API_TOKEN_TTL - time.time()
+    if remaining > 0:
+        revocation_cache().set(f'token:{claims["jti"]}', True, remaining)
+
+
+def revoke_user_tokens(user_id):
+    """
+    Revoke every token issued to the user so far; tokens issued later are accepted.
+    """
+    revocation_cache().set(f'token-user:{user_id}', time.time(), settings.API_TOKEN_TTL)
+
+
+def token_user(claims):
+    """
+    Build the user from the claims without a query; the other fields are deferred.
+    """
+    values = {'id': claims['uid'], 'team': claims['team'], 'is_admin': claims['adm']}
+    return CustomUser.from_db(DEFAULT_DB_ALIAS, CLAIM_FIELDS, [values[name] for name in CLAIM_FIELDS])
+
+
+class TokenAuthentication(BaseAuthentication):
+    """
+    DRF authentication with the bearer tokens of this module.
+
+    Requests without an ``Authorization: Bearer`` header are left to the other classes.
+    request.auth is the token's claims.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+        try:
+            token = header[1].decode()
+        except UnicodeDecodeError:
+            raise AuthenticationFailed('Invalid token header.')
+        claims = read_token(token)
+        return token_user(claims), claims
+
+    def authenticate_header(self, request):
+        return self.keyword
@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.urls import include, path, re_path
 from rest_framework.documentation import include_docs_urls
 
+from avanzatech_blog.views import ExportView, RequestMetricsView
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -9,6 +11,9 @@ urlpatterns = [
     path('', include('posts.urls')),
     path('likes/', include('likes.urls'), name='like-list'),
     path('comments/', include('comments.urls')),
+    path('async/', include('avanzatech_blog.async_urls')),
+    path('metrics/requests/', RequestMetricsView.as_view(), name='request-metrics'),
+    path('export/<str:kind>/', ExportView.as_view(), name='export'),
     path('docs/', include_docs_urls(title='Avanzatech Blog Documentation')),
 ]
 
@@ -21,6 +26,9 @@ Includes the following patterns:
 - '' for post-related URLs
 - 'likes/' for like-related URLs
 - 'comments/' for comment-related URLs
+- 'async/' for the async versions of the post, like and comment reads
+- 'metrics/requests/' for the per-endpoint request metrics (admins only)
+- 'export/<kind>/' for the NDJSON export of posts, likes or comments (admins only)
 - 'docs/' for the Avanzatech Blog documentation
 
 """
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import serializers, status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from avanzatech_blog.export import EXPORTS, export_lines, export_queryset, parse_watermark
+from avanzatech_blog.metrics import request_metrics
+from avanzatech_blog.permissions import IsCustomAdminUser
+
+
+class RequestMetricsView(APIView):
+    """
+    Per-endpoint request metrics of this process, slowest first (see avanzatech_blog.metrics).
+
+    GET returns the report; DELETE starts the windows over.
+    """
+    permission_classes = [IsCustomAdminUser]
+
+    def get(self, request):
+        return Response({
+            'enabled': settings.REQUEST_METRICS,
+            'window': settings.REQUEST_METRICS_WINDOW,
+            'endpoints': request_metrics.report(),
+        })
+
+    def delete(self, request):
+        request_metrics.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ExportView(APIView):
+    """
+    Streams every post, like or comment as NDJSON, one JSON object per line (see avanzatech_blog.export).
+
+    ``?since=`` (ISO 8601) only exports the rows modified after it. The
+    X-Export-Watermark header carries the value to send as ``since`` next time;
+    consecutive exports overlap, so rows are deduplicated by id.
+    """
+    permission_classes = [IsCustomAdminUser]
+
+    def get(self, request, kind):
+        if kind not in EXPORTS:
+            raise NotFound(f'Unknown export: {kind}')
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_watermark(since)
+            except ValueError as error:
+                raise serializers.ValidationError({'since': [str(error)]})
+        queryset, watermark = export_queryset(kind, since or None)
+        response = StreamingHttpResponse(export_lines(queryset), content_type='application/x-ndjson; charset=utf-8')
+        response['X-Export-Watermark'] = watermark.isoformat()
+        response['Content-Disposition'] = f'attachment; filename="{kind}.ndjson"'
+        return response
@@ -0,0 +1,95 @@
+"""
+Which posts a user can see in the list endpoints (posts, likes, comments).
+
+The predicate lives here so the three list views cannot drift apart. It only
+depends on the user's id and team, which are read on every request, so a team
+change applies to the next query.
+
+The filter is built on every call and not memoized per (user, team). In
+benchmarks/bench_visibility_filter.py (5,000 posts, 50,000 likes and comments
+on SQLite) building it takes about 0.015 ms against 4-7 ms for the query it
+filters, and the memoized case runs the same SQL, so a cache would only add
+invalidation on team changes. Caching the result instead, as a list of
+visible post ids, made the like and comment queries 4-5x slower.
+
+The like and comment lists apply the same predicate through their ``post``
+foreign key, which SQLite runs as an index lookup on posts followed by the
+likes/comments post_id index. Both alternatives measured slower (see
+benchmarks/bench_visibility_filter.py): ``post_id IN (SELECT ...)`` is
+materialised on every query, and a cached list of visible ids sends thousands
+of parameters that the database then has to sort into a temporary index.
+"""
+from django.db.models import Q
+
+from posts.models import Post
+
+SHARED_PERMISSIONS = (Post.PUBLIC, Post.AUTHENTICATED)
+
+
+def visible_posts_filter(user, prefix=''):
+    """
+    Return the filter matching the posts listed for the user.
+
+    Args:
+        user (CustomUser | AnonymousUser): The requesting user.
+        prefix (str): Lookup path to the post, e.g. 'post__' for likes and comments.
+
+    Returns:
+        Q | None: The filter, or None when every post is visible (admins).
+    """
+    if not user.is_authenticated:
+        return public_filter(prefix)
+    if user.is_admin:
+        return None
+    return member_filter(user.pk, user.team, prefix)
+
+
+def public_filter(prefix):
+    return Q(**{f'{prefix}read_permission': Post.PUBLIC})
+
+
+def member_filter(user_id, team, prefix):
+    """
+    Build the filter for an authenticated, non-admin user.
+
+    The rules are those of UserHasReadPermission: a teammate sees the team's
+    ``team`` posts but not its ``author`` posts, which only their author sees.
+    Post.team is a copy of the author's team, so the rule needs no join to the
+    user table and is served by the (read_permission, created_at) and
+    (team, created_at) indexes.
+    """
+    return (Q(**{f'{prefix}read_permission__in': SHARED_PERMISSIONS}) |
+            Q(**{f'{prefix}author_id': user_id}) |
+            Q(**{f'{prefix}team': team, f'{prefix}read_permission': Post.TEAM}))
+
+
+def visible_posts(user, queryset=None):
+    """
+    Restrict a Post queryset to the posts listed for the user.
+
+    Args:
+        user (CustomUser | AnonymousUser): The requesting user.
+        queryset (QuerySet, optional): The posts to filter. Defaults to all posts.
+
+    Returns:
+        QuerySet: The visible posts.
+    """
+    queryset = Post.objects.all() if queryset is None else queryset
+    predicate = visible_posts_filter(user)
+    return queryset if predicate is None else queryset.filter(predicate)
+
+
+def filter_by_visible_post(queryset, user, field='post'):
+    """
+    Restrict a queryset of rows that point to a post (likes, comments) to visible posts.
+
+    Args:
+        queryset (QuerySet): Rows with a foreign key to Post.
+        user (CustomUser | AnonymousUser): The requesting user.
+        field (str): Name of the foreign key. Defaults to 'post'.
+
+    Returns:
+        QuerySet: The rows whose post is visible to the user.
+    """
+    predicate = visible_posts_filter(user, prefix=f'{field}__')
+    return queryset if predicate is None else queryset.filter(predicate)
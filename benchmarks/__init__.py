@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for the Avanzatech Blog API.
+
+Each module is a standalone script, e.g.::
+
+    python -m benchmarks.bench_post_visibility --posts 1000000
+"""
@@ -0,0 +1,57 @@
+"""
+Time comment deletion on a post with a long comment thread.
+
+    python -m benchmarks.bench_comment_delete --comments 100000
+"""
+from benchmarks.common import benchmark_database, measure, parser, report, seed_comments, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=1, users=100)
+    arguments.add_argument('--comments', type=int, default=100_000)
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.db import connection
+    from comments.models import Comment
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=rng)
+        post = Post.objects.first()
+        seed_comments(options.comments, [post], users, rng=rng)
+        user = users[0]
+
+        def latest():
+            return (Comment.objects.filter(post=post, user=user)
+                    .order_by('-created_at').values_list('pk', flat=True).first())
+
+        index = next(index for index in Comment._meta.indexes if index.name == 'comment_post_user_created_idx')
+        with connection.schema_editor() as editor:
+            editor.remove_index(Comment, index)
+        without_index = measure(latest, options.repeat)
+        plan_without_index = Comment.objects.filter(post=post, user=user).order_by('-created_at').explain()
+        with connection.schema_editor() as editor:
+            editor.add_index(Comment, index)
+        with_index = measure(latest, options.repeat)
+        plan_with_index = Comment.objects.filter(post=post, user=user).order_by('-created_at').explain()
+
+        own_comments = iter(Comment.objects.filter(post=post, user=user).values_list('pk', flat=True))
+
+        def delete_by_id():
+            Comment.objects.filter(pk=next(own_comments), post=post, user=user).delete()
+
+        print(f'\nLatest comment plan without index:\n{plan_without_index}')
+        print(f'\nLatest comment plan with index:\n{plan_with_index}')
+        report(f'Comment deletion, {options.comments} comments on one post', [
+            ('latest comment lookup, FK index only', without_index),
+            ('latest comment lookup, composite index', with_index),
+            ('delete by id with ownership check', measure(delete_by_id, options.repeat)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Measure like/comment write throughput with several threads writing at once.
+
+Each thread toggles likes and adds comments in its own connection while the
+others do the same, which is where SQLite writers queue on the file lock. The
+run is repeated with the rollback journal to show what WAL changes.
+
+    python -m benchmarks.bench_concurrent_writes --threads 8 --writes 200
+"""
+from benchmarks.common import benchmark_database, parser, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=100, users=50)
+    arguments.add_argument('--threads', type=int, default=8)
+    arguments.add_argument('--writes', type=int, default=200, help='Writes per thread')
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    import threading
+    import time
+    from django.conf import settings
+    from django.db import connection, transaction
+    from comments.models import Comment
+    from likes.models import Like
+    from posts.models import Post
+
+    def writer(user, post_ids, seed, done, errors):
+        rng = random.Random(seed)
+        try:
+            for n in range(options.writes):
+                post_id = rng.choice(post_ids)
+                with transaction.atomic():
+                    if n % 4 == 3:
+                        Comment.objects.create(post_id=post_id, user=user, content=f'Comment {n}')
+                        Post.objects.filter(pk=post_id).add_to_counter('comment_count', 1)
+                    elif Like.objects.add(post_id, user.pk):
+                        Post.objects.filter(pk=post_id).add_to_counter('like_count', 1)
+                    elif Like.objects.remove(post_id, user.pk):
+                        Post.objects.filter(pk=post_id).add_to_counter('like_count', -1)
+                done.append(1)
+        except Exception as error:  # noqa: BLE001 - reported below
+            errors.append(error)
+        finally:
+            connection.close()
+
+    def run(users, post_ids):
+        done, errors = [], []
+        threads = [threading.Thread(target=writer, args=(users[n % len(users)], post_ids, n, done, errors))
+                   for n in range(options.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        return len(done) / elapsed, errors
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=rng)
+        post_ids = list(Post.objects.values_list('pk', flat=True))
+        connection.close()
+
+        profiles = []
+        if connection.vendor == 'sqlite':
+            profiles.append(('rollback journal, synchronous=FULL',
+                             {**settings.SQLITE_PRAGMAS, 'journal_mode': 'DELETE', 'synchronous': 'FULL'}))
+        profiles.append(('configured pragmas', dict(settings.SQLITE_PRAGMAS)))
+
+        print(f'\nConcurrent writes, {options.threads} threads x {options.writes} writes ({connection.vendor})')
+        configured = settings.SQLITE_PRAGMAS
+        try:
+            for name, pragmas in profiles:
+                # The journal mode is stored in the file and can only change while no one
+                # else is connected, so it is set once here and not by every writer
+                pragmas = dict(pragmas)
+                journal_mode = pragmas.pop('journal_mode', None)
+                settings.SQLITE_PRAGMAS = pragmas
+                if journal_mode and connection.vendor == 'sqlite':
+                    with connection.cursor() as cursor:
+                        cursor.execute(f'PRAGMA journal_mode = {journal_mode}')
+                    connection.close()
+                throughput, errors = run(users, post_ids)
+                print(f'  {name:<40} {throughput:>9.1f} writes/s  errors {len(errors)}')
+                for error in errors[:3]:
+                    print(f'    {error!r}')
+        finally:
+            settings.SQLITE_PRAGMAS = configured
+
+
+if __name__ == '__main__':
+    main()
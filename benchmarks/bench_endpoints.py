@@ -0,0 +1,190 @@
+"""
+Time every blog endpoint for each kind of requester on a seeded dataset.
+
+The dataset is built with the bulk seeders of benchmarks.common (the factories
+in tests/factories.py create one row per query, too slow past a few thousand
+posts). Likes and comments are concentrated on the newest posts (--skew) and
+users on the first teams (--team-skew), so hot posts and a large team exist
+as they do in production.
+
+Requesters:
+- anonymous: no session.
+- authenticated: a member of the smallest team.
+- team: a member of the largest team.
+- admin: an admin user.
+
+Each request goes through the full middleware stack with a real session.
+Results can be written as JSON and compared between commits:
+
+    python -m benchmarks.bench_endpoints --posts 100000 --output before.json
+    python -m benchmarks.bench_endpoints --posts 100000 --output after.json
+    python -m benchmarks.compare before.json after.json
+"""
+import json
+import logging
+import platform
+import subprocess
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from benchmarks.common import (benchmark_database, measure, parser, seed_comments, seed_likes, seed_posts,
+                               seed_users, setup, summarize)
+
+ROLES = ['anonymous', 'authenticated', 'team', 'admin']
+# (name, method, path); {post_id} is a post the requester can read
+READS = [
+    ('post list', 'get', '/post/'),
+    ('post detail', 'get', '/post/{post_id}'),
+    ('like list', 'get', '/likes/'),
+    ('comment list', 'get', '/comments/'),
+]
+# Pairs of writes that undo each other, timed alternately so the dataset does not drift
+WRITES = [
+    (('like', 'post', '/post/{post_id}/like/', None),
+     ('unlike', 'delete', '/post/{post_id}/like/', None)),
+    (('comment create', 'post', '/post/{post_id}/comment', {'content': 'Benchmark comment'}),
+     ('comment delete', 'delete', '/post/{post_id}/comment', None)),
+]
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure_alternating(first, second, repeat):
+    """
+    Time two requests that undo each other (like/unlike, comment/delete), one after the other.
+
+    Returns:
+        tuple: The statistics of first and of second, as measure() returns them.
+    """
+    first()  # warm-up
+    second()
+    samples = ([], [])
+    for _ in range(repeat):
+        for function, bucket in zip((first, second), samples):
+            start = time.perf_counter()
+            function()
+            bucket.append((time.perf_counter() - start) * 1000)
+    return summarize(samples[0]), summarize(samples[1])
+
+
+def seed(options):
+    """
+    Seed the dataset and pick a user and a readable post for every role.
+
+    Returns:
+        dict: role -> (user or None, post id).
+    """
+    import random
+    from comments.models import Comment
+    from likes.models import Like
+    from posts.counters import recount_posts
+    from posts.models import Post
+    from user.models import CustomUser
+
+    rng = random.Random(options.seed)
+    users = seed_users(options.users, options.teams, skew=options.team_skew, rng=rng)
+    seed_posts(options.posts, users, rng=rng)
+    # Newest first, so the skewed fan-out lands on recent posts
+    posts = list(Post.objects.only('pk').order_by('-pk'))
+    seed_likes(options.posts * options.likes_per_post, posts, users, rng=rng, skew=options.skew)
+    seed_comments(options.posts * options.comments_per_post, posts, users, rng=rng, skew=options.skew)
+    # The seeders insert rows directly, so the counters are filled in afterwards
+    recount_posts(Post.objects.all(), Like, Comment)
+
+    teams = Counter(user.team for user in users).most_common()
+    team_member = next(user for user in users if user.team == teams[0][0])
+    outsider = next(user for user in users if user.team == teams[-1][0])
+    admin = users[-1]
+    CustomUser.objects.filter(pk=admin.pk).update(is_admin=True)
+    admin.refresh_from_db()
+
+    newest = Post.objects.order_by('-pk').values_list('pk', flat=True)
+    return {
+        'anonymous': (None, newest.filter(read_permission='public').first()),
+        'authenticated': (outsider, newest.filter(read_permission='authenticated')
+                          .exclude(team=outsider.team).first()),
+        'team': (team_member, newest.filter(read_permission='team', team=team_member.team)
+                 .exclude(author=team_member).first()),
+        'admin': (admin, newest.filter(read_permission='author').exclude(author=admin).first()),
+    }
+
+
+def main():
+    arguments = parser(__doc__, posts=10_000, users=1_000, teams=20)
+    arguments.add_argument('--likes-per-post', type=int, default=5)
+    arguments.add_argument('--comments-per-post', type=int, default=2)
+    arguments.add_argument('--skew', type=float, default=3, help='1 spreads likes and comments evenly')
+    arguments.add_argument('--team-skew', type=float, default=2, help='1 makes all teams the same size')
+    arguments.add_argument('--roles', nargs='+', choices=ROLES, default=ROLES)
+    arguments.add_argument('--output', help='Write the results to this JSON file')
+    options = arguments.parse_args()
+    setup()
+    # The anonymous writes are refused on purpose; one warning per request would bury the results
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+
+    import django
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    with benchmark_database():
+        targets = seed(options)
+        results = []
+        print(f'\nEndpoints, {options.posts} posts, {options.repeat} requests per case ({connection.vendor})')
+        for role in options.roles:
+            user, post_id = targets[role]
+            client = APIClient()
+            if user is not None:
+                client.force_login(user)
+
+            def request(method, path, data=None):
+                return lambda: getattr(client, method)(path.format(post_id=post_id), data)
+
+            def record(name, method, path, data, stats):
+                # One more request, to count its queries; writes run in pairs, so the dataset is restored
+                with CaptureQueriesContext(connection) as queries:
+                    status = request(method, path, data)().status_code
+                results.append({'endpoint': name, 'role': role, 'method': method.upper(), 'path': path,
+                                'status': status, 'queries': len(queries), **stats})
+                print(f'  {name:<15} {role:<14} {status}  {len(queries):>3} queries  '
+                      f'min {stats["min_ms"]:>9.3f} ms  median {stats["median_ms"]:>9.3f} ms  '
+                      f'p95 {stats["p95_ms"]:>9.3f} ms', flush=True)
+
+            for name, method, path in READS:
+                record(name, method, path, None, measure(request(method, path), options.repeat))
+            for first, second in WRITES:
+                first_stats, second_stats = measure_alternating(request(*first[1:]), request(*second[1:]),
+                                                                options.repeat)
+                record(*first, first_stats)
+                record(*second, second_stats)
+
+    if options.output:
+        document = {
+            'meta': {
+                'commit': git_commit(),
+                'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'dataset': {'posts': options.posts, 'users': options.users, 'teams': options.teams,
+                            'likes_per_post': options.likes_per_post,
+                            'comments_per_post': options.comments_per_post,
+                            'skew': options.skew, 'team_skew': options.team_skew, 'seed': options.seed},
+                'repeat': options.repeat,
+            },
+            'results': results,
+        }
+        with open(options.output, 'w') as output:
+            json.dump(document, output, indent=2)
+        print(f'\nWrote {len(results)} results to {options.output}')
+
+
+if __name__ == '__main__':
+    main()
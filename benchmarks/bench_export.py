@@ -0,0 +1,57 @@
+"""
+Measure the NDJSON export: rows/sec and peak Python memory against the table size.
+
+The streamed export (values() + iterator + one block per chunk) is compared
+with loading the rows in one list and encoding them at once. Peak memory is
+measured with tracemalloc and only covers Python objects, which is what grows
+with the table; the output is discarded.
+
+    python -m benchmarks.bench_export --posts 200000 --chunk-size 2000
+"""
+from benchmarks.common import benchmark_database, parser, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=200_000, users=1_000)
+    arguments.add_argument('--chunk-size', type=int, default=2000)
+    options = arguments.parse_args()
+    setup()
+
+    import json
+    import random
+    import time
+    import tracemalloc
+    from django.core.serializers.json import DjangoJSONEncoder
+    from avanzatech_blog.export import EXPORTS, export_lines, export_queryset
+    from posts.models import Post
+
+    def streamed(limit):
+        queryset, _ = export_queryset('posts')
+        for block in export_lines(queryset.filter(pk__lte=limit), options.chunk_size):
+            pass
+
+    def in_memory(limit):
+        rows = list(Post.objects.filter(pk__lte=limit).order_by('pk').values(*EXPORTS['posts'][1]))
+        '\n'.join(json.dumps(row, cls=DjangoJSONEncoder) for row in rows)
+
+    with benchmark_database():
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=random.Random(options.seed))
+        last_pk = Post.objects.order_by('-pk').values_list('pk', flat=True).first()
+        first_pk = last_pk - options.posts
+
+        print(f'\nPost export, chunk size {options.chunk_size}')
+        for rows in (options.posts // 10, options.posts):
+            for name, function in (('streamed', streamed), ('in memory', in_memory)):
+                tracemalloc.start()
+                start = time.perf_counter()
+                function(first_pk + rows)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f'  {name:<10} {rows:>9} rows  {rows / elapsed:>10.0f} rows/s  '
+                      f'peak {peak / 2 ** 20:>8.1f} MiB', flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Measure the newest comments of every post on a feed page (post/?comments=N).
+
+- window query: CommentManager.latest_per_post, ROW_NUMBER() per post over the page (one statement)
+- one query per post: the newest N comments of every post of the page
+- prefetch all: every comment of the page's posts, cut to N in Python
+- request: GET post/?page_size=P&comments=N through the full stack, with its query count
+
+Comments are concentrated on the newest posts (--skew), so the first pages hold
+posts with many comments, where prefetching all of them costs the most.
+
+    python -m benchmarks.bench_latest_comments --posts 20000 --comments 500000
+"""
+from benchmarks.common import (benchmark_database, measure, parser, report, seed_comments, seed_posts, seed_users,
+                               setup)
+
+
+def main():
+    arguments = parser(__doc__, posts=20_000, users=1_000)
+    arguments.add_argument('--comments', type=int, default=500_000)
+    arguments.add_argument('--skew', type=float, default=3, help='1 spreads comments evenly')
+    arguments.add_argument('--latest', type=int, default=3, help='Comments per post (N)')
+    arguments.add_argument('--page-sizes', type=int, nargs='+', default=[10, 50, 100])
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from comments.models import Comment
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams, rng=rng)
+        seed_posts(options.posts, users, rng=rng)
+        posts = list(Post.objects.only('pk').order_by('-pk'))
+        seed_comments(options.comments, posts, users, rng=rng, skew=options.skew)
+        admin = users[0]
+        admin.is_admin = True
+        admin.save(update_fields=['is_admin'])
+        newest = Post.objects.order_by('-created_at', '-id')
+        latest = options.latest
+
+        def window_query(size):
+            return Comment.objects.latest_per_post([post.pk for post in newest[:size]], latest)
+
+        def query_per_post(size):
+            return {post.pk: list(Comment.objects.filter(post_id=post.pk).order_by('-created_at', '-id')[:latest])
+                    for post in newest[:size]}
+
+        def prefetch_all(size):
+            by_post = {}
+            page = [post.pk for post in newest[:size]]
+            for comment in Comment.objects.filter(post_id__in=page).order_by('post_id', '-created_at', '-id'):
+                comments = by_post.setdefault(comment.post_id, [])
+                if len(comments) < latest:
+                    comments.append(comment)
+            return by_post
+
+        client = APIClient()
+        client.force_authenticate(admin)
+        for size in options.page_sizes:
+            expected = {post_id: comments for post_id, comments in query_per_post(size).items() if comments}
+            assert window_query(size) == prefetch_all(size) == expected
+            url = f'/post/?page_size={size}&comments={latest}'
+            with CaptureQueriesContext(connection) as queries:
+                client.get(url)
+            report(f'{latest} latest comments, page size {size} ({connection.vendor})', [
+                ('window query', measure(lambda: window_query(size), options.repeat)),
+                ('one query per post', measure(lambda: query_per_post(size), options.repeat)),
+                ('prefetch all', measure(lambda: prefetch_all(size), options.repeat)),
+                (f'request ({len(queries)} queries)', measure(lambda: client.get(url), options.repeat)),
+            ])
+
+
+if __name__ == '__main__':
+    main()
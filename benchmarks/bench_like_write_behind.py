@@ -0,0 +1,94 @@
+"""
+Measure likes/sec on one hot post with and without the write-behind buffer.
+
+Threads send like requests through LikeCreateView, each for a different user,
+all on the same post. The write-behind figure is taken once the buffer has been
+written, so it is the rate at which likes are stored, not just accepted. The
+buffer is also measured alone: record() without the view, and flush() of a
+batch of pending likes.
+
+    python -m benchmarks.bench_like_write_behind --threads 8 --likes 20000
+"""
+from benchmarks.common import benchmark_database, parser, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=10, users=20_000)
+    arguments.add_argument('--threads', type=int, default=8)
+    arguments.add_argument('--likes', type=int, default=20_000, help='Likes per measurement, at most --users')
+    options = arguments.parse_args()
+    setup()
+
+    import threading
+    import time
+    from django.db import connection
+    from django.test import override_settings
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from likes.buffer import like_buffer
+    from likes.models import Like
+    from likes.views import LikeCreateView
+    from posts.models import Post
+
+    view = LikeCreateView.as_view()
+    factory = APIRequestFactory()
+
+    def liker(users, post_id, errors):
+        try:
+            for user in users:
+                request = factory.post(f'/post/{post_id}/like/')
+                force_authenticate(request, user=user)
+                if view(request, post_id=post_id).status_code != 200:
+                    errors.append(post_id)
+        except Exception as error:  # noqa: BLE001 - reported below
+            errors.append(error)
+        finally:
+            connection.close()
+
+    def run(users, post_id):
+        errors = []
+        threads = [threading.Thread(target=liker, args=(users[n::options.threads], post_id, errors))
+                   for n in range(options.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        accepted = time.perf_counter() - start
+        like_buffer.flush()
+        stored = time.perf_counter() - start
+        return accepted, stored, errors
+
+    with benchmark_database():
+        users = seed_users(options.users, options.teams)[:options.likes]
+        seed_posts(options.posts, users)
+        post_ids = list(Post.objects.values_list('pk', flat=True))
+        Post.objects.update(read_permission='public')
+        connection.close()
+
+        print(f'\nLikes on one post, {options.threads} threads, {len(users)} likes ({connection.vendor})')
+        for name, write_behind, post_id in [('direct', False, post_ids[0]), ('write-behind', True, post_ids[1])]:
+            with override_settings(LIKE_WRITE_BEHIND=write_behind):
+                accepted, stored, errors = run(users, post_id)
+            like_count = Post.objects.values_list('like_count', flat=True).get(pk=post_id)
+            print(f'  {name:<14} accepted {len(users) / accepted:>9.1f} likes/s  '
+                  f'stored {len(users) / stored:>9.1f} likes/s  like_count {like_count}  errors {len(errors)}')
+            for error in errors[:3]:
+                print(f'    {error!r}')
+        like_buffer.stop()
+
+        # The buffer without the request handling around it
+        with override_settings(LIKE_WRITE_BEHIND=True, LIKE_WRITE_BEHIND_INTERVAL=None):
+            start = time.perf_counter()
+            for user in users:
+                like_buffer.record(post_ids[2], user.pk, True)
+            recorded = time.perf_counter() - start
+            start = time.perf_counter()
+            like_buffer.flush()
+            flushed = time.perf_counter() - start
+        stored = Like.objects.filter(post_id=post_ids[2]).count()
+        print(f'  {"buffer only":<14} record {len(users) / recorded:>9.1f} likes/s  '
+              f'flush {stored / flushed:>9.1f} likes/s ({stored} rows in {flushed * 1000:.0f} ms)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure liked_by_me in the post list for page sizes 10, 50 and 100.
+
+- exists annotation: PostQuerySet.with_liked_by_me, what the views run (one statement)
+- one query per post: Like.exists() for every post of the page
+- one IN query: the page, then the user's likes among its post ids
+- request: GET post/?page_size=N through the full stack, with its query count
+
+The user likes --user-likes of the posts, so both outcomes of the lookup are exercised.
+
+    python -m benchmarks.bench_liked_by_me --posts 100000 --likes 500000
+"""
+from benchmarks.common import (benchmark_database, measure, parser, report, seed_likes, seed_posts, seed_users,
+                               setup)
+
+
+def main():
+    arguments = parser(__doc__, posts=100_000, users=1_000)
+    arguments.add_argument('--likes', type=int, default=500_000)
+    arguments.add_argument('--user-likes', type=float, default=0.3, help='Share of the posts the user likes')
+    arguments.add_argument('--page-sizes', type=int, nargs='+', default=[10, 50, 100])
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from avanzatech_blog.visibility import visible_posts
+    from likes.models import Like
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams, rng=rng)
+        seed_posts(options.posts, users, rng=rng)
+        posts = list(Post.objects.only('pk').order_by('-pk'))
+        seed_likes(options.likes, posts, users, rng=rng)
+        user = users[0]
+        # Likes of the benchmark user on the newest posts, the ones on the first pages
+        liked = [post.pk for post in posts[:10_000] if rng.random() < options.user_likes]
+        Like.objects.bulk_create([Like(post_id=post_id, user_id=user.pk) for post_id in liked],
+                                 ignore_conflicts=True)
+        visible = visible_posts(user).select_related('author')
+
+        def exists_annotation(size):
+            return [post.liked_by_me for post in visible.with_liked_by_me(user)[:size]]
+
+        def query_per_post(size):
+            return [Like.objects.filter(post_id=post.pk, user_id=user.pk).exists() for post in visible[:size]]
+
+        def in_query(size):
+            page = list(visible[:size])
+            liked_ids = set(Like.objects.filter(user_id=user.pk, post_id__in=[post.pk for post in page])
+                            .values_list('post_id', flat=True))
+            return [post.pk in liked_ids for post in page]
+
+        client = APIClient()
+        client.force_authenticate(user)
+        for size in options.page_sizes:
+            assert exists_annotation(size) == query_per_post(size) == in_query(size)
+            url = f'/post/?page_size={size}'
+            with CaptureQueriesContext(connection) as queries:
+                client.get(url)
+            report(f'liked_by_me, page size {size} ({connection.vendor})', [
+                ('exists annotation', measure(lambda: exists_annotation(size), options.repeat)),
+                ('one query per post', measure(lambda: query_per_post(size), options.repeat)),
+                ('one IN query', measure(lambda: in_query(size), options.repeat)),
+                (f'request ({len(queries)} queries)', measure(lambda: client.get(url), options.repeat)),
+            ])
+
+
+if __name__ == '__main__':
+    main()
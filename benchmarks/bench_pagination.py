@@ -0,0 +1,54 @@
+"""
+Compare page-number and keyset cursor pagination of the post list.
+
+    python -m benchmarks.bench_pagination --posts 200000 --page 10000
+"""
+from benchmarks.common import benchmark_database, measure, parser, report, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=200_000)
+    arguments.add_argument('--page', type=int, default=10_000)
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from rest_framework.test import APIRequestFactory, force_authenticate
+    from avanzatech_blog.pagination import KeysetPagination
+    from posts.models import Post
+    from posts.views import PostCreateView
+
+    with benchmark_database():
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=random.Random(options.seed))
+        # An admin sees every post, so page N exists as long as posts >= 10 * N
+        admin = users[0]
+        admin.is_admin = True
+        admin.save()
+
+        factory = APIRequestFactory()
+        view = PostCreateView.as_view()
+        page_size = 10
+        offset = (options.page - 1) * page_size
+        anchor = Post.objects.order_by('-created_at', '-id')[offset - 1]
+        cursor = KeysetPagination(page_size).encode_cursor(anchor, reverse=False)
+
+        def get(query):
+            def request():
+                request = factory.get('/post/', query)
+                force_authenticate(request, user=admin)
+                response = view(request)
+                assert response.status_code == 200, response.status_code
+                response.render()
+            return request
+
+        report(f'Post list, {options.posts} posts, page size {page_size}', [
+            ('page number: page 1', measure(get({'page': 1}), options.repeat)),
+            ('cursor: page 1', measure(get({'pagination': 'cursor'}), options.repeat)),
+            (f'page number: page {options.page}', measure(get({'page': options.page}), options.repeat)),
+            (f'cursor: page {options.page}', measure(get({'cursor': cursor}), options.repeat)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
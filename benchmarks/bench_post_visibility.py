@@ -0,0 +1,50 @@
+"""
+Compare the post list visibility query before and after denormalizing Post.team.
+
+    python -m benchmarks.bench_post_visibility --posts 1000000
+"""
+from benchmarks.common import benchmark_database, measure, parser, report, seed_posts, seed_users, setup
+
+
+def main():
+    options = parser(__doc__, posts=1_000_000).parse_args()
+    setup()
+
+    import random
+    from django.db.models import Q, Subquery
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=rng)
+        user = users[0]
+
+        # Query built by PostCreateView before Post.team existed
+        allowed_posts = Post.objects.filter(
+            Q(read_permission=Post.PUBLIC) |
+            Q(read_permission=Post.AUTHENTICATED) |
+            Q(author=user) |
+            Q(author__team=user.team)
+        )
+        join_subquery = Post.objects.filter(id__in=Subquery(allowed_posts.values('id')))
+        flat = Post.objects.filter(
+            Q(read_permission__in=[Post.PUBLIC, Post.AUTHENTICATED]) |
+            Q(author=user) |
+            Q(team=user.team)
+        )
+        assert join_subquery.count() == flat.count()
+
+        for name, queryset in (('join + subquery', join_subquery), ('flat indexed filter', flat)):
+            print(f'\n{name} plan:\n{queryset.explain()}')
+
+        report(f'Post list for an authenticated user, {options.posts} posts', [
+            ('join + subquery: COUNT', measure(join_subquery.count, options.repeat)),
+            ('flat indexed filter: COUNT', measure(flat.count, options.repeat)),
+            ('join + subquery: first page', measure(lambda: list(join_subquery[:10]), options.repeat)),
+            ('flat indexed filter: first page', measure(lambda: list(flat[:10]), options.repeat)),
+        ])
+
+
+if __name__ == '__main__':
+    main()
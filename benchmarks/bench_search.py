@@ -0,0 +1,63 @@
+"""
+Time post/search/ queries against the FTS5 index and the LIKE fallback.
+
+Posts get random titles and contents drawn from a vocabulary with a Zipf-like
+distribution, so the searched words range from rare to very common.
+
+    python -m benchmarks.bench_search --posts 1000000
+"""
+from benchmarks.common import benchmark_database, measure, parser, report, seed_posts, seed_users, setup
+
+VOCABULARY = 5_000
+
+
+def main():
+    arguments = parser(__doc__, posts=1_000_000, repeat=10)
+    arguments.add_argument('--like-repeat', type=int, default=3,
+                           help='Repetitions for the LIKE fallback, which scans every post')
+    options = arguments.parse_args()
+    setup()
+
+    import itertools
+    import random
+    import time
+    from rest_framework.test import APIClient
+    from django.test import override_settings
+    from posts.search import get_search_backend
+
+    words = [f'word{rank}' for rank in range(VOCABULARY)]
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY)))
+
+    def text(rng, n):
+        title = rng.choices(words, cum_weights=cum_weights, k=6)
+        content = rng.choices(words, cum_weights=cum_weights, k=40)
+        return ' '.join(title), ' '.join(content)
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=rng, text=text)
+        start = time.perf_counter()
+        indexed = get_search_backend().rebuild()
+        print(f'\nIndexed {indexed} posts in {time.perf_counter() - start:.1f} s')
+
+        client = APIClient()
+        client.force_authenticate(users[1])
+
+        def search(query):
+            def request():
+                response = client.get('/post/search/', {'q': query})
+                assert response.status_code == 200, response.status_code
+            return request
+
+        queries = [('rare word', 'word4000'), ('medium word', 'word300'), ('common word', 'word3'),
+                   ('two words', 'word3 word300')]
+        rows = [(f'fts5: {name}', measure(search(query), options.repeat)) for name, query in queries]
+        with override_settings(POST_SEARCH_BACKEND='posts.search.ContainsSearchBackend'):
+            rows += [(f'LIKE: {name}', measure(search(query), options.like_repeat))
+                     for name, query in queries[:1] + queries[2:3]]
+        report(f'post/search/, first page, {options.posts} posts', rows)
+
+
+if __name__ == '__main__':
+    main()
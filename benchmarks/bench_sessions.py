@@ -0,0 +1,67 @@
+"""
+Count database hits per authenticated request for each session store and for bearer tokens.
+
+The token case sends ``Authorization: Bearer`` (avanzatech_blog.tokens) and no
+session cookie, so it reads neither the session nor the requesting user.
+
+    python -m benchmarks.bench_sessions --requests 200
+"""
+from benchmarks.common import benchmark_database, measure, parser, seed_posts, seed_users, setup
+
+ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'memory': 'avanzatech_blog.sessions',
+}
+# Sessions are not read by token requests; the default store is left in place
+TOKEN = 'token'
+
+
+def main():
+    arguments = parser(__doc__, posts=1_000, users=100)
+    arguments.add_argument('--requests', type=int, default=200)
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test import Client, override_settings
+    from django.test.utils import CaptureQueriesContext
+    from avanzatech_blog.tokens import issue_token
+
+    with benchmark_database():
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=random.Random(options.seed))
+
+        print(f'\nAuthenticated GET /post/, {options.requests} requests per store')
+        for name in [*ENGINES, TOKEN]:
+            cache.clear()
+            with override_settings(SESSION_ENGINE=ENGINES.get(name, ENGINES['cached_db'])):
+                if name == TOKEN:
+                    client = Client(HTTP_AUTHORIZATION=f'Bearer {issue_token(users[0])}')
+                else:
+                    client = Client()
+                    client.force_login(users[0])
+
+                def request():
+                    response = client.get('/post/')
+                    assert response.status_code == 200, response.status_code
+
+                request()  # warm the session cache
+                with CaptureQueriesContext(connection) as queries:
+                    for _ in range(options.requests):
+                        request()
+                # Read the log now: later requests reset connection.queries
+                total_queries = len(queries)
+                session_queries = len([query for query in queries if 'django_session' in query['sql']])
+                user_queries = len([query for query in queries if 'FROM "user_customuser"' in query['sql']])
+                stats = measure(request, options.repeat)
+            print(f'  {name:<10} queries/request {total_queries / options.requests:>5.2f}  '
+                  f'session queries/request {session_queries / options.requests:>5.2f}  '
+                  f'user queries/request {user_queries / options.requests:>5.2f}  '
+                  f'median {stats["median_ms"]:>8.3f} ms')
+
+
+if __name__ == '__main__':
+    main()
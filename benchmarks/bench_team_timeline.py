@@ -0,0 +1,81 @@
+"""
+Measure a team member's post list with and without the team timelines (POST_TEAM_TIMELINE).
+
+- live query: the visible posts (shared OR own OR team) sliced to the page
+- timeline merge: posts.timeline.TeamFeed, the public, authenticated, team and own-post streams merged
+- count, live / timeline: the COUNT each one sends for the page numbers
+- request, live / timeline: GET post/?page=N through the full stack, with its query count
+
+--shared sets the share of posts that everyone signed in can read; the rest are
+restricted to their team or author. With many teams and few shared posts the
+live query walks many rows of other teams before a page is filled.
+
+    python -m benchmarks.bench_team_timeline --posts 200000 --teams 100 --shared 0.05
+"""
+from benchmarks.common import benchmark_database, measure, parser, report, seed_posts, seed_users, setup
+
+
+def main():
+    arguments = parser(__doc__, posts=200_000, users=2_000, teams=100)
+    arguments.add_argument('--shared', type=float, default=0.05, help='Share of public and authenticated posts')
+    arguments.add_argument('--pages', type=int, nargs='+', default=[1, 10, 40])
+    arguments.add_argument('--page-size', type=int, default=20)
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.db import connection
+    from django.test import override_settings
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+    from avanzatech_blog.visibility import SHARED_PERMISSIONS, visible_posts
+    from posts import timeline
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams, rng=rng)
+        seed_posts(options.posts, users, rng=rng)
+        # seed_posts spreads the four permissions evenly; restrict the shared posts above --shared
+        shared = list(Post.objects.filter(read_permission__in=SHARED_PERMISSIONS).values_list('pk', flat=True))
+        restricted = [pk for pk in shared if rng.random() >= options.shared * 2]
+        for offset in range(0, len(restricted), 10_000):
+            Post.objects.filter(pk__in=restricted[offset:offset + 10_000]).update(read_permission=Post.TEAM)
+        written = timeline.rebuild()
+        print(f'{written} timeline entries for {options.teams} teams')
+
+        user = users[0]
+        visible = visible_posts(user).select_related('author').with_liked_by_me(user)
+        feed = timeline.TeamFeed(visible, user)
+        live = visible.order_by(*timeline.NEWEST_FIRST)
+        size = options.page_size
+        client = APIClient()
+        client.force_authenticate(user)
+
+        def request(page, enabled):
+            with override_settings(POST_TEAM_TIMELINE=enabled):
+                return client.get(f'/post/?page={page}&page_size={size}')
+
+        rows = [('count, live', measure(lambda: live.count(), options.repeat)),
+                ('count, timeline', measure(feed.count, options.repeat))]
+        assert live.count() == feed.count()
+        report(f'Member post list count, {options.posts} posts ({connection.vendor})', rows)
+        for page in options.pages:
+            start, stop = (page - 1) * size, page * size
+            assert [post.pk for post in live[start:stop]] == [post.pk for post in feed[start:stop]]
+            queries = {}
+            for enabled in (False, True):
+                with CaptureQueriesContext(connection) as captured:
+                    request(page, enabled)
+                queries[enabled] = len(captured)
+            report(f'Member post list, page {page} of {size} ({connection.vendor})', [
+                ('live query', measure(lambda: list(live[start:stop]), options.repeat)),
+                ('timeline merge', measure(lambda: feed[start:stop], options.repeat)),
+                (f'request, live ({queries[False]} queries)', measure(lambda: request(page, False), options.repeat)),
+                (f'request, timeline ({queries[True]} queries)',
+                 measure(lambda: request(page, True), options.repeat)),
+            ])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare the ways of restricting the like and comment lists to visible posts.
+
+- subquery: post_id IN (SELECT id FROM posts WHERE ...), what the lists used to run
+- cached id list: post_id IN (<ids>), with the ids of the visible posts read from the cache
+- join predicate: avanzatech_blog.visibility, what the lists run
+- join predicate, memoized: the same filter kept per (user, team), as an earlier version did
+
+Each case is timed at the SQL level (COUNT plus the first page) and as a full request.
+Building the filter is also timed on its own, per call and memoized (cold/warm).
+
+    python -m benchmarks.bench_visibility_filter --posts 5000 --likes 50000
+"""
+from benchmarks.common import (benchmark_database, measure, parser, report, seed_comments, seed_likes,
+                               seed_posts, seed_users, setup)
+
+
+def main():
+    arguments = parser(__doc__, posts=5_000, users=200)
+    arguments.add_argument('--likes', type=int, default=50_000)
+    arguments.add_argument('--comments', type=int, default=50_000)
+    options = arguments.parse_args()
+    setup()
+
+    import random
+    from django.core.cache import cache
+    from rest_framework.test import APIClient
+    from avanzatech_blog import visibility
+    from comments.models import Comment
+    from likes.models import Like
+    from posts.models import Post
+
+    with benchmark_database():
+        rng = random.Random(options.seed)
+        users = seed_users(options.users, options.teams)
+        seed_posts(options.posts, users, rng=rng)
+        posts = list(Post.objects.only('pk'))
+        seed_comments(options.comments, posts, users, rng=rng)
+        likes = seed_likes(options.likes, posts, users, rng=rng)
+
+        user = users[1]
+        client = APIClient()
+        client.force_authenticate(user)
+
+        def cached_ids():
+            post_ids = cache.get('bench:visible-ids')
+            if post_ids is None:
+                post_ids = list(visibility.visible_posts(user).values_list('pk', flat=True))
+                cache.set('bench:visible-ids', post_ids)
+            return post_ids
+
+        memoized = {}
+
+        def memoized_predicate():
+            key = (user.pk, user.team)
+            if key not in memoized:
+                memoized[key] = visibility.visible_posts_filter(user, prefix='post__')
+            return memoized[key]
+
+        def page(model, build):
+            def run():
+                queryset = build(model.objects.all())
+                queryset.count()
+                list(queryset[:10])
+            return run
+
+        strategies = {
+            'subquery': lambda queryset: queryset.filter(post__in=visibility.visible_posts(user).values('pk')),
+            'cached id list': lambda queryset: queryset.filter(post_id__in=cached_ids()),
+            'join predicate': lambda queryset: visibility.filter_by_visible_post(queryset, user),
+            'join predicate, memoized': lambda queryset: queryset.filter(memoized_predicate()),
+        }
+
+        def get(url):
+            def request():
+                response = client.get(url)
+                assert response.status_code == 200, response.status_code
+            return request
+
+        rows = [
+            ('filter build: per call (cold)',
+             measure(lambda: visibility.visible_posts_filter(user, prefix='post__'), options.repeat)),
+            ('filter build: memoized (warm)', measure(memoized_predicate, options.repeat)),
+        ]
+        for name, model, url in [('likes', Like, '/likes/'), ('comments', Comment, '/comments/')]:
+            for strategy, build in strategies.items():
+                rows.append((f'{name} SQL: {strategy}', measure(page(model, build), options.repeat)))
+            rows.append((f'{name} request', measure(get(url), options.repeat)))
+
+        report(f'Visible-post filtering, {options.posts} posts ({len(cached_ids())} visible), '
+               f'{likes} likes, {options.comments} comments', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Helpers shared by the benchmark scripts.
+
+Every benchmark runs against a throwaway test database created with Django's
+test runner machinery, so the development db.sqlite3 is never touched.
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+import django
+
+PERMISSIONS = ['public', 'authenticated', 'team', 'author']
+
+
+def setup():
+    """
+    Configure Django for a standalone benchmark script.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'avanzatech_blog.settings')
+    django.setup()
+
+
+def parser(description, **defaults):
+    """
+    Return an ArgumentParser with the options every benchmark understands.
+    """
+    arguments = argparse.ArgumentParser(description=description)
+    arguments.add_argument('--posts', type=int, default=defaults.get('posts', 100_000))
+    arguments.add_argument('--users', type=int, default=defaults.get('users', 1_000))
+    arguments.add_argument('--teams', type=int, default=defaults.get('teams', 20))
+    arguments.add_argument('--repeat', type=int, default=defaults.get('repeat', 20))
+    arguments.add_argument('--seed', type=int, default=1)
+    return arguments
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Create a migrated test database for the duration of the block.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """
+    Let bulk_create keep the created_at/modified_at values set by the seeder instead of now().
+    """
+    created = [model._meta.get_field('created_at') for model in models]
+    modified = [model._meta.get_field('modified_at') for model in models]
+    for field in created:
+        field.auto_now_add = False
+    for field in modified:
+        field.auto_now = False
+    try:
+        yield
+    finally:
+        for field in created:
+            field.auto_now_add = True
+        for field in modified:
+            field.auto_now = True
+
+
+def skewed_index(rng, size, skew):
+    """
+    Return an index in [0, size).
+
+    skew 1 is uniform; larger values concentrate the picks on the first indexes,
+    e.g. with skew 3 the first 10% receive about 46% of them.
+    """
+    return min(size - 1, int(size * rng.random() ** skew))
+
+
+def seed_users(count, teams, batch_size=5_000, skew=1, rng=None):
+    """
+    Insert users spread over the given number of teams.
+
+    The password is hashed once and shared, which keeps seeding fast.
+
+    Args:
+        skew (float): 1 spreads users evenly over the teams; larger values make team0 the biggest.
+
+    Returns:
+        list: The created users.
+    """
+    from django.contrib.auth.hashers import make_password
+    from user.models import CustomUser
+
+    rng = rng or random.Random(1)
+    password = make_password('password')
+    users = [CustomUser(username=f'user{n}@bench.local',
+                        password=password,
+                        team=f'team{n % teams if skew == 1 else skewed_index(rng, teams, skew)}')
+             for n in range(count)]
+    CustomUser.objects.bulk_create(users, batch_size=batch_size)
+    return list(CustomUser.objects.order_by('pk'))
+
+
+def seed_posts(count, users, batch_size=10_000, rng=None, text=None):
+    """
+    Insert posts with random authors and permissions, one minute apart.
+
+    Args:
+        text (callable, optional): text(rng, n) returning (title, content); defaults to "Post n".
+
+    Returns:
+        int: The number of posts created.
+    """
+    from django.utils import timezone
+    from posts.models import Post
+
+    rng = rng or random.Random(1)
+    start = timezone.now() - timedelta(minutes=count)
+    with explicit_timestamps(Post):
+        for offset in range(0, count, batch_size):
+            batch = []
+            for n in range(offset, min(offset + batch_size, count)):
+                author = rng.choice(users)
+                created_at = start + timedelta(minutes=n)
+                title, content = text(rng, n) if text else (f'Post {n}', f'Content of post {n}')
+                batch.append(Post(title=title,
+                                  content=content,
+                                  author=author,
+                                  team=author.team,
+                                  read_permission=rng.choice(PERMISSIONS),
+                                  edit_permission=rng.choice(PERMISSIONS),
+                                  created_at=created_at,
+                                  modified_at=created_at))
+            Post.objects.bulk_create(batch)
+    return count
+
+
+def seed_comments(count, posts, users, batch_size=10_000, rng=None, skew=1):
+    """
+    Insert comments on random posts by random users, one second apart.
+
+    Args:
+        skew (float): 1 picks posts uniformly; larger values put most comments on the first posts.
+
+    Returns:
+        int: The number of comments created.
+    """
+    from django.utils import timezone
+    from comments.models import Comment
+
+    rng = rng or random.Random(1)
+    start = timezone.now() - timedelta(seconds=count)
+    with explicit_timestamps(Comment):
+        for offset in range(0, count, batch_size):
+            batch = []
+            for n in range(offset, min(offset + batch_size, count)):
+                created_at = start + timedelta(seconds=n)
+                post = rng.choice(posts) if skew == 1 else posts[skewed_index(rng, len(posts), skew)]
+                batch.append(Comment(post_id=post.pk,
+                                     user_id=rng.choice(users).pk,
+                                     content=f'Comment {n}',
+                                     created_at=created_at,
+                                     modified_at=created_at))
+            Comment.objects.bulk_create(batch)
+    return count
+
+
+def seed_likes(count, posts, users, batch_size=10_000, rng=None, skew=1):
+    """
+    Insert up to count likes, each by a random user on a random post, without duplicates.
+
+    Args:
+        skew (float): 1 picks posts uniformly; larger values put most likes on the first posts.
+
+    Returns:
+        int: The number of likes created.
+    """
+    from likes.models import Like
+
+    rng = rng or random.Random(1)
+    pairs = set()
+    # A hot post can run out of users, so give up after a bounded number of draws
+    for _ in range(count * 3):
+        if len(pairs) == count:
+            break
+        post = rng.choice(posts) if skew == 1 else posts[skewed_index(rng, len(posts), skew)]
+        pairs.add((post.pk, rng.choice(users).pk))
+    Like.objects.bulk_create([Like(post_id=post_id, user_id=user_id) for post_id, user_id in pairs],
+                             batch_size=batch_size)
+    return len(pairs)
+
+
+def measure(function, repeat):
+    """
+    Call function repeat times and return latency statistics in milliseconds.
+    """
+    function()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def summarize(samples):
+    """
+    Return the min/median/p95 statistics of latency samples in milliseconds.
+    """
+    samples = sorted(samples)
+    return {
+        'min_ms': round(samples[0], 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[max(0, math.ceil(len(samples) * 0.95) - 1)], 3),
+    }
+
+
+def report(title, rows):
+    """
+    Print one line per measured case.
+    """
+    print(f'\n{title}')
+    for name, stats in rows:
+        print(f'  {name:<40} min {stats["min_ms"]:>9.3f} ms  '
+              f'median {stats["median_ms"]:>9.3f} ms  p95 {stats["p95_ms"]:>9.3f} ms')
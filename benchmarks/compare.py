@@ -0,0 +1,59 @@
+"""
+Compare two result files of benchmarks.bench_endpoints and flag regressions.
+
+A case regresses when its median grew by more than --threshold percent and by
+more than --min-ms milliseconds (small cases are dominated by noise). The exit
+status is 1 when any case regressed, so the script can gate a CI job.
+
+    python -m benchmarks.compare before.json after.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def load(path):
+    with open(path) as source:
+        document = json.load(source)
+    return document['meta'], {(result['endpoint'], result['role']): result for result in document['results']}
+
+
+def main():
+    arguments = argparse.ArgumentParser(description=__doc__)
+    arguments.add_argument('before')
+    arguments.add_argument('after')
+    arguments.add_argument('--threshold', type=float, default=10, help='Allowed median increase, in percent')
+    arguments.add_argument('--min-ms', type=float, default=0.5, help='Ignore increases smaller than this')
+    arguments.add_argument('--metric', default='median_ms', choices=['min_ms', 'median_ms', 'p95_ms'])
+    options = arguments.parse_args()
+
+    before_meta, before = load(options.before)
+    after_meta, after = load(options.after)
+    if before_meta.get('dataset') != after_meta.get('dataset'):
+        print('warning: the two runs used different datasets', file=sys.stderr)
+
+    print(f'{before_meta.get("commit")} -> {after_meta.get("commit")} ({options.metric})')
+    regressions = 0
+    for key in sorted(before.keys() | after.keys()):
+        endpoint, role = key
+        if key not in before or key not in after:
+            print(f'  {endpoint:<15} {role:<14} {"only in " + ("after" if key in after else "before"):>30}')
+            continue
+        old, new = before[key][options.metric], after[key][options.metric]
+        change = (new - old) / old * 100 if old else 0
+        flags = []
+        if change > options.threshold and new - old > options.min_ms:
+            flags.append('REGRESSION')
+            regressions += 1
+        if before[key]['queries'] != after[key]['queries']:
+            flags.append(f'queries {before[key]["queries"]} -> {after[key]["queries"]}')
+        if before[key]['status'] != after[key]['status']:
+            flags.append(f'status {before[key]["status"]} -> {after[key]["status"]}')
+        print(f'  {endpoint:<15} {role:<14} {old:>9.3f} -> {new:>9.3f} ms  {change:>+7.1f}%  {" ".join(flags)}')
+
+    print(f'\n{regressions} regression(s)')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,215 @@
+"""
+Compare requests/sec of the read endpoints served by WSGI and by ASGI.
+
+A throwaway database is seeded and migrated, then each deployment is started
+as a subprocess and loaded by a keep-alive HTTP client at every concurrency:
+
+- wsgi: gunicorn (gthread workers) serving the DRF views.
+- asgi-sync: uvicorn serving the same DRF views, which Django runs in a thread.
+- asgi: uvicorn serving the native async views under async/.
+
+Needs the servers, which are not part of the Pipfile:
+
+    pip install gunicorn uvicorn
+    python -m benchmarks.loadtest --concurrency 50 500 --duration 10
+
+Every request is authenticated with the session of one non-admin user. The
+client runs on the same machine as the server, so on small machines it competes
+with it for CPU; compare deployments within one run rather than across machines.
+"""
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import parser, seed_comments, seed_likes, seed_posts, seed_users, setup
+
+# name: (sync path, async path); {post_id} is replaced by a post the user can read
+ENDPOINTS = {
+    'post list': ('/post/', '/async/post/'),
+    'post detail': ('/post/{post_id}', '/async/post/{post_id}'),
+    'like list': ('/likes/', '/async/likes/'),
+    'comment list': ('/comments/', '/async/comments/'),
+}
+DEPLOYMENTS = ['wsgi', 'asgi-sync', 'asgi']
+
+
+def server_command(deployment, port, options):
+    if deployment == 'wsgi':
+        return [sys.executable, '-m', 'gunicorn', 'avanzatech_blog.wsgi:application',
+                '--bind', f'127.0.0.1:{port}', '--workers', str(options.workers),
+                '--worker-class', 'gthread', '--threads', str(options.threads),
+                '--backlog', '2048', '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', 'avanzatech_blog.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(options.workers),
+            '--backlog', '2048', '--log-level', 'warning', '--no-access-log']
+
+
+def seed_database(options):
+    """
+    Migrate and seed the load-test database.
+
+    Returns:
+        tuple: (session cookie value, id of a post the session user can read).
+    """
+    import random
+    from django.core.management import call_command
+    from django.test import Client
+    from posts.models import Post
+
+    call_command('migrate', verbosity=0)
+    rng = random.Random(options.seed)
+    users = seed_users(options.users, options.teams)
+    seed_posts(options.posts, users, rng=rng)
+    posts = list(Post.objects.only('pk'))
+    seed_comments(options.comments, posts, users, rng=rng)
+    seed_likes(options.likes, posts, users, rng=rng)
+
+    client = Client()
+    client.force_login(users[0])
+    post_id = Post.objects.filter(read_permission='public').values_list('pk', flat=True).first()
+    return client.cookies['sessionid'].value, post_id
+
+
+async def read_response(reader):
+    """
+    Read one HTTP/1.1 response.
+
+    Returns:
+        tuple: (status code, True if the server closes the connection).
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip().lower()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get('connection') == 'close'
+
+
+async def client(port, request, deadline, latencies, errors):
+    """
+    Send requests over one keep-alive connection until the deadline, reconnecting when it is closed.
+    """
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            start = time.perf_counter()
+            writer.write(request)
+            status, close = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            if close:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as error:
+            errors.append(type(error).__name__)
+            if writer is not None:
+                writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(port, path, cookie, concurrency, duration):
+    request = (f'GET {path} HTTP/1.1\r\nHost: localhost\r\nCookie: sessionid={cookie}\r\n'
+               f'Accept: application/json\r\n\r\n').encode()
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(port, request, start + duration, latencies, errors)
+                           for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'median_ms': statistics.median(latencies) * 1000 if latencies else 0,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0,
+        'errors': len(errors),
+    }
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(process, port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Server exited with code {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Server did not start')
+
+
+def main():
+    arguments = parser(__doc__, posts=10_000, users=200, teams=10)
+    arguments.add_argument('--comments', type=int, default=20_000)
+    arguments.add_argument('--likes', type=int, default=20_000)
+    arguments.add_argument('--concurrency', type=int, nargs='+', default=[50, 500])
+    arguments.add_argument('--duration', type=float, default=10, help='Seconds per measurement')
+    arguments.add_argument('--warmup', type=float, default=2, help='Seconds of load before each measurement')
+    arguments.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Server processes')
+    arguments.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker')
+    arguments.add_argument('--deployments', nargs='+', choices=DEPLOYMENTS, default=DEPLOYMENTS)
+    arguments.add_argument('--endpoints', nargs='+', choices=list(ENDPOINTS), default=list(ENDPOINTS))
+    options = arguments.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Read by settings.py here and in the server processes
+        os.environ['BLOG_DB_NAME'] = os.path.join(directory, 'loadtest.sqlite3')
+        setup()
+        cookie, post_id = seed_database(options)
+
+        results = []
+        for deployment in options.deployments:
+            port = free_port()
+            process = subprocess.Popen(server_command(deployment, port, options), env=os.environ.copy())
+            try:
+                wait_for_server(process, port)
+                for endpoint in options.endpoints:
+                    path = ENDPOINTS[endpoint][deployment == 'asgi'].format(post_id=post_id)
+                    for concurrency in options.concurrency:
+                        asyncio.run(load(port, path, cookie, concurrency, options.warmup))
+                        stats = asyncio.run(load(port, path, cookie, concurrency, options.duration))
+                        results.append((deployment, endpoint, concurrency, stats))
+                        print(f'  {deployment:<10} {endpoint:<13} c={concurrency:<4} '
+                              f'{stats["rps"]:>8.1f} req/s  median {stats["median_ms"]:>8.1f} ms  '
+                              f'p95 {stats["p95_ms"]:>8.1f} ms  errors {stats["errors"]}', flush=True)
+            finally:
+                process.terminate()
+                process.wait()
+
+    print(f'\nrequests/sec ({options.workers} worker(s), {options.duration:g} s per run)')
+    header = ''.join(f'{deployment:>12}' for deployment in options.deployments)
+    for concurrency in options.concurrency:
+        print(f'\n  c={concurrency:<4}{"":<10}{header}')
+        for endpoint in options.endpoints:
+            row = {deployment: stats['rps'] for deployment, name, level, stats in results
+                   if name == endpoint and level == concurrency}
+            print(f'  {endpoint:<16}' + ''.join(f'{row[deployment]:>12.1f}' for deployment in options.deployments))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,19 @@
+# ASYNC COMMENTS
+from avanzatech_blog.async_api import async_api_view
+from avanzatech_blog.pagination import AsyncPagination
+from avanzatech_blog.visibility import filter_by_visible_post
+from comments.models import Comment
+from comments.serializers import CommentSerializer
+from comments.views import CommentFilter
+
+
+@async_api_view
+async def comment_list(request, user):
+    """
+    Async version of CommentListView: comments of the visible posts, filtered by ?post and ?user.
+    """
+    queryset = filter_by_visible_post(Comment.objects.all(), user)
+    queryset = CommentFilter(request.GET, queryset=queryset).qs
+    paginator = AsyncPagination()
+    comments = await paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_data(CommentSerializer(comments, many=True).data)
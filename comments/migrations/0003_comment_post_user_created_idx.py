@@ -0,0 +1,20 @@
+# Generated by Django 5.0 on 2026-10-18 10:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_remove_comment_is_deleted'),
+        ('posts', '0013_post_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'user', '-created_at'], name='comment_post_user_created_idx'),
+        ),
+    ]
@@ -1,8 +1,59 @@
+from collections import defaultdict
+
 from django.db import models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.core.exceptions import ValidationError
 from posts.models import Post
 from user.models import CustomUser, DefaultModel
 
+
+class CommentManager(models.Manager):
+    """
+    Manager with the batched lookups used by the post list.
+    """
+
+    def latest_per_post(self, post_ids, count):
+        """
+        Return the newest comments of each post, for all the posts in one query.
+
+        Numbers the comments of every post with ROW_NUMBER() OVER (PARTITION BY post_id
+        ORDER BY created_at DESC, id DESC) and keeps the first ``count``. The numbering
+        walks every comment of the posts, but only in comment_post_created_idx; rows
+        are read from the table for the kept comments only.
+
+        Args:
+            post_ids (list): The ids of the posts.
+            count (int): Comments per post.
+
+        Returns:
+            dict: post id -> list of comments, newest first; posts without comments are missing.
+        """
+        if not post_ids or count < 1:
+            return {}
+        newest_first = [F('created_at').desc(), F('id').desc()]
+        # The window only reads (post_id, created_at, id), all in the index; the other
+        # columns are fetched for the kept rows only
+        kept = (self.filter(post_id__in=post_ids)
+                .annotate(position=Window(RowNumber(), partition_by=F('post_id'), order_by=newest_first))
+                .filter(position__lte=count)
+                .values('pk'))
+        comments = self.filter(pk__in=kept).order_by('post_id', *newest_first)
+        by_post = defaultdict(list)
+        for comment in comments:
+            by_post[comment.post_id].append(comment)
+        return by_post
+
+    def attach_latest(self, posts, count):
+        """
+        Set ``latest_comments`` on every post to its newest ``count`` comments, with latest_per_post.
+        """
+        by_post = self.latest_per_post([post.pk for post in posts], count)
+        for post in posts:
+            post.latest_comments = by_post.get(post.pk, [])
+        return posts
+
+
 # Create your models here.
 # a model for comments
 class Comment(DefaultModel, models.Model):
@@ -15,10 +66,25 @@ class Comment(DefaultModel, models.Model):
         content (TextField): The content of the comment.
     """
 
-    post = models.ForeignKey(Post, on_delete=models.CASCADE)
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    # comment_post_user_created_idx starts with post, so post_id has no index of its own
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, db_index=False)
     content = models.TextField()
 
+    objects = CommentManager()
+
+    class Meta:
+        indexes = [
+            # Serves "delete my latest comment on this post"
+            models.Index(fields=['post', 'user', '-created_at'], name='comment_post_user_created_idx'),
+            # Newest comments of each post on a feed page (CommentManager.latest_per_post)
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_idx'),
+            # Cursor pages of the comment list (avanzatech_blog.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='comment_created_idx'),
+            # ?user= in cursor order; also serves the user foreign key
+            models.Index(fields=['user', '-created_at', '-id'], name='comment_user_created_idx'),
+        ]
+
     def __str__(self):
         return self.post.title + ' - ' + self.user.username + ' - ' + self.content[:20]
 
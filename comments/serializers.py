@@ -1,7 +1,8 @@
 from rest_framework import serializers
+from avanzatech_blog.metrics import TimedSerializerMixin
 from .models import Comment
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Comment model.
     """
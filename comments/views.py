@@ -7,11 +7,11 @@ from avanzatech_blog.permissions import UserHasReadPermission
 from django.shortcuts import get_object_or_404
 from posts.models import Post
 from rest_framework.response import Response
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 import django_filters
-from django.db.models import Q, Subquery
 from django.core.exceptions import ObjectDoesNotExist
-from rest_framework.pagination import PageNumberPagination
+from avanzatech_blog.pagination import BlogPagination
+from avanzatech_blog.visibility import filter_by_visible_post
 from rest_framework.exceptions import PermissionDenied
 
 
@@ -34,7 +34,8 @@ class CommentCreateView(generics.GenericAPIView):
             Post: El objeto Post correspondiente al post_id.
         """
         post_id = self.kwargs['post_id']
-        return get_object_or_404(Post, id=post_id)
+        # Author is joined here because UserHasReadPermission reads obj.author.team
+        return get_object_or_404(Post.objects.select_related('author'), id=post_id)
     
     def post(self, request, post_id):
         """
@@ -60,7 +61,9 @@ class CommentCreateView(generics.GenericAPIView):
             return Response({"error": "Content is required"}, status=status.HTTP_400_BAD_REQUEST)
         
         try:
-            Comment.objects.create(user=request.user, post=post, content = content)
+            with transaction.atomic():
+                Comment.objects.create(user=request.user, post=post, content = content)
+                Post.objects.filter(pk=post.pk).add_to_counter('comment_count', 1)
             return Response({"message": "Comment added successfully"}, status=status.HTTP_200_OK)  # return a 200 OK status
         except IntegrityError:
             return Response({"error": "Error creating comment"}, status=status.HTTP_400_BAD_REQUEST)
@@ -82,14 +85,63 @@ class CommentCreateView(generics.GenericAPIView):
         except PermissionDenied:
             return Response({"error": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
         
-        # Obtener el último comentario del post
-        last_comment = Comment.objects.filter(post=post, user=request.user).order_by('-created_at').first()
+        # Obtener el último comentario del post (índice post, user, created_at)
+        last_comment_id = (Comment.objects.filter(post=post, user=request.user)
+                           .order_by('-created_at').values_list('pk', flat=True).first())
         
-        if last_comment:
-            last_comment.delete()
+        if last_comment_id and self.delete_comment(post, last_comment_id):
             return Response({"message": "Comment deleted successfully"}, status=status.HTTP_200_OK)  # return a 200 OK status
         else:
             return Response({"error": "Comment does not exist"}, status=status.HTTP_400_BAD_REQUEST)
+    
+    def delete_comment(self, post, comment_id):
+        """
+        Delete a comment of the requesting user on the post.
+
+        The ownership check is part of the DELETE statement, so another user's comment
+        is never loaded or removed.
+
+        Returns:
+            bool: True if the comment was deleted.
+        """
+        with transaction.atomic():
+            deleted, _ = Comment.objects.filter(pk=comment_id, post=post, user=self.request.user).delete()
+            if deleted:
+                Post.objects.filter(pk=post.pk).add_to_counter('comment_count', -deleted)
+        return deleted > 0
+
+
+class CommentDeleteView(CommentCreateView):
+    """
+    Vista para eliminar un comentario por su ID
+
+    Only the author of the comment can delete it, and they must still have read
+    permission on the post.
+    """
+    http_method_names = ['delete', 'options']
+    
+    def delete(self, request, post_id, comment_id):
+        """
+        Elimina el comentario indicado de un post.
+        
+        Args:
+            request (HttpRequest): La solicitud HTTP recibida.
+            post_id (int): El ID del post.
+            comment_id (int): El ID del comentario a eliminar.
+        
+        Returns:
+            Response: La respuesta HTTP con el resultado de la operación.
+        """
+        try:
+            post = self.get_object()
+            self.check_object_permissions(request, post) #Verificar permisos del objeto
+        except PermissionDenied:
+            return Response({"error": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
+        
+        if self.delete_comment(post, comment_id):
+            return Response({"message": "Comment deleted successfully"}, status=status.HTTP_200_OK)
+        # Si no existe o es de otro usuario, no se revela cuál de los dos casos es
+        return Response({"error": "Comment does not exist"}, status=status.HTTP_404_NOT_FOUND)
 
 
 class CommentFilter(django_filters.FilterSet):
@@ -109,7 +161,7 @@ class CommentListView(generics.ListAPIView):
     """
     serializer_class = CommentSerializer
     filterset_class = CommentFilter
-    pagination_class = PageNumberPagination
+    pagination_class = BlogPagination
     
     def get_queryset(self):
             """
@@ -120,19 +172,8 @@ class CommentListView(generics.ListAPIView):
             """
             user = self.request.user
             try:
-                if user.is_authenticated and user.is_admin:
-                    queryset = CommentFilter(self.request.query_params, queryset=Comment.objects.all()).qs
-                elif not user.is_authenticated:
-                    allowed_posts = Post.objects.filter(read_permission='public')
-                    queryset = CommentFilter(self.request.query_params, queryset=Comment.objects.filter(post_id__in=allowed_posts)).qs
-                else:
-                    allowed_posts = Post.objects.filter(
-                        Q(read_permission='public') |
-                        Q(read_permission='authenticated') |
-                        Q(author=self.request.user) |
-                        Q(author__team=self.request.user.team)
-                    )
-                    queryset = CommentFilter(self.request.query_params, queryset=Comment.objects.filter(post_id__in=allowed_posts)).qs
+                queryset = filter_by_visible_post(Comment.objects.all(), user)
+                queryset = CommentFilter(self.request.query_params, queryset=queryset).qs
             except ObjectDoesNotExist:
                 return Response({"detail": "No se encontraron posts permitidos"}, status=status.HTTP_404_NOT_FOUND)
             except Exception:
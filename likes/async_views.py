@@ -0,0 +1,24 @@
+# ASYNC LIKES
+from asgiref.sync import sync_to_async
+
+from avanzatech_blog.async_api import async_api_view
+from avanzatech_blog.pagination import AsyncPagination
+from avanzatech_blog.visibility import filter_by_visible_post
+from likes.buffer import like_buffer
+from likes.models import Like
+from likes.serializers import LikeSerializer
+from likes.views import CustomPagination, LikeFilter
+
+
+@async_api_view
+async def like_list(request, user):
+    """
+    Async version of LikeListView: likes of the visible posts, filtered by ?user_id and ?post_id.
+    """
+    if like_buffer.has_pending(user.pk):
+        await sync_to_async(like_buffer.flush_pending)(user.pk)
+    queryset = filter_by_visible_post(Like.objects.all(), user)
+    queryset = LikeFilter(request.GET, queryset=queryset).qs
+    paginator = AsyncPagination(CustomPagination.page_size)
+    likes = await paginator.paginate_queryset(queryset, request)
+    return paginator.get_paginated_data(LikeSerializer(likes, many=True).data)
@@ -0,0 +1,276 @@
+"""
+Write-behind buffer for likes (settings.LIKE_WRITE_BEHIND).
+
+Like and unlike requests record the new state of the (post, user) pair in
+memory and return; a background thread writes the buffered pairs in batches,
+one INSERT per post for new likes and one DELETE per post for removed ones,
+followed by one counter UPDATE per distinct change, all in one transaction.
+
+Each entry is a flip of the stored state, so a like followed by an unlike
+before the next flush cancels out and never reaches the database. That also
+makes the pending change of a post's like_count the sum of its entries,
+which the post serializer adds to the stored counter.
+
+The buffer lives in the process: a user whose requests reach another worker
+sees their like once it is flushed (settings.LIKE_WRITE_BEHIND_INTERVAL).
+Entries still pending when the process dies are lost; a clean exit flushes them.
+"""
+import atexit
+import logging
+import threading
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+
+from likes.models import Like
+from posts.models import Post
+from user.models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+class LikeBuffer:
+    """
+    Pending like states keyed by (post_id, user_id), True for liked.
+
+    ``pending`` receives new entries; ``flushing`` holds the entries being
+    written, which still count as the current state until the transaction
+    commits. An entry in ``pending`` is a flip of the state in ``flushing`` when
+    the pair is there, and of the stored state otherwise.
+    """
+
+    # Raw SQL: building the ORM query took most of the time of a buffered like
+    stored_like_sql = f'SELECT 1 FROM {Like._meta.db_table} WHERE post_id = %s AND user_id = %s'
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Only one flush writes at a time, so there is a single ``flushing`` set
+        self.flush_lock = threading.Lock()
+        self.wake = threading.Event()
+        self.worker = None
+        self.stopping = False
+        self.pending = {}
+        self.flushing = {}
+        # Entries per user and like_count change per post, kept so reads never scan the entries
+        self.pending_users = Counter()
+        self.post_deltas = Counter()
+        self.version = 0
+        # Flushes committed so far; a stored state read before the last one may be stale
+        self.flushes = 0
+
+    def record(self, post_id, user_id, liked):
+        """
+        Set the like state of a pair.
+
+        Args:
+            post_id (int): The id of the post.
+            user_id (int): The id of the user.
+            liked (bool): True to like, False to unlike.
+
+        Returns:
+            bool: True if the state changed, False if it already was ``liked``.
+        """
+        key = (post_id, user_id)
+        while True:
+            with self.lock:
+                flushes = self.flushes
+                buffered = self.buffered_state(post_id, user_id)
+            # The stored state is read outside the lock, so one like's query does not hold up the others
+            stored = self.stored_state(key) if buffered is None else None
+            with self.lock:
+                current = self.buffered_state(post_id, user_id)
+                if current is None:
+                    # Read again when the entry found before is gone, or a flush committed since the read
+                    if stored is None or self.flushes != flushes:
+                        continue
+                    current = stored
+                if current == liked:
+                    return False
+                if key in self.pending:
+                    # Flipping a pending entry again goes back to the state underneath it
+                    self.discard_pending(key)
+                else:
+                    self.pending[key] = liked
+                    self.pending_users[user_id] += 1
+                    self.post_deltas[post_id] += 1 if liked else -1
+                self.version += 1
+                size = len(self.pending)
+                break
+        self.start()
+        if size >= settings.LIKE_WRITE_BEHIND_BATCH_SIZE:
+            self.wake.set()
+        return True
+
+    def stored_state(self, key):
+        with connection.cursor() as cursor:
+            cursor.execute(self.stored_like_sql, key)
+            return cursor.fetchone() is not None
+
+    def discard_pending(self, key):
+        # Called with self.lock held
+        liked = self.pending.pop(key)
+        self.pending_users[key[1]] -= 1
+        self.post_deltas[key[0]] -= 1 if liked else -1
+
+    def pending_like_delta(self, post_id):
+        """
+        Return how much the post's like_count will change once the buffer is flushed.
+        """
+        # The flush thread changes the counters; reads take the lock like record() and flush()
+        with self.lock:
+            return self.post_deltas.get(post_id, 0)
+
+    def buffered_state(self, post_id, user_id):
+        """
+        Return the like state of a pair that is still in the buffer, or None when the stored state is current.
+        """
+        key = (post_id, user_id)
+        # pending first: flush() moves entries from pending to flushing
+        state = self.pending.get(key)
+        return self.flushing.get(key) if state is None else state
+
+    def has_pending(self, user_id):
+        with self.lock:
+            return self.pending_users[user_id] > 0
+
+    def flush_pending(self, user_id):
+        """
+        Write the user's entries when write-behind is on and they have any; a no-op otherwise.
+
+        Read endpoints that list stored likes call this so users see their own likes.
+        """
+        if settings.LIKE_WRITE_BEHIND and user_id is not None and self.has_pending(user_id):
+            self.flush(user_id=user_id)
+
+    def flush(self, user_id=None):
+        """
+        Write the pending entries, or only the ones of one user.
+
+        Entries are put back when the write fails, so they are retried on the next flush.
+
+        Args:
+            user_id (int, optional): Only flush this user's entries.
+
+        Returns:
+            int: The number of entries written.
+        """
+        with self.flush_lock:
+            with self.lock:
+                if user_id is None:
+                    self.flushing, self.pending = self.pending, {}
+                    self.pending_users.clear()
+                else:
+                    self.flushing = {key: liked for key, liked in self.pending.items() if key[1] == user_id}
+                    for key in self.flushing:
+                        del self.pending[key]
+                    self.pending_users.pop(user_id, None)
+            entries = self.flushing
+            if not entries:
+                return 0
+            try:
+                try:
+                    self.write(entries)
+                except IntegrityError:
+                    # A post or user was deleted after the like was buffered
+                    self.write(self.without_missing_rows(entries))
+            except Exception:
+                with self.lock:
+                    self.restore(entries)
+                raise
+            with self.lock:
+                # The entries are stored now, so they no longer change the counters shown
+                for (post_id, _), liked in entries.items():
+                    self.post_deltas[post_id] -= 1 if liked else -1
+                self.flushing = {}
+                self.flushes += 1
+        return len(entries)
+
+    def write(self, entries):
+        likes, unlikes = defaultdict(list), defaultdict(list)
+        for (post_id, user_id), liked in entries.items():
+            (likes if liked else unlikes)[post_id].append(user_id)
+        deltas = Counter()
+        # Only writes: the first statement takes the write lock, so SQLite never has to upgrade a read snapshot
+        with transaction.atomic():
+            for post_id, user_ids in unlikes.items():
+                deltas[post_id] -= Like.objects.remove_many(post_id, user_ids)
+            for post_id, user_ids in likes.items():
+                deltas[post_id] += Like.objects.add_many(post_id, user_ids)
+            posts_by_delta = defaultdict(list)
+            for post_id, delta in deltas.items():
+                if delta:
+                    posts_by_delta[delta].append(post_id)
+            for delta, post_ids in posts_by_delta.items():
+                Post.objects.filter(pk__in=post_ids).add_to_counter('like_count', delta)
+
+    def without_missing_rows(self, entries):
+        post_ids = set(Post.objects.filter(pk__in={post_id for post_id, _ in entries}).values_list('pk', flat=True))
+        user_ids = set(CustomUser.objects.filter(pk__in={user_id for _, user_id in entries})
+                       .values_list('pk', flat=True))
+        return {(post_id, user_id): liked for (post_id, user_id), liked in entries.items()
+                if post_id in post_ids and user_id in user_ids}
+
+    def restore(self, entries):
+        # Called with self.lock held, after a failed write
+        for key, liked in entries.items():
+            if key in self.pending:
+                # The newer entry flipped this one back to the stored state
+                self.discard_pending(key)
+                self.post_deltas[key[0]] -= 1 if liked else -1
+            else:
+                self.pending[key] = liked
+                self.pending_users[key[1]] += 1
+        self.flushing = {}
+
+    def clear(self):
+        with self.lock:
+            self.pending, self.flushing = {}, {}
+            self.pending_users.clear()
+            self.post_deltas.clear()
+
+    def start(self):
+        """
+        Start the flush thread, once per process.
+
+        With settings.LIKE_WRITE_BEHIND_INTERVAL set to None no thread is started
+        and the buffer is only written by explicit flush() calls (used by the tests).
+        """
+        if self.worker is not None or settings.LIKE_WRITE_BEHIND_INTERVAL is None:
+            return
+        with self.lock:
+            if self.worker is not None:
+                return
+            self.worker = threading.Thread(target=self.run, name='like-write-behind', daemon=True)
+            self.worker.start()
+        atexit.register(self.flush)
+
+    def stop(self):
+        """
+        Stop the flush thread after its current flush; pending entries stay in the buffer.
+        """
+        worker = self.worker
+        if worker is None:
+            return
+        self.stopping = True
+        self.wake.set()
+        worker.join()
+        self.worker = None
+        self.stopping = False
+
+    def run(self):
+        while not self.stopping:
+            self.wake.wait(settings.LIKE_WRITE_BEHIND_INTERVAL)
+            self.wake.clear()
+            if self.stopping:
+                break
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Could not flush the like buffer; the entries will be retried')
+                # A failed connection must not be reused by the next flush
+                connection.close()
+        connection.close()
+
+
+like_buffer = LikeBuffer()
@@ -1,8 +1,180 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models.constants import OnConflict
+from django.db.models.sql import InsertQuery
 
 from posts.models import Post
 from user.models import CustomUser, DefaultModel
 
+
+# The statements below go around the public ORM, because bulk_create(ignore_conflicts=True)
+# does not report which rows it inserted and QuerySet.delete() does not return the deleted
+# rows. They rely on the private InsertQuery and SQLInsertCompiler.returning_fields, which
+# were checked against Django 5.0; review them when upgrading Django.
+def insert_ignoring_conflicts(model, using, objs, returning_field=None):
+    """
+    Compile one INSERT of objs that skips the rows conflicting with a unique constraint.
+
+    Args:
+        model (Model): The model of objs.
+        using (str): The database alias.
+        objs (list): Unsaved instances; their non-pk fields are inserted.
+        returning_field (Field, optional): A field to return for each inserted row
+            (RETURNING); only on backends with can_return_rows_from_bulk_insert.
+
+    Returns:
+        tuple: The SQL and its parameters.
+    """
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    query = InsertQuery(model, on_conflict=OnConflict.IGNORE)
+    query.insert_values(fields, objs)
+    compiler = query.get_compiler(using=using)
+    if returning_field is not None:
+        compiler.returning_fields = [returning_field]
+    [(sql, params)] = compiler.as_sql()
+    return sql, params
+
+
+def delete_returning(model, using, filters, returning_field):
+    """
+    Compile a DELETE ... RETURNING of the rows whose columns equal the given values.
+
+    Args:
+        model (Model): The model of the rows.
+        using (str): The database alias.
+        filters (dict): Field name to a value, or to a list of values for IN.
+        returning_field (Field): The field to return for each deleted row.
+
+    Returns:
+        tuple: The SQL and its parameters.
+    """
+    qn = connections[using].ops.quote_name
+    conditions, params = [], []
+    for name, value in filters.items():
+        column = qn(model._meta.get_field(name).column)
+        if isinstance(value, list):
+            conditions.append(f'{column} IN ({", ".join(["%s"] * len(value))})')
+            params.extend(value)
+        else:
+            conditions.append(f'{column} = %s')
+            params.append(value)
+    sql = (f'DELETE FROM {qn(model._meta.db_table)} WHERE {" AND ".join(conditions)} '
+           f'RETURNING {qn(returning_field.column)}')
+    return sql, params
+
+
+class LikeManager(models.Manager):
+    """
+    Manager with idempotent like/unlike operations, one statement each.
+    """
+
+    def add(self, post_id, user_id):
+        """
+        Insert the like unless it already exists, without raising IntegrityError.
+
+        Uses the backend's conflict-ignoring insert (INSERT OR IGNORE, ON CONFLICT DO NOTHING,
+        INSERT IGNORE), so a duplicate never aborts the surrounding transaction.
+
+        Args:
+            post_id (int): The id of the liked post.
+            user_id (int): The id of the user.
+
+        Returns:
+            bool: True if the like was inserted, False if it already existed.
+        """
+        return self.add_many(post_id, [user_id]) > 0
+
+    def add_many(self, post_id, user_ids):
+        """
+        Insert the likes of several users on one post, ignoring the ones that exist.
+
+        Unlike bulk_create(ignore_conflicts=True), it reports how many rows were new,
+        which is what the post's like_count must grow by.
+
+        Args:
+            post_id (int): The id of the liked post.
+            user_ids (list): The ids of the users.
+
+        Returns:
+            int: The number of likes inserted.
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+        fields = [field for field in self.model._meta.concrete_fields if not field.primary_key]
+        # The statement is compiled once; the other rows only differ in user_id and go through executemany
+        sql, params = insert_ignoring_conflicts(self.model, self.db, [self.model(post_id=post_id, user_id=user_ids[0])])
+        position = [field.attname for field in fields].index('user_id')
+        rows = [(*params[:position], user_id, *params[position + 1:]) for user_id in user_ids]
+        with connections[self.db].cursor() as cursor:
+            cursor.executemany(sql, rows)
+            return cursor.rowcount
+
+    def remove(self, post_id, user_id):
+        """
+        Delete the like if it exists, in a single DELETE statement.
+
+        Returns:
+            bool: True if a like was deleted.
+        """
+        return self.remove_many(post_id, [user_id]) > 0
+
+    def remove_many(self, post_id, user_ids):
+        """
+        Delete the likes of several users on one post.
+
+        Returns:
+            int: The number of likes deleted.
+        """
+        deleted, _ = self.filter(post_id=post_id, user_id__in=user_ids).delete()
+        return deleted
+
+    def add_for_user(self, user_id, post_ids):
+        """
+        Insert the likes of one user on several posts, ignoring the ones that exist.
+
+        The conflict-ignoring INSERT returns the rows it wrote (RETURNING), so the
+        caller knows which likes are new even when another request wrote some of them
+        between its reads and this statement.
+
+        Args:
+            user_id (int): The id of the user.
+            post_ids (list): The ids of the liked posts.
+
+        Returns:
+            list: The ids of the posts whose like was inserted.
+        """
+        post_ids = list(post_ids)
+        if not post_ids:
+            return []
+        connection = connections[self.db]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            return [post_id for post_id in post_ids if self.add(post_id=post_id, user_id=user_id)]
+        sql, params = insert_ignoring_conflicts(self.model, self.db,
+                                                [self.model(post_id=post_id, user_id=user_id) for post_id in post_ids],
+                                                returning_field=self.model._meta.get_field('post'))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [post_id for post_id, in cursor.fetchall()]
+
+    def remove_for_user(self, user_id, post_ids):
+        """
+        Delete the likes of one user on several posts, in one DELETE ... RETURNING.
+
+        Returns:
+            list: The ids of the posts whose like was deleted.
+        """
+        post_ids = list(post_ids)
+        if not post_ids:
+            return []
+        connection = connections[self.db]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            return [post_id for post_id in post_ids if self.remove(post_id=post_id, user_id=user_id)]
+        sql, params = delete_returning(self.model, self.db, {'user': user_id, 'post': post_ids},
+                                       returning_field=self.model._meta.get_field('post'))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [post_id for post_id, in cursor.fetchall()]
+
 # Create your models here.
 # a model for likes
 class Like(DefaultModel, models.Model):
@@ -10,11 +182,20 @@ class Like(DefaultModel, models.Model):
     Represents a like on a post by a user.
     """
 
-    post = models.ForeignKey(Post, on_delete=models.CASCADE)
-    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    # The (post, user) unique index serves the lookups by post, so post_id has no index of its own
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, db_index=False)
+    user = models.ForeignKey(CustomUser, on_delete=models.CASCADE, db_index=False)
+    
+    objects = LikeManager()
     
     class Meta:
         unique_together = ('post', 'user')
+        indexes = [
+            # Cursor pages of the like list (avanzatech_blog.pagination.KeysetPagination)
+            models.Index(fields=['-created_at', '-id'], name='like_created_idx'),
+            # ?user_id= in cursor order; also serves the user foreign key
+            models.Index(fields=['user', '-created_at', '-id'], name='like_user_created_idx'),
+        ]
 
     def __str__(self):
         return self.post.title + ' - ' + self.user.username
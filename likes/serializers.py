@@ -1,8 +1,10 @@
+from django.conf import settings
 from rest_framework import serializers
 
+from avanzatech_blog.metrics import TimedSerializerMixin
 from likes.models import Like
 
-class LikeSerializer(serializers.ModelSerializer):
+class LikeSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Like model.
     """
@@ -20,4 +22,30 @@ class LikeSerializer(serializers.ModelSerializer):
         Returns:
             Like: The newly created Like instance.
         """
-        return Like.objects.create(**validated_data)
\ No newline at end of file
+        return Like.objects.create(**validated_data)
+
+
+class LikeBulkSerializer(serializers.Serializer):
+    """
+    Validates a batch of like and unlike actions replayed by a client.
+    """
+    like = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+    unlike = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+
+    def validate(self, data):
+        """
+        Remove repeated ids and check the size of the batch.
+
+        Raises:
+            serializers.ValidationError: If the batch is empty, too large, or a post is both liked and unliked.
+        """
+        like = list(dict.fromkeys(data['like']))
+        unlike = list(dict.fromkeys(data['unlike']))
+        if not like and not unlike:
+            raise serializers.ValidationError('Provide at least one post id in like or unlike.')
+        if len(like) + len(unlike) > settings.LIKE_BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f'At most {settings.LIKE_BULK_MAX_ITEMS} post ids can be sent in one request.')
+        if set(like) & set(unlike):
+            raise serializers.ValidationError('A post cannot be liked and unliked in the same request.')
+        return {'like': like, 'unlike': unlike}
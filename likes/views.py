@@ -1,15 +1,18 @@
 
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from likes.buffer import like_buffer
 from likes.models import Like
 from posts.models import Post
-from likes.serializers import LikeSerializer
-from avanzatech_blog.permissions import UserHasReadPermission, IsCustomAdminUser
-from django.db import IntegrityError
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q, Subquery
+from likes.serializers import LikeBulkSerializer, LikeSerializer
+from avanzatech_blog.permissions import UserHasReadPermission
+from django.db import transaction
+from avanzatech_blog.pagination import BlogPagination
+from avanzatech_blog.visibility import filter_by_visible_post
+from django.db.models import Case, Value, When
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.exceptions import PermissionDenied
 
@@ -31,11 +34,15 @@ class LikeCreateView(generics.GenericAPIView):
         Obtiene el objeto Post correspondiente al post_id proporcionado en los parámetros de la URL.
         """
         post_id = self.kwargs['post_id']
-        return get_object_or_404(Post, id=post_id)
+        # Author is joined here because UserHasReadPermission reads obj.author.team
+        return get_object_or_404(Post.objects.select_related('author'), id=post_id)
     
     def post(self, request, post_id):
         """
         Crea un like para un post.
+
+        Repeating the request is safe: the insert ignores duplicates, and a repeated
+        like answers 200 with changed=False.
         """
         try:
             post = self.get_object()
@@ -43,15 +50,16 @@ class LikeCreateView(generics.GenericAPIView):
         except PermissionDenied:
             return Response({"error": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
         
-        try:
-            Like.objects.create(user=request.user, post=post)
-            return Response({"message": "Like added successfully"}, status=status.HTTP_200_OK)  # return a 200 OK status
-        except IntegrityError:
-            return Response({"error": "Like already exists"}, status=status.HTTP_400_BAD_REQUEST)
+        if self.set_like(post, liked=True):
+            return Response({"message": "Like added successfully", "changed": True}, status=status.HTTP_200_OK)  # return a 200 OK status
+        return Response({"message": "Like already exists", "changed": False}, status=status.HTTP_200_OK)
     
     def delete(self, request, post_id):
         """
         Elimina un like de un post.
+
+        A single conditional DELETE removes the like; repeating the request
+        leaves the state unchanged and answers 200 with changed=False.
         """
         try:
             post = self.get_object()
@@ -59,12 +67,97 @@ class LikeCreateView(generics.GenericAPIView):
         except PermissionDenied:
             return Response({"error": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
         
-        like = Like.objects.filter(user=request.user, post=post)
-        if not like.exists():
-            return Response({"error": "Like does not exist"}, status=status.HTTP_400_BAD_REQUEST)
+        if self.set_like(post, liked=False):
+            return Response({"message": "Like deleted successfully", "changed": True}, status=status.HTTP_200_OK)  # return a 200 OK status
+        return Response({"message": "Like does not exist", "changed": False}, status=status.HTTP_200_OK)
+
+    def set_like(self, post, liked):
+        """
+        Like or unlike the post for the requesting user and keep like_count in step.
+
+        With settings.LIKE_WRITE_BEHIND the change is buffered and written later in a
+        batch (see likes.buffer), so the request does not take the database write lock.
+
+        Returns:
+            bool: True if the like state changed.
+        """
+        user_id = self.request.user.pk
+        if settings.LIKE_WRITE_BEHIND:
+            return like_buffer.record(post.pk, user_id, liked)
+        with transaction.atomic():
+            if liked:
+                changed = Like.objects.add(post_id=post.pk, user_id=user_id)
+            else:
+                changed = Like.objects.remove(post_id=post.pk, user_id=user_id)
+            if changed:
+                Post.objects.filter(pk=post.pk).add_to_counter('like_count', 1 if liked else -1)
+        return changed
+
+
+class LikeBulkView(generics.GenericAPIView):
+    """
+    Vista para dar y quitar likes a varios posts en una sola solicitud
+
+    Body: {"like": [post_id, ...], "unlike": [post_id, ...]}
+
+    Read permission for the whole batch is checked in one query with the rules of
+    UserHasReadPermission, likes are inserted with one bulk INSERT and removed with one
+    DELETE, so the number of queries does not depend on the size of the batch. Both
+    return the rows they changed, and like_count and the results follow those rows.
+    """
+    serializer_class = LikeBulkSerializer
+    permission_classes = [IsAuthenticated]
+    # (estado si cambió, estado si ya estaba así)
+    results = {
+        "like": ("liked", "already_liked"),
+        "unlike": ("unliked", "not_liked"),
+    }
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        like_ids = serializer.validated_data['like']
+        unlike_ids = serializer.validated_data['unlike']
+        user = request.user
+        # Buffered likes of this user must be stored before the writes below
+        like_buffer.flush_pending(user.pk)
+
+        posts = Post.objects.filter(pk__in=like_ids + unlike_ids)
+        readable_filter = UserHasReadPermission.readable_posts_filter(user)
+        if readable_filter is None:
+            readable = Value(True)
+        else:
+            readable = Case(When(readable_filter, then=Value(True)), default=Value(False))
+        readable_by_id = dict(posts.annotate(readable=readable).values_list('pk', 'readable'))
 
-        like.delete()
-        return Response({"message": "Like deleted successfully"}, status=status.HTTP_200_OK)  # return a 200 OK status
+        # The writes report which rows they changed, so a like or unlike made by a concurrent
+        # request is neither counted twice nor reported as changed by this one
+        with transaction.atomic():
+            liked = Like.objects.add_for_user(user.pk, [post_id for post_id in like_ids
+                                                        if readable_by_id.get(post_id)])
+            if liked:
+                Post.objects.filter(pk__in=liked).add_to_counter('like_count', 1)
+            unliked = Like.objects.remove_for_user(user.pk, [post_id for post_id in unlike_ids
+                                                             if readable_by_id.get(post_id)])
+            if unliked:
+                Post.objects.filter(pk__in=unliked).add_to_counter('like_count', -1)
+
+        liked, unliked = set(liked), set(unliked)
+        results = [self.get_result(post_id, "like", readable_by_id, liked) for post_id in like_ids]
+        results += [self.get_result(post_id, "unlike", readable_by_id, unliked) for post_id in unlike_ids]
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    def get_result(self, post_id, action, readable_by_id, changed_ids):
+        """
+        Describe the outcome of one action: changed, unchanged, not_found or forbidden.
+        """
+        if post_id not in readable_by_id:
+            result = "not_found"
+        elif not readable_by_id[post_id]:
+            result = "forbidden"
+        else:
+            result = self.results[action][post_id not in changed_ids]
+        return {"post_id": post_id, "action": action, "status": result}
 
 
 # FILTERS OF LIKES 
@@ -80,13 +173,11 @@ class LikeFilter(django_filters.FilterSet):
         model = Like
         fields = ['user_id', 'post_id']
 
-class CustomPagination(PageNumberPagination):
+class CustomPagination(BlogPagination):
     """
-        Paginación personalizada
+        Paginación personalizada (admite ?pagination=cursor)
     """
     page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
 # LIST OF LIKES
 class LikeListView(generics.ListAPIView):
     """
@@ -99,20 +190,11 @@ class LikeListView(generics.ListAPIView):
     def get_queryset(self):
         user = self.request.user
 
+        # The user's own buffered likes are written first, so they are listed
+        like_buffer.flush_pending(user.pk)
         try:
-            if user.is_authenticated and user.is_admin:
-                queryset = LikeFilter(self.request.query_params, queryset=Like.objects.all()).qs
-            elif not user.is_authenticated:
-                allowed_posts = Post.objects.filter(read_permission='public')
-                queryset = LikeFilter(self.request.query_params, queryset=Like.objects.filter(post_id__in=allowed_posts)).qs
-            else:
-                allowed_posts = Post.objects.filter(
-                    Q(read_permission='public') |
-                    Q(read_permission='authenticated') |
-                    Q(author=self.request.user) |
-                    Q(author__team=self.request.user.team)
-                )
-                queryset = LikeFilter(self.request.query_params, queryset=Like.objects.filter(post_id__in=allowed_posts)).qs
+            queryset = filter_by_visible_post(Like.objects.all(), user)
+            queryset = LikeFilter(self.request.query_params, queryset=queryset).qs
         except ObjectDoesNotExist:
             return Response({"detail": "No se encontraron posts permitidos"}, status=status.HTTP_404_NOT_FOUND)
         except Exception:
@@ -17,7 +17,7 @@ class PostAdmin(admin.ModelAdmin):
     """
     Admin class for managing Post model in the Django admin site.
     """
-    list_display = ('id','title', 'author', 'edit_permission','read_permission')
+    list_display = ('id','title', 'author', 'edit_permission','read_permission', 'like_count', 'comment_count')
     list_filter = ('id','author')
     search_fields = ('title', 'author__username')
     list_editable = ('edit_permission','read_permission')
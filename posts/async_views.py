@@ -0,0 +1,40 @@
+# ASYNC POSTS
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotFound, PermissionDenied
+
+from avanzatech_blog.async_api import async_api_view
+from avanzatech_blog.pagination import AsyncPagination
+from avanzatech_blog.permissions import UserHasReadPermission
+from avanzatech_blog.visibility import visible_posts
+from comments.models import Comment
+from posts.models import Post
+from posts.serializers import PostSerializer
+from posts.views import latest_comments_count
+
+
+@async_api_view(authenticated=True)
+async def post_list(request, user):
+    """
+    Async version of the post list (PostCreateView GET), paginated with ?page and ?page_size.
+    """
+    count = latest_comments_count(request.GET)
+    queryset = visible_posts(user).select_related('author').with_liked_by_me(user)
+    paginator = AsyncPagination()
+    posts = await paginator.paginate_queryset(queryset, request)
+    if count:
+        await sync_to_async(Comment.objects.attach_latest)(posts, count)
+    return paginator.get_paginated_data(PostSerializer(posts, many=True, context={'request': request}).data)
+
+
+@async_api_view
+async def post_detail(request, user, id):
+    """
+    Async version of PostDetailView, with the checks of UserHasReadPermission.
+    """
+    try:
+        post = await Post.objects.select_related('author').with_liked_by_me(user).aget(id=id)
+    except Post.DoesNotExist:
+        raise NotFound()
+    if not UserHasReadPermission.can_read(user, post):
+        raise PermissionDenied("No tienes permiso para ver este post")
+    return PostSerializer(post, context={'request': request}).data
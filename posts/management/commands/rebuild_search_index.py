@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from posts.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the post search index from the posts table.
+
+    Saves and deletes through the ORM keep the index current (see posts.signals); this is for
+    posts written with bulk_create, fixtures or raw SQL.
+    """
+    help = 'Rebuild the full-text search index over post titles and contents'
+
+    def handle(self, *args, **options):
+        indexed = get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} posts'))
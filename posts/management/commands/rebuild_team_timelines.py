@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from posts.timeline import rebuild
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the team timelines of the post list from the posts table.
+
+    Saves and deletes through the ORM keep the timelines current while settings.POST_TEAM_TIMELINE
+    is on (see posts.signals); this is for enabling it and for posts written with bulk_create,
+    fixtures or raw SQL.
+    """
+    help = 'Rebuild the materialized team timelines used by the post list'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--depth', type=int, help='Entries per team (default: POST_TEAM_TIMELINE_DEPTH)')
+
+    def handle(self, *args, **options):
+        written = rebuild(depth=options['depth'])
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} timeline entries'))
@@ -9,10 +9,14 @@ class Migration(migrations.Migration):
         ('posts', '0009_alter_post_content'),
     ]
 
+    # 0010 and 0011 turn the id into a UUID and back, so the schema ends where it started.
+    # Only the model state changes: PostgreSQL cannot cast the bigint ids to uuid.
     operations = [
-        migrations.AlterField(
-            model_name='post',
-            name='id',
-            field=models.UUIDField(default=None, editable=False, primary_key=True, serialize=False),
-        ),
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.AlterField(
+                model_name='post',
+                name='id',
+                field=models.UUIDField(default=None, editable=False, primary_key=True, serialize=False),
+            ),
+        ]),
     ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.0 on 2026-10-18 09:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_author_team(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    CustomUser = apps.get_model('user', 'CustomUser')
+    Post.objects.update(team=Subquery(CustomUser.objects.filter(pk=OuterRef('author_id')).values('team')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_alter_post_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='team',
+            field=models.CharField(blank=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(copy_author_team, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['read_permission', '-created_at'], name='post_read_perm_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['team', '-created_at'], name='post_team_created_idx'),
+        ),
+    ]
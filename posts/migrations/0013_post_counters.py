@@ -0,0 +1,34 @@
+# Generated by Django 5.0 on 2026-10-18 09:50
+
+from django.db import migrations, models
+
+from posts.counters import actual_counts
+
+
+def count_likes_and_comments(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    counts = actual_counts(apps.get_model('likes', 'Like'), apps.get_model('comments', 'Comment'))
+    Post.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_post_team'),
+        ('likes', '0002_remove_like_is_deleted'),
+        ('comments', '0002_remove_comment_is_deleted'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_likes_and_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# A literal, so later changes to posts.search cannot change this migration
+FTS_TABLE = 'posts_post_fts'
+
+
+def create_search_index(apps, schema_editor):
+    # Only SQLite gets an index; other databases use the backend chosen in settings.POST_SEARCH_BACKEND
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+                          f"title, content, tokenize = 'unicode61 remove_diacritics 2')")
+    # bm25 weights per column: a match in the title counts ten times one in the content
+    schema_editor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    schema_editor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title, content) '
+                          f'SELECT id, title, content FROM posts_post')
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0013_post_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.0 on 2026-10-18 11:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0015_post_created_modified_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamTimelineEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='timeline_entry', serialize=False, to='posts.post')),
+                ('team', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', '-created_at', '-post'], name='timeline_team_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0 on 2026-10-18 13:40
+
+from django.conf import settings
+from django.db import migrations
+
+
+def drop_author_entries(apps, schema_editor):
+    """
+    Remove the entries of 'author' posts, which teammates cannot read, and write back
+    the team posts they had pushed out of their timelines.
+    """
+    Post = apps.get_model('posts', 'Post')
+    TeamTimelineEntry = apps.get_model('posts', 'TeamTimelineEntry')
+    entries = TeamTimelineEntry.objects.filter(post__read_permission='author')
+    teams = set(entries.values_list('team', flat=True))
+    entries.delete()
+    for team in teams:
+        newest = (Post.objects.filter(team=team, read_permission='team').order_by('-created_at', '-id')
+                  .values_list('pk', 'created_at')[:settings.POST_TEAM_TIMELINE_DEPTH])
+        TeamTimelineEntry.objects.bulk_create([TeamTimelineEntry(post_id=pk, team=team, created_at=created_at)
+                                               for pk, created_at in newest], ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_team_timeline'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_author_entries, migrations.RunPython.noop),
+    ]
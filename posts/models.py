@@ -1,7 +1,53 @@
 from django.db import models
+from django.db.models import Exists, F, OuterRef, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
 
+from posts.counters import COUNTERS
 from user.models import CustomUser, DefaultModel
 
+
+class PostQuerySet(models.QuerySet):
+    def add_to_counter(self, field, amount):
+        """
+        Atomically add amount to a counter column (like_count, comment_count) of every post in the queryset.
+
+        modified_at is bumped as well, since the counters are part of the post's
+        representation and its ETag (see avanzatech_blog.conditional).
+
+        Args:
+            field (str): The counter column.
+            amount (int): The value to add, negative to subtract.
+
+        Returns:
+            int: The number of posts updated.
+        """
+        value = F(field) + amount
+        if amount < 0:
+            # A counter that drifted below the real value must not go negative
+            value = Greatest(value, Value(0))
+        return self.update(**{field: value, 'modified_at': timezone.now()})
+
+    def with_liked_by_me(self, user):
+        """
+        Annotate liked_by_me: whether the user likes each post, as an EXISTS subquery of the same statement.
+
+        The subquery is a lookup on the (post, user) unique index of likes, so the number
+        of queries per page does not grow with the page size. Anonymous users like nothing.
+
+        Args:
+            user (CustomUser | AnonymousUser): The requesting user.
+
+        Returns:
+            QuerySet: The posts with a liked_by_me attribute.
+        """
+        if not user.is_authenticated:
+            return self.annotate(liked_by_me=Value(False))
+        # likes.models imports this module, so Like is imported when the method runs
+        from likes.models import Like
+        return self.annotate(liked_by_me=Exists(Like.objects.filter(post_id=OuterRef('pk'), user_id=user.pk)))
+
+
 # Create your models here.
 # a model for Posts
 class Post(DefaultModel, models.Model):
@@ -19,6 +65,9 @@ class Post(DefaultModel, models.Model):
         author (CustomUser): The author of the post.
         read_permission (str): The read permission for the post.
         edit_permission (str): The edit permission for the post.
+        team (str): Copy of the author's team, kept so visibility filters do not join the user table.
+        like_count (int): Number of likes, maintained by the like views.
+        comment_count (int): Number of comments, maintained by the comment views.
     """
 
     PUBLIC = 'public'
@@ -38,9 +87,101 @@ class Post(DefaultModel, models.Model):
     author = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
     read_permission = models.CharField(max_length=20, choices=PERMISSIONS, default=PUBLIC)
     edit_permission = models.CharField(max_length=20, choices=PERMISSIONS, default=PUBLIC)
+    team = models.CharField(max_length=255, blank=True, default='', editable=False)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    
+    objects = PostQuerySet.as_manager()
     
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        # Copy the author's team; posts.signals keeps it in sync when the author changes team
+        if Post.author.is_cached(self):
+            self.team = self.author.team
+        elif not self.team:
+            self.team = CustomUser.objects.values_list('team', flat=True).get(pk=self.author_id)
+        super().save(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # The counters are only written with F() (add_to_counter); a full-row UPDATE would
+        # put back the values read when the post was loaded and lose the increments since.
+        # Leaving them out here rather than through update_fields keeps save()'s fallback to
+        # INSERT when the row is gone, which then writes the counters the post carries.
+        # Model._do_update is private; checked against Django 5.0.
+        if update_fields is None:
+            values = [value for value in values if value[0].attname not in COUNTERS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['read_permission', '-created_at'], name='post_read_perm_created_idx'),
+            models.Index(fields=['team', '-created_at'], name='post_team_created_idx'),
+            # Unfiltered list (admins) in both pagination modes; id breaks created_at ties
+            models.Index(fields=['-created_at', '-id'], name='post_created_idx'),
+            # Incremental exports by modified_at (avanzatech_blog.export)
+            models.Index(fields=['modified_at'], name='post_modified_idx'),
+        ]
+
+class TeamTimelineEntry(models.Model):
+    """
+    A post in the materialized timeline of its team (settings.POST_TEAM_TIMELINE).
+
+    Only ``team`` posts have an entry: the shared permissions already show a post
+    to every member, and ``author`` posts only to their author. Each team keeps its newest
+    settings.POST_TEAM_TIMELINE_DEPTH. See posts.timeline.
+
+    Attributes:
+        post (Post): The post; a post is in at most one timeline, its team's.
+        team (str): Copy of Post.team.
+        created_at (datetime): Copy of Post.created_at, the timeline order.
+    """
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name='timeline_entry')
+    team = models.CharField(max_length=255)
+    created_at = models.DateTimeField()
+
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        indexes = [
+            # One range scan per page of a team's timeline
+            models.Index(fields=['team', '-created_at', '-post'], name='timeline_team_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.team} - {self.post_id}'
+
+
+
+class Match(models.Lookup):
+    """
+    ``<column> MATCH <query>``, the full-text condition of SQLite FTS5.
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+class PostSearchEntry(models.Model):
+    """
+    A row of the SQLite FTS5 index of posts, which Fts5SearchBackend joins (see posts.search).
+
+    The virtual table is created by posts migration 0014 on SQLite only, so the model
+    is unmanaged. Its rowid is the post id; FTS5 names the ``document`` column after
+    the table, and ``rank`` is the table's bm25 ranking.
+    """
+    post = models.OneToOneField(Post, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid',
+                                db_constraint=False, related_name='search_entry')
+    document = models.TextField(db_column='posts_post_fts')
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = 'posts_post_fts'
+
+
+# Only this column takes MATCH; a lookup on the field instance keeps it off other text fields
+PostSearchEntry._meta.get_field('document').register_lookup(Match)
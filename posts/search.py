@@ -0,0 +1,134 @@
+"""
+Full-text search over Post.title and Post.content.
+
+The backend is chosen with settings.POST_SEARCH_BACKEND (a dotted path). When it
+is None, SQLite databases use Fts5SearchBackend and every other database falls
+back to ContainsSearchBackend. posts.signals keeps the index in step with post
+saves and deletes; rows written around the ORM (bulk_create, raw SQL) need
+``python manage.py rebuild_search_index``.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+FTS_TABLE = 'posts_post_fts'
+WORD_RE = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """
+    Split a user query into words, dropping FTS operators and punctuation.
+
+    Args:
+        query (str): The raw ``q`` parameter.
+
+    Returns:
+        list: The words, lower-cased.
+    """
+    return WORD_RE.findall(query.lower())
+
+
+def get_search_backend():
+    """
+    Return an instance of the configured search backend.
+    """
+    path = settings.POST_SEARCH_BACKEND
+    if path is None:
+        path = ('posts.search.Fts5SearchBackend' if connection.vendor == 'sqlite'
+                else 'posts.search.ContainsSearchBackend')
+    return import_string(path)()
+
+
+class ContainsSearchBackend:
+    """
+    Backend without an index: every word must appear in the title or the content.
+
+    Runs LIKE scans, so it is only meant for databases without a full-text backend.
+    Results are ordered newest first.
+    """
+
+    def search(self, queryset, terms):
+        """
+        Restrict a Post queryset to the posts matching every term, best match first.
+
+        Args:
+            queryset (QuerySet): The posts the user may see.
+            terms (list): Words returned by search_terms().
+
+        Returns:
+            QuerySet: The matching posts, ordered.
+        """
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(content__icontains=term))
+        return queryset.order_by('-created_at', '-id')
+
+    def index(self, post):
+        pass
+
+    def remove(self, post_id):
+        pass
+
+    def rebuild(self):
+        return 0
+
+
+class Fts5SearchBackend(ContainsSearchBackend):
+    """
+    SQLite FTS5 index in the posts_post_fts table (created by posts migration 0014).
+
+    The FTS rowid is the post id, and searches join the table through the unmanaged
+    posts.models.PostSearchEntry, so FTS5 yields the matches and each post is read
+    by primary key. Results are ranked with bm25, with title matches weighted ten
+    times content matches (the table's rank setting).
+
+    bm25 is computed for every match before the first page can be returned, which
+    takes over a second for a word found in most of a million posts. Queries with
+    more than settings.POST_SEARCH_RANK_MAX_MATCHES matches are therefore returned
+    newest first, which FTS5 reads straight from its index.
+    """
+
+    def search(self, queryset, terms):
+        # Quoted terms are plain words for FTS5; separated by spaces they must all match
+        match = ' '.join(f'"{term}"' for term in terms)
+        ranked = self.match_count(match) <= settings.POST_SEARCH_RANK_MAX_MATCHES
+        queryset = queryset.filter(search_entry__document__match=match)
+        if ranked:
+            return queryset.annotate(search_rank=F('search_entry__rank')).order_by('search_rank', '-id')
+        # The rowid is the post id; reading it from the index keeps FTS5 in its own order
+        return queryset.order_by('-search_entry__post_id')
+
+    def match_count(self, match):
+        """
+        Count the posts matching an FTS query, before the visibility filter.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+            return cursor.fetchone()[0]
+
+    def index(self, post):
+        with connection.cursor() as cursor:
+            # REPLACE drops the previous terms of an edited post in the same statement
+            cursor.execute(f'REPLACE INTO {FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)',
+                           [post.pk, post.title, post.content])
+
+    def remove(self, post_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+    def rebuild(self):
+        """
+        Re-index every post.
+
+        Returns:
+            int: The number of posts indexed.
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title, content) '
+                           f'SELECT id, title, content FROM posts_post')
+            indexed = cursor.rowcount
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        return indexed
@@ -1,10 +1,16 @@
 
+from django.conf import settings
+from avanzatech_blog.metrics import TimedSerializerMixin
+from comments.serializers import CommentSerializer
+from likes.buffer import like_buffer
+from likes.models import Like
 from posts.models import Post
 from rest_framework import serializers
+from user.serializers import AuthorSerializer
 
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Post model.
 
@@ -20,6 +26,9 @@ class PostSerializer(serializers.ModelSerializer):
 
     Methods:
         update(instance, validated_data): Updates an existing Post instance.
+        to_representation(instance): Expands the author when the request asks for ``?expand=author``
+            and adds ``latest_comments`` when the view attached them (``?comments=N``).
+        get_liked_by_me(instance): Whether the requesting user likes the post.
 
     """
     class Meta:
@@ -28,11 +37,57 @@ class PostSerializer(serializers.ModelSerializer):
                   'content',
                   'read_permission',
                   'edit_permission',
-                  'author',)
+                  'author',
+                  'like_count',
+                  'comment_count',
+                  'liked_by_me',)
         read_only_fields = (
             'author',
+            'like_count',
+            'comment_count',
         )
     
+    liked_by_me = serializers.SerializerMethodField()
+    
+    def expand_author(self):
+        request = self.context.get('request')
+        if request is None:
+            return False
+        # DRF requests have query_params; the async views pass the plain HttpRequest
+        params = getattr(request, 'query_params', request.GET)
+        return 'author' in params.get('expand', '').split(',')
+    
+    def get_liked_by_me(self, instance):
+        """
+        Read the liked_by_me annotation of the list and detail views (PostQuerySet.with_liked_by_me).
+
+        Posts loaded without it (create and edit responses) are looked up, one query each.
+        """
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return False
+        if settings.LIKE_WRITE_BEHIND:
+            buffered = like_buffer.buffered_state(instance.pk, user.pk)
+            if buffered is not None:
+                return buffered
+        if hasattr(instance, 'liked_by_me'):
+            return instance.liked_by_me
+        return Like.objects.filter(post_id=instance.pk, user_id=user.pk).exists()
+    
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if settings.LIKE_WRITE_BEHIND:
+            # Likes still in the write-behind buffer (likes.buffer) are counted already
+            data['like_count'] = max(0, data['like_count'] + like_buffer.pending_like_delta(instance.pk))
+        if self.expand_author():
+            # The views load the author with select_related, so this does not query
+            data['author'] = AuthorSerializer(instance.author).data
+        if hasattr(instance, 'latest_comments'):
+            # Loaded for the whole page by Comment.objects.attach_latest
+            data['latest_comments'] = CommentSerializer(instance.latest_comments, many=True).data
+        return data
+    
     def update(self, instance, validated_data):
         instance.title = validated_data.get('title', instance.title)
         instance.content = validated_data.get('content', instance.content)
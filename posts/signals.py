@@ -0,0 +1,52 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from posts import timeline
+from posts.models import Post
+from posts.search import get_search_backend
+from user.models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+def sync_post_team(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Copy the author's new team onto their posts so the visibility filter stays correct.
+
+    modified_at is bumped so the posts count as changed for the list ETags of their new team.
+    """
+    if created or (update_fields is not None and 'team' not in update_fields):
+        return
+    moved = (Post.objects.filter(author=instance).exclude(team=instance.team)
+             .update(team=instance.team, modified_at=timezone.now()))
+    if moved and settings.POST_TEAM_TIMELINE:
+        timeline.move_author(instance)
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Post)
+def unindex_post(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_post(sender, instance, update_fields=None, **kwargs):
+    if not settings.POST_TEAM_TIMELINE:
+        return
+    if update_fields is not None and not {'read_permission', 'team'} & set(update_fields):
+        return
+    timeline.fan_out(instance)
+
+
+@receiver(post_delete, sender=Post)
+def refill_timeline(sender, instance, **kwargs):
+    # The entry went with the post (CASCADE); an older post takes its place
+    if settings.POST_TEAM_TIMELINE and instance.read_permission == Post.TEAM:
+        timeline.refill(instance.team)
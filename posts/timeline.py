@@ -0,0 +1,165 @@
+"""
+Fan-out-on-write team timelines for the post list (settings.POST_TEAM_TIMELINE).
+
+A member of a team sees the shared posts (``public`` and ``authenticated``), the
+``team`` posts of their team and their own posts (see avanzatech_blog.visibility). The live query
+evaluates that OR over the posts table: the database either walks the date
+index until a page is filled, reading the posts of every other team on the way,
+or collects all the matches and sorts them.
+
+With the timeline on, the team's ``team`` posts are also written to
+TeamTimelineEntry when they are saved, and each team keeps its newest
+settings.POST_TEAM_TIMELINE_DEPTH. A page of the feed is then the merge of four
+streams newest first, each stopping after the page: public posts, authenticated
+posts, the team's timeline and the user's own ``author`` posts, which only they
+see. The streams are disjoint, so the merge needs no deduplication.
+
+posts.signals keeps the timelines in step with saves, deletes and team changes;
+rows written around the ORM (bulk_create, raw SQL) need
+``python manage.py rebuild_team_timelines``. The page is loaded through the
+visibility filter, so a stale entry can hide a post from a page but never show
+a post the user may not read.
+"""
+import heapq
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from avanzatech_blog.visibility import SHARED_PERMISSIONS
+from posts.models import Post, TeamTimelineEntry
+
+NEWEST_FIRST = ('-created_at', '-id')
+
+
+def team_posts(team):
+    """
+    Return the posts of a team that belong in its timeline, newest first.
+    """
+    return Post.objects.filter(team=team, read_permission=Post.TEAM).order_by(*NEWEST_FIRST)
+
+
+def fan_out(post):
+    """
+    Write, move or remove the post's timeline entry after it was saved.
+    """
+    previous = TeamTimelineEntry.objects.filter(post=post).values_list('team', flat=True).first()
+    if post.read_permission != Post.TEAM:
+        if previous is not None:
+            TeamTimelineEntry.objects.filter(post=post).delete()
+            refill(previous)
+        return
+    TeamTimelineEntry.objects.update_or_create(post=post, defaults={'team': post.team,
+                                                                   'created_at': post.created_at})
+    trim(post.team)
+    if previous is not None and previous != post.team:
+        refill(previous)
+
+
+def move_author(user):
+    """
+    Move the entries of the user's posts to their new team, after posts.signals.sync_post_team moved the posts.
+
+    The new team is refilled even when the user had no entries: their posts may
+    have been trimmed from a busy old timeline and still be among the newest of the new one.
+    """
+    entries = TeamTimelineEntry.objects.filter(post__author=user)
+    previous_teams = set(entries.exclude(team=user.team).values_list('team', flat=True))
+    if previous_teams:
+        entries.update(team=user.team)
+    for team in previous_teams | {user.team}:
+        refill(team)
+
+
+def trim(team, depth=None):
+    """
+    Delete the entries of a team past the newest ``depth``.
+
+    Args:
+        team (str): The team.
+        depth (int, optional): Entries to keep. Defaults to settings.POST_TEAM_TIMELINE_DEPTH.
+    """
+    depth = depth or settings.POST_TEAM_TIMELINE_DEPTH
+    entries = TeamTimelineEntry.objects.filter(team=team)
+    cutoff = entries.order_by('-created_at', '-post_id').values_list('created_at', 'post_id')[depth:depth + 1]
+    for created_at, post_id in cutoff:
+        entries.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, post_id__lte=post_id)).delete()
+
+
+def refill(team, depth=None):
+    """
+    Restore the newest ``depth`` entries of a team after posts left its timeline.
+
+    A timeline must hold the team's newest posts with no gaps for pages to be
+    served from it, so the posts that were trimmed earlier are written back.
+    """
+    depth = depth or settings.POST_TEAM_TIMELINE_DEPTH
+    newest = team_posts(team).values_list('pk', 'created_at')[:depth]
+    TeamTimelineEntry.objects.bulk_create([TeamTimelineEntry(post_id=pk, team=team, created_at=created_at)
+                                           for pk, created_at in newest], ignore_conflicts=True)
+    trim(team, depth)
+
+
+def rebuild(depth=None, batch_size=5000):
+    """
+    Rebuild every timeline from the posts table.
+
+    The newest posts of each team are picked with ROW_NUMBER() OVER (PARTITION BY team).
+
+    Returns:
+        int: The number of entries written.
+    """
+    depth = depth or settings.POST_TEAM_TIMELINE_DEPTH
+    TeamTimelineEntry.objects.all().delete()
+    newest = (Post.objects.filter(read_permission=Post.TEAM)
+              .annotate(position=Window(RowNumber(), partition_by=F('team'),
+                                        order_by=[F('created_at').desc(), F('id').desc()]))
+              .filter(position__lte=depth)
+              .values_list('pk', 'team', 'created_at'))
+    entries = [TeamTimelineEntry(post_id=pk, team=team, created_at=created_at) for pk, team, created_at in newest]
+    TeamTimelineEntry.objects.bulk_create(entries, batch_size=batch_size)
+    return len(entries)
+
+
+class TeamFeed:
+    """
+    The post list of a team member, read from the public, authenticated, team and own-post streams.
+
+    Behaves as the object list of django.core.paginator.Paginator: ``count()`` and
+    slicing. The count and the pages past the timeline's depth are read with the live queryset.
+
+    Args:
+        queryset (QuerySet): The live visible posts of the user, with the select_related
+            and annotations the page needs.
+        user (CustomUser): The requesting member.
+    """
+
+    def __init__(self, queryset, user):
+        self.queryset = queryset.order_by(*NEWEST_FIRST)
+        self.user = user
+
+    def count(self):
+        # One COUNT over the live filter beats counting the streams apart (bench_team_timeline)
+        return self.queryset.count()
+
+    def streams(self, stop):
+        """
+        Return the (created_at, id) keys of the newest ``stop`` posts of every stream.
+        """
+        shared = [Post.objects.filter(read_permission=permission).order_by(*NEWEST_FIRST)
+                  .values_list('created_at', 'pk')[:stop] for permission in SHARED_PERMISSIONS]
+        timeline = (TeamTimelineEntry.objects.filter(team=self.user.team).order_by('-created_at', '-post_id')
+                    .values_list('created_at', 'post_id')[:stop])
+        own = (Post.objects.filter(author_id=self.user.pk, read_permission=Post.AUTHOR).order_by(*NEWEST_FIRST)
+               .values_list('created_at', 'pk')[:stop])
+        return [*shared, timeline, own]
+
+    def __getitem__(self, index):
+        start, stop = index.start or 0, index.stop
+        if stop > settings.POST_TEAM_TIMELINE_DEPTH:
+            return self.queryset[start:stop]
+        keys = islice(heapq.merge(*self.streams(stop), reverse=True), start, stop)
+        ids = [pk for created_at, pk in keys]
+        posts = self.queryset.in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
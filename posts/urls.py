@@ -1,14 +1,17 @@
 from django.urls import path
-from comments.views import CommentCreateView
-from .views import PostCreateView, PostEditView, PostDetailView, PostDeleteView
-from likes.views import LikeCreateView
+from comments.views import CommentCreateView, CommentDeleteView
+from .views import PostCreateView, PostEditView, PostDetailView, PostDeleteView, PostSearchView
+from likes.views import LikeBulkView, LikeCreateView
 
 
 urlpatterns = [
     path('post/', PostCreateView.as_view(), name='post-create'),
+    path('post/search/', PostSearchView.as_view(), name='post-search'),
     path('post/<int:id>', PostDetailView.as_view(), name='post'),
     path('blog/<int:id>', PostEditView.as_view(), name='post-edit'),
     path('post/<int:post_id>/like/', LikeCreateView.as_view(), name='like-create-delete'),#done
+    path('post/like/bulk/', LikeBulkView.as_view(), name='like-bulk'),
     path('post/<int:post_id>/comment', CommentCreateView.as_view(), name='comment-create-delete'),# done
+    path('post/<int:post_id>/comment/<int:comment_id>', CommentDeleteView.as_view(), name='comment-delete'),
     path('post/<int:pk>/delete/', PostDeleteView.as_view(), name='post-delete')
 ]
\ No newline at end of file
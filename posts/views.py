@@ -1,36 +1,83 @@
 
 # POSTS
+from django.conf import settings
 from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework import status
 from rest_framework import generics
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from comments.models import Comment
+from posts.counters import COUNTERS
 from posts.models import Post
+from posts.search import get_search_backend, search_terms
 from posts.serializers import PostSerializer
+from posts.timeline import TeamFeed
 from django.core.exceptions import ValidationError
 from avanzatech_blog.permissions import UserHasEditPermission, UserHasReadPermission, IsCustomAdminUser
-from rest_framework.pagination import PageNumberPagination
+from avanzatech_blog.conditional import ConditionalGetMixin
+from avanzatech_blog.pagination import BlogPagination, SearchPagination
+from avanzatech_blog.visibility import visible_posts
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.exceptions import PermissionDenied
-from django.db.models import Q, Subquery
 from rest_framework import serializers
 
+def latest_comments_count(params):
+    """
+    Read ``?comments=N``, the number of newest comments to attach to each post of a list.
+
+    Args:
+        params (QueryDict): The query parameters.
+
+    Returns:
+        int: N, or 0 when the parameter is absent.
+
+    Raises:
+        ValidationError: If N is not between 1 and settings.POST_LATEST_COMMENTS_MAX.
+    """
+    value = params.get('comments')
+    if value is None:
+        return 0
+    if not value.isdigit() or not 1 <= int(value) <= settings.POST_LATEST_COMMENTS_MAX:
+        raise serializers.ValidationError(
+            {'comments': [f'Must be a number between 1 and {settings.POST_LATEST_COMMENTS_MAX}.']})
+    return int(value)
+
+
 # View for create POST and List
 
-class PostCreateView(generics.ListCreateAPIView):
+class PostCreateView(ConditionalGetMixin, generics.ListCreateAPIView):
     """
     Vista para la creación y listado de post a los que tengo permiso
+
+    GET answers 304 when the client's ETag still matches the page (see avanzatech_blog.conditional).
+    ``?comments=N`` adds the N newest comments of every post, loaded in one query for the page.
+    With settings.POST_TEAM_TIMELINE, members' page-number pages are read from their team's
+    timeline merged with the shared posts (see posts.timeline).
     """
     serializer_class = PostSerializer
-    pagination_class = PageNumberPagination
+    pagination_class = BlogPagination
     
     def get_permissions(self):
         return [IsAuthenticated()]
     
+    def paginate_queryset(self, queryset):
+        user = self.request.user
+        if (settings.POST_TEAM_TIMELINE and not user.is_admin and
+                not self.paginator.use_cursor(self.request)):
+            queryset = TeamFeed(queryset, user)
+        return super().paginate_queryset(queryset)
+    
+    def prepare_page(self, rows):
+        count = latest_comments_count(self.request.query_params)
+        if count:
+            Comment.objects.attach_latest(rows, count)
+    
     def perform_create(self, serializer):
         try:
-            serializer.save(author=self.request.user)
+            post = serializer.save(author=self.request.user)
+            # Nadie ha dado like a un post nuevo; evita la consulta de liked_by_me
+            post.liked_by_me = False
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
@@ -43,23 +90,11 @@ class PostCreateView(generics.ListCreateAPIView):
         """
         user = self.request.user
         try:
-            if user.is_authenticated and user.is_admin:
-                # Admin has all permissions, return all posts
-                queryset= Post.objects.all()
-            # If not authenticated only view the post with read_permissions=='public'
-            elif not user.is_authenticated:
-                queryset= Post.objects.filter(read_permission=Post.PUBLIC)
-        
-            else:
-                allowed_posts = Post.objects.filter(
-                Q(read_permission=Post.PUBLIC) |
-                Q(read_permission=Post.AUTHENTICATED) |
-                Q(author=user) |
-                Q(author__team=user.team)
-            )
-
-                queryset = Post.objects.filter(id__in=Subquery(allowed_posts.values('id')))
+            # Admins see every post, anonymous users the public ones (see avanzatech_blog.visibility)
+            queryset = visible_posts(user)
             
+            # El autor se carga en la misma consulta para ?expand=author, y liked_by_me tambien
+            queryset = queryset.select_related('author').with_liked_by_me(user)
         except ObjectDoesNotExist:
             # Manejo de la excepción cuando no se encuentran posts permitidos
             return Response({"detail": "No se encontraron posts permitidos"}, status=status.HTTP_404_NOT_FOUND)
@@ -70,6 +105,24 @@ class PostCreateView(generics.ListCreateAPIView):
         
         return queryset
 
+class PostSearchView(generics.ListAPIView):
+    """
+    Busqueda de texto completo en el titulo y el contenido de los posts visibles.
+
+    ``?q=`` is split into words and every word must match. Results are ranked by the
+    configured backend (see posts.search) and filtered with the same rules as the post list.
+    """
+    serializer_class = PostSerializer
+    pagination_class = SearchPagination
+    permission_classes = [IsAuthenticated]
+    
+    def get_queryset(self):
+        terms = search_terms(self.request.query_params.get('q', ''))
+        if not terms:
+            raise serializers.ValidationError({'q': ['This query parameter is required.']})
+        queryset = visible_posts(self.request.user).select_related('author').with_liked_by_me(self.request.user)
+        return get_search_backend().search(queryset, terms)
+
 # View for edit POST
 class PostEditView(generics.UpdateAPIView):
     """
@@ -93,22 +146,30 @@ class PostEditView(generics.UpdateAPIView):
         and the updated post data in the request body.
 
     """
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     permission_classes = [UserHasEditPermission]
     lookup_field = 'id'
     
+    def get_queryset(self):
+        # The response includes liked_by_me, read in the same SELECT
+        return super().get_queryset().with_liked_by_me(self.request.user)
+    
     def perform_update(self, serializer):
         try:
             serializer.save(author=self.request.user)
         except ValidationError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        # The save does not write the counters, so the values loaded with the post may be stale
+        serializer.instance.refresh_from_db(fields=COUNTERS)
         
         
-class PostDetailView(generics.RetrieveAPIView):
+class PostDetailView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     Vista para ver un solo post
 
+    Responses carry an ETag and Last-Modified taken from the post's modified_at.
+
     Attributes:
         queryset (QuerySet): The queryset of all posts.
         serializer_class (Serializer): The serializer class for the post model.
@@ -116,12 +177,15 @@ class PostDetailView(generics.RetrieveAPIView):
         permission_classes (list): The list of permission classes for the view.
     """
 
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     lookup_field = 'id'
     permission_classes = [UserHasReadPermission]
     pagination_class = 10
     
+    def get_queryset(self):
+        return super().get_queryset().with_liked_by_me(self.request.user)
+    
     def get_object(self):
         """
         Retrieve the post object and check permissions.
@@ -149,7 +213,7 @@ class PostDeleteView(generics.DestroyAPIView):
     
     Esta vista permite eliminar un post existente. Se requiere permiso de edición para realizar esta acción.
     """
-    queryset = Post.objects.all()
+    queryset = Post.objects.select_related('author')
     serializer_class = PostSerializer
     lookup_field = 'pk'
     permission_classes = [
@@ -0,0 +1,27 @@
+import pytest
+from django.db import connection
+from tests.markers import sqlite_only
+pytestmark = pytest.mark.django_db
+
+
+def pragma(name):
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA {name}')
+        return cursor.fetchone()[0]
+
+
+@sqlite_only
+class TestSqlitePragmas:
+    def test_uses_wal_journal(self):
+        assert pragma('journal_mode') == 'wal'
+
+    def test_synchronous_is_normal(self):
+        # 1 = NORMAL
+        assert pragma('synchronous') == 1
+
+    def test_busy_timeout_matches_settings(self, settings):
+        assert pragma('busy_timeout') == settings.SQLITE_BUSY_TIMEOUT * 1000
+
+
+def test_connections_are_persistent(settings):
+    assert settings.DATABASES['default']['CONN_MAX_AGE'] > 0 or 'pool' in settings.DATABASES['default']['OPTIONS']
@@ -0,0 +1,160 @@
+import json
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from avanzatech_blog.export import export_lines, export_queryset
+from comments.models import Comment
+from likes.models import Like
+from posts.models import Post
+from tests.factories import CommentsFactory, LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestExportView(TestCase):
+    def setUp(self):
+        self.admin = UserFactory(is_admin=True)
+        self.posts = PostFactory.create_batch(3)
+        LikesFactory(post=self.posts[0])
+        CommentsFactory(post=self.posts[1], content='línea\nnueva')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def export(self, kind, **params):
+        response = self.client.get(reverse('export', args=[kind]), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content).decode()
+        return response, [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_one_line_per_row(self):
+        response, rows = self.export('posts')
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual([row['id'] for row in rows], sorted(post.pk for post in self.posts))
+        self.assertEqual(rows[0]['author_id'], self.posts[0].author_id)
+        self.assertIn('like_count', rows[0])
+
+    def test_exports_likes_and_comments(self):
+        _, likes = self.export('likes')
+        _, comments = self.export('comments')
+
+        self.assertEqual([like['post_id'] for like in likes], [self.posts[0].pk])
+        # El salto de linea del contenido va escapado, asi que el comentario ocupa una sola linea
+        self.assertEqual([comment['content'] for comment in comments], ['línea\nnueva'])
+
+    def test_since_only_exports_rows_modified_after_the_watermark(self):
+        Post.objects.update(modified_at=timezone.now() - timedelta(hours=1))
+        response, _ = self.export('posts')
+        watermark = response['X-Export-Watermark']
+        Post.objects.filter(pk=self.posts[2].pk).update(modified_at=timezone.now())
+
+        _, rows = self.export('posts', since=watermark)
+
+        self.assertEqual([row['id'] for row in rows], [self.posts[2].pk])
+
+    def test_invalid_since_is_rejected(self):
+        response = self.client.get(reverse('export', args=['posts']), {'since': 'yesterday'})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('since', response.data)
+
+    def test_unknown_kind_is_not_found(self):
+        response = self.client.get(reverse('export', args=['users']))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_only_admins_can_export(self):
+        self.client.force_authenticate(UserFactory())
+
+        response = self.client.get(reverse('export', args=['posts']))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(LIKE_WRITE_BEHIND=True, LIKE_WRITE_BEHIND_INTERVAL=None)
+    def test_buffered_likes_are_exported(self):
+        from likes.buffer import like_buffer
+        self.addCleanup(like_buffer.clear)
+        like_buffer.record(self.posts[2].pk, self.admin.pk, True)
+
+        _, rows = self.export('likes')
+
+        self.assertEqual(len(rows), 2)
+
+
+class TestExportLines(TestCase):
+    def test_rows_modified_after_the_start_are_left_for_the_next_export(self):
+        post = PostFactory()
+        queryset, _ = export_queryset('posts')
+        Post.objects.filter(pk=post.pk).update(modified_at=timezone.now() + timedelta(seconds=1))
+
+        self.assertEqual(list(queryset), [])
+
+    @override_settings(EXPORT_WATERMARK_MARGIN=30)
+    def test_rows_committed_after_the_read_are_exported_next_time(self):
+        started = timezone.now()
+        queryset, watermark = export_queryset('posts')
+        self.assertEqual(list(queryset), [])
+        # Guardado antes de que empezara la exportacion, pero confirmado despues de leer la tabla
+        post = PostFactory()
+        Post.objects.filter(pk=post.pk).update(modified_at=started - timedelta(seconds=1))
+
+        self.assertLess(watermark, started - timedelta(seconds=29))
+        next_rows, _ = export_queryset('posts', since=watermark)
+        self.assertEqual([row['id'] for row in next_rows], [post.pk])
+
+    def test_yields_one_block_per_chunk(self):
+        post = PostFactory()
+        CommentsFactory.create_batch(5, post=post)
+
+        blocks = list(export_lines(export_queryset('comments')[0], chunk_size=2))
+
+        self.assertEqual([block.count('\n') for block in blocks], [2, 2, 1])
+
+    def test_reads_rows_without_model_instances(self):
+        queryset, _ = export_queryset('likes')
+
+        # values() devuelve diccionarios, no instancias
+        self.assertIs(queryset.model, Like)
+        self.assertEqual(queryset.query.values_select, ('id', 'post_id', 'user_id', 'created_at', 'modified_at'))
+
+
+class TestExportCommand(TestCase):
+    def test_writes_the_rows_to_a_file(self):
+        post = PostFactory()
+        CommentsFactory.create_batch(3, post=post)
+        path = self.make_path()
+        err = StringIO()
+
+        call_command('export_ndjson', 'comments', output=path, chunk_size=2, stderr=err)
+
+        with open(path) as exported:
+            rows = [json.loads(line) for line in exported]
+        self.assertEqual(len(rows), Comment.objects.count())
+        self.assertIn('Exported 3 comments, watermark ', err.getvalue())
+
+    def test_writes_to_stdout_by_default(self):
+        PostFactory()
+        out = StringIO()
+
+        call_command('export_ndjson', 'posts', since='2000-01-01T00:00:00', stdout=out, stderr=StringIO())
+
+        self.assertEqual(len(out.getvalue().splitlines()), 1)
+
+    def test_invalid_since_fails(self):
+        with self.assertRaises(CommandError):
+            call_command('export_ndjson', 'posts', since='not a date', stderr=StringIO())
+
+    def make_path(self):
+        import os
+        import tempfile
+        descriptor, path = tempfile.mkstemp(suffix='.ndjson')
+        os.close(descriptor)
+        self.addCleanup(os.remove, path)
+        return path
@@ -0,0 +1,87 @@
+import pytest
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from avanzatech_blog.metrics import histogram, request_metrics
+from tests.factories import PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+@override_settings(REQUEST_METRICS=True)
+class TestRequestMetrics(TestCase):
+    def setUp(self):
+        request_metrics.clear()
+        self.addCleanup(request_metrics.clear)
+        self.admin = UserFactory(is_admin=True)
+        self.user = UserFactory()
+        PostFactory.create_batch(3, read_permission='public')
+        self.client = APIClient()
+
+    def get_report(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse('request-metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['endpoints']
+
+    def test_records_each_endpoint(self):
+        self.client.force_authenticate(self.user)
+        for _ in range(3):
+            self.client.get(reverse('post-create'))
+        self.client.get(reverse('comment-list'))
+
+        report = self.get_report()
+
+        posts = report['post-create']
+        self.assertEqual(posts['requests'], 3)
+        # COUNT + page
+        self.assertEqual(posts['queries']['max'], 2)
+        self.assertGreater(posts['db_ms']['max'], 0)
+        self.assertGreater(posts['serialization_ms']['max'], 0)
+        self.assertGreaterEqual(posts['wall_ms']['p50'], posts['db_ms']['p50'])
+        self.assertEqual(sum(posts['wall_ms_histogram'].values()), 3)
+        self.assertEqual(report['comment-list']['requests'], 1)
+
+    def test_async_views_are_recorded(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('async-post-list'))
+
+        report = self.get_report()
+
+        self.assertEqual(report['async-post-list']['requests'], 1)
+        # COUNT + page; the session and the user come from the cache and a query
+        self.assertGreaterEqual(report['async-post-list']['queries']['max'], 2)
+
+    def test_only_admins_can_read_the_report(self):
+        self.client.force_authenticate(self.user)
+
+        response = self.client.get(reverse('request-metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_delete_clears_the_report(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get(reverse('post-create'))
+
+        response = self.client.delete(reverse('request-metrics'))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(list(self.get_report()), ['request-metrics'])
+
+
+class TestRequestMetricsDisabled(TestCase):
+    def test_nothing_is_recorded(self):
+        request_metrics.clear()
+        self.client.force_login(UserFactory())
+
+        self.client.get(reverse('post-create'))
+
+        self.assertEqual(request_metrics.report(), {})
+
+
+def test_histogram_buckets():
+    counts = histogram([1, 5, 7, 3000])
+
+    assert counts['<=5'] == 2
+    assert counts['<=10'] == 1
+    assert counts['>2500'] == 1
@@ -0,0 +1,118 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+from django.contrib.auth.models import AnonymousUser
+from avanzatech_blog.grants import grants_cache_key, reset_post_permissions
+from avanzatech_blog.middleware import AutoReadPermissionMiddleware
+from user.models import CustomUser
+from tests.factories import UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestAutoReadPermissionMiddleware(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.middleware = AutoReadPermissionMiddleware(lambda request: HttpResponse())
+        self.edit_permission = Permission.objects.get(content_type__app_label='posts', codename='change_post')
+        self.read_permission = Permission.objects.get(content_type__app_label='posts', codename='view_post')
+
+    def get_request(self, user):
+        request = RequestFactory().get('/post/')
+        request.user = user
+        return request
+
+    def test_warm_authenticated_request_runs_no_queries(self):
+        self.user.user_permissions.add(self.edit_permission)
+        # Primera solicitud: llena la cache
+        self.middleware(self.get_request(self.user))
+
+        with self.assertNumQueries(0):
+            response = self.middleware(self.get_request(self.user))
+        self.assertEqual(response.status_code, 200)
+
+    def test_anonymous_request_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            self.middleware(self.get_request(AnonymousUser()))
+
+    def test_edit_grant_adds_read_grant(self):
+        self.user.user_permissions.add(self.edit_permission)
+
+        self.assertTrue(self.user.user_permissions.filter(pk=self.read_permission.pk).exists())
+
+    def test_edit_grant_through_permission_adds_read_grant(self):
+        self.edit_permission.user_set.add(self.user)
+
+        self.assertTrue(self.user.user_permissions.filter(pk=self.read_permission.pk).exists())
+
+    def test_grant_change_invalidates_cached_grants(self):
+        # La primera solicitud guarda en cache que el usuario no tiene permisos
+        self.middleware(self.get_request(self.user))
+        self.user.user_permissions.add(self.edit_permission)
+        self.user.user_permissions.remove(self.read_permission)
+
+        self.middleware(self.get_request(self.user))
+
+        self.assertTrue(self.user.user_permissions.filter(pk=self.read_permission.pk).exists())
+
+    def test_edit_grant_stored_without_signal_is_reconciled(self):
+        CustomUser.user_permissions.through.objects.create(customuser=self.user, permission=self.edit_permission)
+
+        self.middleware(self.get_request(self.user))
+
+        self.assertTrue(self.user.user_permissions.filter(pk=self.read_permission.pk).exists())
+
+    def test_grants_cached_before_the_commit_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.user_permissions.add(self.edit_permission)
+            # Another request caches the old grants before the change commits
+            cache.set(grants_cache_key(self.user.pk), frozenset())
+
+        self.assertIsNone(cache.get(grants_cache_key(self.user.pk)))
+
+    def test_missing_read_permission_row_is_a_no_op(self):
+        self.read_permission.delete()
+        reset_post_permissions()
+        self.addCleanup(reset_post_permissions)
+
+        self.user.user_permissions.add(self.edit_permission)
+        response = self.middleware(self.get_request(self.user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.user.user_permissions.all()), [self.edit_permission])
+
+
+class TestAsyncAutoReadPermissionMiddleware(TestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.edit_permission = Permission.objects.get(content_type__app_label='posts', codename='change_post')
+
+    async def get_response(self, request):
+        return HttpResponse()
+
+    def get_request(self, user):
+        request = RequestFactory().get('/async/post/')
+
+        async def auser():
+            return user
+        request.auser = auser
+        return request
+
+    async def test_edit_grant_adds_read_grant(self):
+        middleware = AutoReadPermissionMiddleware(self.get_response)
+        # Stored around the m2m signal, so only the middleware can repair it
+        await CustomUser.user_permissions.through.objects.acreate(customuser=self.user,
+                                                                  permission=self.edit_permission)
+
+        response = await middleware(self.get_request(self.user))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(await self.user.user_permissions.filter(codename='view_post').aexists())
+
+    async def test_anonymous_request(self):
+        middleware = AutoReadPermissionMiddleware(self.get_response)
+
+        response = await middleware(self.get_request(AnonymousUser()))
+
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,88 @@
+import pytest
+from io import StringIO
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from avanzatech_blog.query_plans import explain, full_scans, list_view_plans, reads_one_page
+from posts.models import Post
+from tests.factories import CommentsFactory, LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestQueryPlans(TestCase):
+    def setUp(self):
+        self.member = UserFactory(team='red')
+        self.admin = UserFactory.create_superuser()
+        for permission, _ in Post.PERMISSIONS:
+            post = PostFactory(author=self.member, read_permission=permission)
+            LikesFactory(post=post)
+            CommentsFactory(post=post, user=self.member)
+        self.post = post
+        if connection.vendor == 'postgresql':
+            # On tables this small PostgreSQL prefers a Seq Scan even where an index fits; a
+            # scan it still picks with seq scans discouraged has no index to use. SET LOCAL
+            # ends with the test's transaction.
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assert_no_full_scans(self, user):
+        plans = list_view_plans(user, post_id=self.post.pk, user_id=self.member.pk)
+        # Cada vista envia al menos una consulta por caso
+        self.assertTrue(plans)
+        for name, sql, plan, scans in plans:
+            self.assertEqual(scans, [], f'{name}: {sql}\n' + '\n'.join(plan))
+
+    def test_member_lists_use_indexes(self):
+        self.assert_no_full_scans(self.member)
+
+    def test_admin_lists_use_indexes(self):
+        self.assert_no_full_scans(self.admin)
+
+    def test_anonymous_lists_use_indexes(self):
+        self.assert_no_full_scans(AnonymousUser())
+
+    def test_a_query_without_an_index_is_reported(self):
+        table = Post._meta.db_table
+
+        self.assertEqual(full_scans(explain(f"SELECT id FROM {table} WHERE content = 'x'")), [table])
+
+    def test_command_fails_on_full_scans_only(self):
+        out = StringIO()
+
+        call_command('explain_queries', stdout=out)
+
+        self.assertIn('No full table scans', out.getvalue())
+        self.assertIn('member / comment list by user', out.getvalue())
+
+
+@pytest.mark.parametrize('line, tables', [
+    ('SCAN posts_post', ['posts_post']),
+    ('SCAN posts_post USING INDEX post_created_idx', []),
+    ('SCAN likes_like USING COVERING INDEX like_user_created_idx', []),
+    ('SEARCH posts_post USING INTEGER PRIMARY KEY (rowid=?)', []),
+])
+def test_sqlite_full_scan_detection(line, tables):
+    assert full_scans([line], vendor='sqlite') == tables
+
+
+def test_postgresql_full_scan_detection():
+    plan = ['Limit  (cost=0.29..1.10 rows=10 width=8)',
+            '  ->  Seq Scan on comments_comment  (cost=0.00..155.00 rows=10000 width=8)']
+
+    assert full_scans(plan, vendor='postgresql') == ['comments_comment']
+
+
+def test_an_unfiltered_page_is_not_a_full_scan():
+    plan = ['SCAN likes_like']
+
+    assert reads_one_page('SELECT id FROM likes_like LIMIT 20', plan)
+    assert not reads_one_page('SELECT id FROM likes_like WHERE user_id = 1 LIMIT 20', plan)
+    assert not reads_one_page('SELECT id FROM likes_like LIMIT 20', plan + ['USE TEMP B-TREE FOR ORDER BY'])
+
+
+def test_a_scan_of_a_subquery_is_not_a_full_scan():
+    plan = ['CO-ROUTINE qualify', 'SEARCH comments_comment USING INDEX comment_post_created_idx (post_id=?)',
+            'SCAN qualify']
+
+    assert full_scans(plan, vendor='sqlite') == []
@@ -0,0 +1,95 @@
+import pytest
+from django.contrib.sessions.backends.base import UpdateError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from avanzatech_blog.lru import LRUCache
+from avanzatech_blog.sessions import SessionStore
+from tests.factories import PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert len(cache) == 2
+
+    def test_expired_entries_are_not_returned(self):
+        cache = LRUCache(maxsize=2)
+        cache.set('a', 1, ttl=0)
+
+        assert cache.get('a') is None
+        assert 'a' not in cache
+
+    def test_add_does_not_overwrite(self):
+        cache = LRUCache(maxsize=2)
+
+        assert cache.add('a', 1)
+        assert not cache.add('a', 2)
+        assert cache.get('a') == 1
+
+
+class TestMemorySessionStore:
+    def test_save_and_load(self):
+        session = SessionStore()
+        session['user'] = 'value'
+        session.save()
+
+        loaded = SessionStore(session.session_key)
+        assert loaded['user'] == 'value'
+        assert session.exists(session.session_key)
+
+    def test_delete(self):
+        session = SessionStore()
+        session['user'] = 'value'
+        session.save()
+        session.delete()
+
+        assert not session.exists(session.session_key)
+        assert SessionStore(session.session_key).load() == {}
+
+    def test_update_of_missing_session(self):
+        session = SessionStore('x' * 32)
+        session._session_cache = {'user': 'value'}
+
+        with pytest.raises(UpdateError):
+            session.save()
+
+
+class SessionQueriesMixin:
+    def setUp(self):
+        self.user = UserFactory()
+        PostFactory(read_permission='public')
+        self.client.force_login(self.user)
+
+    def count_session_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('post-create'))
+        self.assertEqual(response.status_code, 200)
+        return len([query for query in queries if 'django_session' in query['sql']])
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+class TestDatabaseSessions(SessionQueriesMixin, TestCase):
+    def test_every_request_reads_the_session_table(self):
+        self.assertEqual(self.count_session_queries(), 1)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+class TestCachedDatabaseSessions(SessionQueriesMixin, TestCase):
+    def test_session_is_read_from_the_cache(self):
+        self.assertEqual(self.count_session_queries(), 0)
+
+
+@override_settings(SESSION_ENGINE='avanzatech_blog.sessions')
+class TestMemorySessions(SessionQueriesMixin, TestCase):
+    def test_session_is_read_from_memory(self):
+        self.assertEqual(self.count_session_queries(), 0)
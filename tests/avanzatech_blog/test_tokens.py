@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+from avanzatech_blog.tokens import issue_token, read_token, revoke_user_tokens, token_user
+from tests.factories import PostFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    return UserFactory(team='red')
+
+
+@pytest.fixture
+def client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {issue_token(user)}')
+    return client
+
+
+def test_claims_round_trip(user):
+    claims = read_token(issue_token(user))
+
+    assert (claims['uid'], claims['team'], claims['adm']) == (user.pk, 'red', False)
+
+
+def test_token_user_is_built_without_queries(user, django_assert_num_queries):
+    with django_assert_num_queries(0):
+        rebuilt = token_user(read_token(issue_token(user)))
+        assert (rebuilt.pk, rebuilt.team, rebuilt.is_admin, rebuilt.is_authenticated) == (user.pk, 'red', False, True)
+        assert rebuilt == user
+
+    # Los demas campos se cargan al leerlos
+    with django_assert_num_queries(1):
+        assert rebuilt.username == user.username
+
+
+def test_requests_do_not_read_the_user_or_session_tables(client, user):
+    post = PostFactory(read_permission='team', author__team='red')
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('post', kwargs={'id': post.id}))
+    assert response.status_code == status.HTTP_200_OK
+    tables = ' '.join(query['sql'] for query in queries)
+    assert 'django_session' not in tables
+    # The post's author is joined for the payload; the requesting user is never read
+    assert 'WHERE "user_customuser"' not in tables
+
+
+def test_permissions_use_the_claims(client):
+    hidden = PostFactory(read_permission='team', author__team='blue')
+
+    response = client.get(reverse('post', kwargs={'id': hidden.id}))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.parametrize('token', ['', 'garbage', 'eyJ1aWQiOjF9:1sXr0a:tampered'])
+def test_invalid_tokens(token):
+    with pytest.raises(AuthenticationFailed, match='Invalid token'):
+        read_token(token)
+
+
+def test_expired_token(user):
+    token = issue_token(user)
+
+    with override_settings(API_TOKEN_TTL=-1), pytest.raises(AuthenticationFailed, match='Token expired'):
+        read_token(token)
+
+
+def test_revoking_a_user_keeps_later_tokens(user):
+    earlier = issue_token(user)
+    revoke_user_tokens(user.pk)
+    later = issue_token(user)
+
+    with pytest.raises(AuthenticationFailed, match='Token revoked'):
+        read_token(earlier)
+    assert read_token(later)['uid'] == user.pk
+
+
+def test_token_issued_before_the_commit_is_revoked(user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        user.team = 'blue'
+        user.save()
+        # Issued from the old row between the save and the commit
+        stale = issue_token(UserFactory.build(pk=user.pk, team='red'))
+
+    with pytest.raises(AuthenticationFailed, match='Token revoked'):
+        read_token(stale)
+    assert read_token(issue_token(user))['team'] == 'blue'
+
+
+def test_malformed_header_is_rejected(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer one two')
+
+    response = client.get(reverse('post-create'))
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+    assert response.data['detail'] == 'Invalid token header.'
@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from avanzatech_blog.permissions import UserHasReadPermission
+from avanzatech_blog.visibility import filter_by_visible_post, visible_posts
+from comments.models import Comment
+from likes.models import Like
+from posts.models import Post
+from tests.factories import CommentsFactory, LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestVisibility(TestCase):
+    def setUp(self):
+        self.author = UserFactory(team='red')
+        self.teammate = UserFactory(team='red')
+        self.outsider = UserFactory(team='blue')
+        self.admin = UserFactory.create_superuser()
+        self.public = PostFactory(author=self.author, read_permission=Post.PUBLIC)
+        self.team = PostFactory(author=self.author, read_permission=Post.TEAM)
+        self.private = PostFactory(author=self.outsider, read_permission=Post.AUTHOR)
+
+    def visible_ids(self, user):
+        return set(visible_posts(user).values_list('pk', flat=True))
+
+    def test_posts_follow_the_list_rules(self):
+        self.assertEqual(self.visible_ids(AnonymousUser()), {self.public.pk})
+        self.assertEqual(self.visible_ids(self.teammate), {self.public.pk, self.team.pk})
+        self.assertEqual(self.visible_ids(self.outsider), {self.public.pk, self.private.pk})
+        self.assertEqual(self.visible_ids(self.admin), {self.public.pk, self.team.pk, self.private.pk})
+
+    def test_author_posts_are_hidden_from_teammates(self):
+        own = PostFactory(author=self.author, read_permission=Post.AUTHOR)
+
+        self.assertNotIn(own.pk, self.visible_ids(self.teammate))
+        self.assertIn(own.pk, self.visible_ids(self.author))
+
+    def test_list_agrees_with_the_read_permission(self):
+        PostFactory(author=self.author, read_permission=Post.AUTHOR)
+        for user in (AnonymousUser(), self.author, self.teammate, self.outsider, self.admin):
+            readable = UserHasReadPermission.readable_posts_filter(user)
+            expected = Post.objects.all() if readable is None else Post.objects.filter(readable)
+
+            self.assertEqual(self.visible_ids(user), set(expected.values_list('pk', flat=True)))
+
+    def test_likes_and_comments_use_the_same_rules(self):
+        for post in (self.public, self.team, self.private):
+            LikesFactory(post=post)
+            CommentsFactory(post=post)
+
+        for model in (Like, Comment):
+            rows = filter_by_visible_post(model.objects.all(), self.teammate)
+            self.assertEqual(set(rows.values_list('post_id', flat=True)), {self.public.pk, self.team.pk})
+
+    def test_filter_follows_the_user_team(self):
+        self.teammate.team = 'green'
+
+        self.assertEqual(self.visible_ids(self.teammate), {self.public.pk})
+
+    def test_author_team_change_moves_team_posts(self):
+        self.author.team = 'green'
+        self.author.save()
+
+        self.assertEqual(self.visible_ids(self.teammate), {self.public.pk})
+
+    def test_related_rows_are_filtered_without_a_subquery(self):
+        with CaptureQueriesContext(connection) as queries:
+            list(filter_by_visible_post(Like.objects.all(), self.teammate))
+
+        self.assertEqual(queries[0]['sql'].upper().count('SELECT'), 1)
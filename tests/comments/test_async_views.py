@@ -0,0 +1,39 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from tests.factories import CommentsFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestAsyncCommentList(TestCase):
+    def setUp(self):
+        self.user = UserFactory(team='team-a')
+        self.stranger = UserFactory(team='team-b')
+        self.public_post = PostFactory(author=self.stranger, read_permission='public')
+        self.hidden_post = PostFactory(author=self.stranger, read_permission='author')
+        self.comment = CommentsFactory(post=self.public_post, user=self.user)
+        CommentsFactory(post=self.hidden_post, user=self.stranger)
+        self.url = reverse('async-comment-list')
+
+    def get_sync_list(self, params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse('comment-list'), params).json()
+
+    async def test_list_matches_sync_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'post': self.public_post.pk})
+
+        expected = await sync_to_async(self.get_sync_list)({'post': self.public_post.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+
+    async def test_hides_comments_of_unreadable_posts(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.json()['count'], 1)
+        self.assertEqual(response.json()['results'][0]['content'], self.comment.content)
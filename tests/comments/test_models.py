@@ -1,8 +1,10 @@
 import pytest
 pytestmark = pytest.mark.django_db
 from tests.factories import PostFactory, UserFactory
+from tests.markers import sqlite_only
 from django.core.exceptions import ValidationError
 from django.db.utils import IntegrityError
+from comments.models import Comment
 
 class TestCommentModel:
         @pytest.mark.django_db
@@ -16,6 +18,7 @@ class TestCommentModel:
             assert comment.post == post
             assert comment.user == user
             
+        @sqlite_only
         @pytest.mark.django_db
         def test_create_comment_missing_post(self, comments_factory):
             user = UserFactory()
@@ -24,6 +27,7 @@ class TestCommentModel:
                 comments_factory(post=None, user=user, content=content)
             assert str(e.value) == 'NOT NULL constraint failed: comments_comment.post_id'
                 
+        @sqlite_only
         @pytest.mark.django_db
         def test_create_comment_missing_user(self, comments_factory):
             post = PostFactory()
@@ -49,3 +53,35 @@ class TestCommentModel:
             content = "Test content"
             comment = comments_factory(post=post, user=user, content = content)
             assert comment.__str__() == post.title + ' - ' + user.username + ' - ' + comment.content[:20]
+
+
+class TestLatestPerPost:
+        @pytest.mark.django_db
+        def test_newest_comments_of_each_post(self, comments_factory):
+            first, second, empty = PostFactory(), PostFactory(), PostFactory()
+            old, new, newest = [comments_factory(post=first) for _ in range(3)]
+            only = comments_factory(post=second)
+            
+            latest = Comment.objects.latest_per_post([first.pk, second.pk, empty.pk], 2)
+            
+            assert latest[first.pk] == [newest, new]
+            assert latest[second.pk] == [only]
+            assert empty.pk not in latest
+            
+        @pytest.mark.django_db
+        def test_runs_one_query(self, comments_factory, django_assert_num_queries):
+            posts = PostFactory.create_batch(3)
+            for post in posts:
+                comments_factory.create_batch(4, post=post)
+            
+            with django_assert_num_queries(1):
+                latest = Comment.objects.latest_per_post([post.pk for post in posts], 3)
+            assert [len(comments) for comments in latest.values()] == [3, 3, 3]
+            
+        @pytest.mark.django_db
+        def test_attach_latest_sets_an_empty_list(self):
+            post = PostFactory()
+            
+            Comment.objects.attach_latest([post], 3)
+            
+            assert post.latest_comments == []
@@ -256,6 +256,80 @@ class TestCommentFilter(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         
+class TestCommentDeleteView(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='public', edit_permission='public')
+
+    def test_delete_comment_by_id(self):
+        first = CommentsFactory(post=self.post, user=self.user)
+        CommentsFactory(post=self.post, user=self.user)
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': first.id})
+        
+        # Realizar la solicitud
+        response = self.client.delete(url)
+        
+        # Se elimina el comentario indicado, no el último
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Comment.objects.filter(id=first.id).exists())
+        self.assertEqual(Comment.objects.count(), 1)
+
+    def test_delete_comment_of_another_user(self):
+        comment = CommentsFactory(post=self.post)
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': comment.id})
+        
+        # Realizar la solicitud
+        response = self.client.delete(url)
+        
+        # Verificar el comportamiento correcto
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['error'], "Comment does not exist")
+        self.assertTrue(Comment.objects.filter(id=comment.id).exists())
+
+    def test_delete_comment_of_another_post(self):
+        comment = CommentsFactory(user=self.user)
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': comment.id})
+        
+        # Realizar la solicitud
+        response = self.client.delete(url)
+        
+        # Verificar el comportamiento correcto
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Comment.objects.filter(id=comment.id).exists())
+
+    def test_delete_comment_without_read_permission(self):
+        comment = CommentsFactory(post=self.post, user=self.user)
+        self.post.read_permission = 'author'
+        self.post.save()
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': comment.id})
+        
+        # Realizar la solicitud
+        response = self.client.delete(url)
+        
+        # Verificar el comportamiento correcto
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Comment.objects.filter(id=comment.id).exists())
+
+    def test_delete_comment_by_id_runs_a_single_delete(self):
+        comment = CommentsFactory(post=self.post, user=self.user)
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': comment.id})
+        
+        # SELECT post + SAVEPOINT + DELETE + UPDATE comment_count + RELEASE
+        with self.assertNumQueries(5):
+            response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_post_is_not_allowed_on_comment_url(self):
+        comment = CommentsFactory(post=self.post, user=self.user)
+        url = reverse('comment-delete', kwargs={'post_id': self.post.id, 'comment_id': comment.id})
+        
+        response = self.client.post(url, {'content': 'This is a test comment'})
+        
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
 class TestCommentListView(APITestCase):
     def setUp(self):
         self.user = UserFactory()
@@ -361,4 +435,18 @@ class TestCommentListView(APITestCase):
         response = self.client.get(url, query_params)
         
         # Verificar el comportamiento correcto
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    def test_list_comments_with_cursor_pagination(self):
+        self.client.force_authenticate(user=self.user)
+        CommentsFactory.create_batch(12, post=self.post)
+        url = reverse('comment-list') + '?pagination=cursor'
+        
+        # Realizar la solicitud
+        response = self.client.get(url)
+        next_page = self.client.get(response.data['next'])
+        
+        # Verificar el comportamiento correcto
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(len(next_page.data['results']), 2)
+        self.assertIsNone(next_page.data['next'])
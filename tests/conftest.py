@@ -4,6 +4,8 @@ from django.conf import settings
 
 # Set the DJANGO_SETTINGS_MODULE environment variable.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'avanzatech_blog.settings')
+# PBKDF2 dominates the run time of the suite (every UserFactory hashes a password)
+os.environ.setdefault('BLOG_PASSWORD_HASHER', 'django.contrib.auth.hashers.MD5PasswordHasher')
 
 # Configure Django settings.
 django.setup()
@@ -13,6 +15,8 @@ pytest_plugins = [
 ]
 
 
+import pytest
+from django.core.cache import cache
 from pytest_factoryboy import register
 
 from .factories import UserFactory, PostFactory, LikesFactory, CommentsFactory
@@ -21,3 +25,10 @@ register(UserFactory)
 register(PostFactory)
 register(LikesFactory)
 register(CommentsFactory)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Row ids are reused between tests, so cached entries must not leak from one test to the next
+    cache.clear()
+    yield
@@ -0,0 +1,46 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from tests.factories import LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestAsyncLikeList(TestCase):
+    def setUp(self):
+        self.user = UserFactory(team='team-a')
+        self.stranger = UserFactory(team='team-b')
+        self.public_post = PostFactory(author=self.stranger, read_permission='public')
+        self.hidden_post = PostFactory(author=self.stranger, read_permission='team')
+        self.like = LikesFactory(post=self.public_post, user=self.user)
+        LikesFactory(post=self.public_post, user=self.stranger)
+        LikesFactory(post=self.hidden_post, user=self.stranger)
+        self.url = reverse('async-like-list')
+
+    def get_sync_list(self, params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse('like-list'), params).json()
+
+    async def test_list_matches_sync_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url)
+
+        expected = await sync_to_async(self.get_sync_list)({})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(response.json()['count'], 2)
+
+    async def test_filter_by_user(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'user_id': self.user.pk})
+
+        self.assertEqual(response.json()['results'], [{'post': self.public_post.pk, 'user': self.user.pk}])
+
+    async def test_anonymous_user_sees_likes_of_public_posts(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual({like['post'] for like in response.json()['results']}, {self.public_post.pk})
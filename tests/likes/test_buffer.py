@@ -0,0 +1,186 @@
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from django.db import OperationalError
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from likes.buffer import like_buffer
+from likes.models import Like
+from posts.models import Post
+from tests.factories import LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+@override_settings(LIKE_WRITE_BEHIND=True, LIKE_WRITE_BEHIND_INTERVAL=None)
+class TestLikeWriteBehind(TestCase):
+    def setUp(self):
+        like_buffer.clear()
+        self.addCleanup(like_buffer.clear)
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='public', edit_permission='public')
+        self.url = reverse('like-create-delete', kwargs={'post_id': self.post.id})
+
+    def get_like_count(self):
+        return self.client.get(reverse('post', kwargs={'id': self.post.id})).data['like_count']
+
+    def test_like_is_buffered_until_flush(self):
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['changed'])
+        self.assertFalse(Like.objects.exists())
+        # The pending like is already counted in the post
+        self.assertEqual(self.get_like_count(), 1)
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.post.refresh_from_db()
+        self.assertTrue(Like.objects.filter(post=self.post, user=self.user).exists())
+        self.assertEqual(self.post.like_count, 1)
+        self.assertEqual(self.get_like_count(), 1)
+
+    def test_repeated_like_reports_no_change(self):
+        self.client.post(self.url)
+
+        response = self.client.post(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data['changed'])
+
+    def test_like_then_unlike_never_reaches_the_database(self):
+        self.client.post(self.url)
+        self.client.delete(self.url)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(like_buffer.flush(), 0)
+        self.assertEqual(self.get_like_count(), 0)
+
+    def test_unlike_of_stored_like(self):
+        LikesFactory(post=self.post, user=self.user)
+        Post.objects.filter(pk=self.post.pk).update(like_count=1)
+
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.get_like_count(), 0)
+
+        like_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertFalse(Like.objects.exists())
+        self.assertEqual(self.post.like_count, 0)
+
+    def test_flush_batches_likes_of_many_users(self):
+        users = UserFactory.create_batch(5)
+        for user in users:
+            self.client.force_authenticate(user=user)
+            self.client.post(self.url)
+
+        # SAVEPOINT + one INSERT for the post + UPDATE like_count + RELEASE
+        with self.assertNumQueries(4):
+            like_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 5)
+
+    def test_like_list_shows_own_buffered_like(self):
+        self.client.post(self.url)
+
+        response = self.client.get(reverse('like-list'), {'user_id': self.user.pk})
+
+        self.assertEqual(response.data['count'], 1)
+        self.assertFalse(like_buffer.has_pending(self.user.pk))
+
+    def test_failed_flush_keeps_entries(self):
+        self.client.post(self.url)
+        with patch.object(like_buffer, 'write', side_effect=OperationalError('database is locked')):
+            with self.assertRaises(OperationalError):
+                like_buffer.flush()
+
+        self.assertEqual(self.get_like_count(), 1)
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertEqual(Like.objects.count(), 1)
+
+    def test_stored_state_is_read_without_the_lock(self):
+        read = like_buffer.stored_state
+        locked = []
+
+        def stored_state(key):
+            locked.append(like_buffer.lock.locked())
+            return read(key)
+
+        with patch.object(like_buffer, 'stored_state', side_effect=stored_state):
+            like_buffer.record(self.post.pk, self.user.pk, True)
+
+        self.assertEqual(locked, [False])
+
+    def test_like_flushed_during_the_read_is_seen(self):
+        read = like_buffer.stored_state
+        reads = []
+
+        def stored_state(key):
+            reads.append(key)
+            state = read(key)
+            if len(reads) == 1:
+                # Otra solicitud da el like y se escribe mientras esta lee el estado guardado
+                like_buffer.record(self.post.pk, self.user.pk, True)
+                like_buffer.flush()
+            return state
+
+        with patch.object(like_buffer, 'stored_state', side_effect=stored_state):
+            self.assertFalse(like_buffer.record(self.post.pk, self.user.pk, True))
+
+        self.assertEqual(like_buffer.flush(), 0)
+        self.assertEqual(self.get_like_count(), 1)
+
+    def test_reads_wait_for_the_lock(self):
+        self.client.post(self.url)
+        results = {}
+        reads = [threading.Thread(target=lambda: results.update(pending=like_buffer.has_pending(self.user.pk))),
+                 threading.Thread(target=lambda: results.update(delta=like_buffer.pending_like_delta(self.post.pk)))]
+
+        # Con el lock tomado (como durante un flush) las lecturas esperan
+        with like_buffer.lock:
+            for read in reads:
+                read.start()
+                read.join(0.05)
+                self.assertTrue(read.is_alive())
+        for read in reads:
+            read.join()
+        self.assertEqual(results, {'pending': True, 'delta': 1})
+
+
+@override_settings(LIKE_WRITE_BEHIND=True, LIKE_WRITE_BEHIND_INTERVAL=None)
+class TestLikeWriteBehindCommits(TransactionTestCase):
+    # Foreign keys are checked when the flush commits, which TestCase never does
+    def setUp(self):
+        like_buffer.clear()
+        self.addCleanup(like_buffer.clear)
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='public', edit_permission='public')
+        self.url = reverse('like-create-delete', kwargs={'post_id': self.post.id})
+
+    def test_likes_of_deleted_posts_are_dropped(self):
+        other_post = PostFactory(read_permission='public')
+        self.client.post(self.url)
+        self.client.post(reverse('like-create-delete', kwargs={'post_id': other_post.id}))
+        Post.objects.filter(pk=other_post.pk).delete()
+
+        self.assertEqual(like_buffer.flush(), 2)
+        self.assertEqual(list(Like.objects.values_list('post_id', flat=True)), [self.post.pk])
+
+    def test_flush_thread_writes_buffered_likes(self):
+        with override_settings(LIKE_WRITE_BEHIND_INTERVAL=0.01):
+            self.addCleanup(like_buffer.stop)
+            self.client.post(self.url)
+
+            deadline = time.monotonic() + 5
+            while not Like.objects.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
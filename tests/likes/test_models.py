@@ -1,6 +1,7 @@
 import pytest
 
 from tests.factories import PostFactory, UserFactory
+from tests.markers import sqlite_only
 from django.db.utils import IntegrityError
 
 pytestmark = pytest.mark.django_db
@@ -19,6 +20,7 @@ class TestLikeModel:
         assert like.user == user
         assert like.__str__() == post.title + ' - ' + user.username
         
+    @sqlite_only
     @pytest.mark.django_db
     def test_create_like_missing_post(self, likes_factory):
         user = UserFactory()
@@ -26,6 +28,7 @@ class TestLikeModel:
             likes_factory(post=None,user=user)
         assert str(e.value) == 'NOT NULL constraint failed: likes_like.post_id'
 
+    @sqlite_only
     @pytest.mark.django_db
     def test_create_like_missing_user(self, likes_factory):
         post = PostFactory()
@@ -1,4 +1,8 @@
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import TransactionTestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
@@ -126,8 +130,9 @@ class TestLikeCreateView(APITestCase):
         
         #Eliminar el like
         response = self.client.delete(url)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertEqual(response.data['error'], "Like does not exist")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], "Like does not exist")
+        self.assertFalse(response.data['changed'])
         
         #Verificar que el like se eliminó
         self.assertFalse(Like.objects.exists(), "The like should not be deleted as it does not exist.")
@@ -180,6 +185,177 @@ class TestLikeCreateView(APITestCase):
         
 
 
+class TestLikeCreateViewIdempotency(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.post = PostFactory(read_permission='public', edit_permission='public')
+        self.url = reverse('like-create-delete', kwargs={'post_id': self.post.id})
+
+    def test_repeated_like_reports_no_change(self):
+        first = self.client.post(self.url)
+        second = self.client.post(self.url)
+
+        self.assertTrue(first.data['changed'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data['message'], "Like already exists")
+        self.assertFalse(second.data['changed'])
+        self.assertEqual(Like.objects.count(), 1)
+
+    def test_repeated_unlike_reports_no_change(self):
+        self.client.post(self.url)
+        first = self.client.delete(self.url)
+        second = self.client.delete(self.url)
+
+        self.assertTrue(first.data['changed'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertFalse(second.data['changed'])
+        self.assertFalse(Like.objects.exists())
+
+    def test_duplicate_like_does_not_break_the_transaction(self):
+        self.client.post(self.url)
+        # SELECT + SAVEPOINT + INSERT ignorado + RELEASE, sin UPDATE del contador
+        with self.assertNumQueries(4):
+            self.client.post(self.url)
+
+    def test_unlike_runs_a_single_delete(self):
+        self.client.post(self.url)
+        # SELECT + SAVEPOINT + DELETE + UPDATE like_count + RELEASE
+        with self.assertNumQueries(5):
+            self.client.delete(self.url)
+
+
+class TestLikeBulkView(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('like-bulk')
+
+    def test_bulk_like_and_unlike(self):
+        posts = PostFactory.create_batch(3, read_permission='public')
+        LikesFactory(user=self.user, post=posts[2])
+
+        response = self.client.post(self.url, {'like': [posts[0].id, posts[1].id], 'unlike': [posts[2].id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [
+            {'post_id': posts[0].id, 'action': 'like', 'status': 'liked'},
+            {'post_id': posts[1].id, 'action': 'like', 'status': 'liked'},
+            {'post_id': posts[2].id, 'action': 'unlike', 'status': 'unliked'},
+        ])
+        self.assertEqual(set(Like.objects.filter(user=self.user).values_list('post_id', flat=True)), {posts[0].id, posts[1].id})
+        posts[0].refresh_from_db()
+        self.assertEqual(posts[0].like_count, 1)
+
+    def test_bulk_replay_is_idempotent(self):
+        post = PostFactory(read_permission='public')
+        other = PostFactory(read_permission='public')
+
+        self.client.post(self.url, {'like': [post.id], 'unlike': [other.id]}, format='json')
+        response = self.client.post(self.url, {'like': [post.id], 'unlike': [other.id]}, format='json')
+
+        self.assertEqual([result['status'] for result in response.data['results']], ['already_liked', 'not_liked'])
+        post.refresh_from_db()
+        self.assertEqual(post.like_count, 1)
+        self.assertEqual(Like.objects.count(), 1)
+
+    def test_bulk_uses_read_permission_rules(self):
+        readable = PostFactory(read_permission='team', author__team=self.user.team)
+        # Un post 'author' de un compañero de equipo no se puede leer
+        forbidden = PostFactory(read_permission='author', author__team=self.user.team)
+
+        response = self.client.post(self.url, {'like': [readable.id, forbidden.id, 999]}, format='json')
+
+        self.assertEqual([result['status'] for result in response.data['results']], ['liked', 'forbidden', 'not_found'])
+        self.assertEqual(Like.objects.count(), 1)
+
+    def test_bulk_query_count_does_not_depend_on_batch_size(self):
+        few = [post.id for post in PostFactory.create_batch(2, read_permission='public')]
+        many = [post.id for post in PostFactory.create_batch(20, read_permission='public')]
+
+        with CaptureQueriesContext(connection) as few_queries:
+            self.client.post(self.url, {'like': few}, format='json')
+        with CaptureQueriesContext(connection) as many_queries:
+            self.client.post(self.url, {'like': many}, format='json')
+
+        self.assertEqual(len(few_queries), len(many_queries))
+
+    @override_settings(LIKE_BULK_MAX_ITEMS=2)
+    def test_bulk_rejects_large_batches(self):
+        response = self.client.post(self.url, {'like': [1, 2, 3]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_rejects_like_and_unlike_of_the_same_post(self):
+        response = self.client.post(self.url, {'like': [1], 'unlike': [1]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_as_unauthenticated_user(self):
+        post = PostFactory(read_permission='public')
+        self.client.force_authenticate(user=None)
+
+        response = self.client.post(self.url, {'like': [post.id]}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(Like.objects.exists())
+
+
+class TestLikeConcurrency(TransactionTestCase):
+    def test_concurrent_likes_keep_the_count_exact(self):
+        post = PostFactory(read_permission='public')
+        users = UserFactory.create_batch(8)
+        url = reverse('like-create-delete', kwargs={'post_id': post.id})
+
+        def hammer(user):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                for _ in range(5):
+                    client.post(url)
+                # La mitad de los usuarios quita el like
+                if user.pk % 2:
+                    for _ in range(3):
+                        client.delete(url)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(users)) as executor:
+            list(executor.map(hammer, users))
+
+        post.refresh_from_db()
+        likes = Like.objects.filter(post=post).count()
+        self.assertEqual(likes, len([user for user in users if not user.pk % 2]))
+        self.assertEqual(post.like_count, likes)
+
+    def test_concurrent_bulk_replays_change_each_like_once(self):
+        user = UserFactory()
+        posts = PostFactory.create_batch(4, read_permission='public')
+        ids = [post.id for post in posts]
+
+        def replay(action):
+            client = APIClient()
+            client.force_authenticate(user)
+            try:
+                response = client.post(reverse('like-bulk'), {action: ids}, format='json')
+                return [result['status'] for result in response.data['results']]
+            finally:
+                connection.close()
+
+        for action, changed, likes in (('like', 'liked', 1), ('unlike', 'unliked', 0)):
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                statuses = list(executor.map(replay, [action] * 6))
+
+            # Cada post cambia en una sola de las solicitudes
+            self.assertEqual([column.count(changed) for column in zip(*statuses)], [1] * len(ids))
+            self.assertEqual(Like.objects.filter(user=user).count(), likes * len(ids))
+            for post in posts:
+                post.refresh_from_db()
+                self.assertEqual(post.like_count, likes)
+
+
 class TestLikeListView(APITestCase):
     def setUp(self):
         self.user = UserFactory()
@@ -271,4 +447,18 @@ class TestLikeListView(APITestCase):
         print(response.data)
 
         self.assertEqual(response.status_code,status.HTTP_200_OK)
-        self.assertEqual(response.data['count'], 5)
\ No newline at end of file
+        self.assertEqual(response.data['count'], 5)
+    
+    def test_get_likes_with_cursor_pagination(self):
+        self.client.force_authenticate(self.user)
+        LikesFactory.create_batch(25, post=self.post)
+
+        url = reverse('like-list') + '?pagination=cursor'
+        response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 20)
+        
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual(len(next_page.data['results']), 5)
+        self.assertIsNone(next_page.data['next'])
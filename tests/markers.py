@@ -0,0 +1,5 @@
+import pytest
+from django.db import connection
+
+# For tests of SQLite behaviour: pragmas, its error messages and the FTS5 search index
+sqlite_only = pytest.mark.skipif(connection.vendor != 'sqlite', reason='SQLite profile only')
@@ -0,0 +1,135 @@
+import pytest
+from asgiref.sync import sync_to_async
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from tests.factories import CommentsFactory, LikesFactory, PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestAsyncPostList(TestCase):
+    def setUp(self):
+        self.user = UserFactory(team='team-a')
+        self.teammate = UserFactory(team='team-a')
+        self.stranger = UserFactory(team='team-b')
+        self.own_post = PostFactory(author=self.user, read_permission='author')
+        self.team_post = PostFactory(author=self.teammate, read_permission='team')
+        self.public_post = PostFactory(author=self.stranger, read_permission='public')
+        self.hidden_post = PostFactory(author=self.stranger, read_permission='team')
+        self.url = reverse('async-post-list')
+
+    async def test_list_matches_sync_view(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'expand': 'author'})
+
+        expected = await sync_to_async(self.get_sync_list)({'expand': 'author'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['results'], expected['results'])
+        self.assertEqual(response.json()['count'], 3)
+
+    def get_sync_list(self, params):
+        self.client.force_login(self.user)
+        return self.client.get(reverse('post-create'), params).json()
+
+    async def test_list_reports_liked_by_me(self):
+        await sync_to_async(LikesFactory)(post=self.team_post, user=self.user)
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url)
+
+        liked = {post['title']: post['liked_by_me'] for post in response.json()['results']}
+        self.assertEqual(liked, {self.own_post.title: False, self.team_post.title: True,
+                                 self.public_post.title: False})
+
+    async def test_list_embeds_latest_comments(self):
+        await sync_to_async(CommentsFactory.create_batch)(3, post=self.public_post)
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'comments': 2})
+
+        expected = await sync_to_async(self.get_sync_list)({'comments': 2})
+        self.assertEqual(response.json()['results'], expected['results'])
+        latest = {post['title']: len(post['latest_comments']) for post in response.json()['results']}
+        self.assertEqual(latest[self.public_post.title], 2)
+
+    async def test_list_with_invalid_comment_count(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'comments': 0})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_list_as_unauthenticated_user(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()['detail'], 'Authentication credentials were not provided.')
+
+    async def test_pagination(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'page': 2, 'page_size': 2})
+
+        data = response.json()
+        self.assertEqual(data['count'], 3)
+        self.assertEqual(len(data['results']), 1)
+        self.assertIsNone(data['next'])
+        self.assertEqual(data['previous'], 'http://testserver/async/post/?page_size=2')
+
+    async def test_invalid_page(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.url, {'page': 5})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()['detail'], 'Invalid page.')
+
+    async def test_only_reads_are_allowed(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.post(self.url, {'title': 'x'})
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+class TestAsyncPostDetail(TestCase):
+    def setUp(self):
+        self.user = UserFactory(team='team-a')
+        self.other = UserFactory(team='team-a')
+        self.team_post = PostFactory(author=self.other, read_permission='team')
+        self.author_post = PostFactory(author=self.other, read_permission='author')
+        self.public_post = PostFactory(author=self.other, read_permission='public')
+        self.authenticated_post = PostFactory(author=self.other, read_permission='authenticated')
+
+    def get_url(self, post):
+        return reverse('async-post', kwargs={'id': post.pk})
+
+    async def test_view_post_with_read_permission(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.get_url(self.team_post))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['title'], self.team_post.title)
+
+    async def test_view_post_without_read_permission(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(self.get_url(self.author_post))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.json()['detail'], 'No tienes permiso para ver este post')
+
+    async def test_anonymous_user_reads_public_post_only(self):
+        public_response = await self.async_client.get(self.get_url(self.public_post))
+        private_response = await self.async_client.get(self.get_url(self.authenticated_post))
+
+        self.assertEqual(public_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(private_response.status_code, status.HTTP_403_FORBIDDEN)
+
+    async def test_view_non_existing_post(self):
+        response = await self.async_client.get(reverse('async-post', kwargs={'id': 9999}))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json()['detail'], 'Not found.')
@@ -0,0 +1,36 @@
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from posts.models import Post
+from tests.factories import CommentsFactory, LikesFactory, PostFactory
+
+pytestmark = pytest.mark.django_db
+
+
+class TestRecountPostCounters:
+    def test_fixes_drifted_counters(self):
+        # Las factories escriben likes y comentarios sin pasar por las vistas
+        post = PostFactory()
+        LikesFactory.create_batch(3, post=post)
+        CommentsFactory.create_batch(2, post=post)
+        untouched = PostFactory()
+        out = StringIO()
+        
+        call_command('recount_post_counters', batch_size=1, stdout=out)
+        
+        post.refresh_from_db()
+        untouched.refresh_from_db()
+        assert post.like_count == 3
+        assert post.comment_count == 2
+        assert untouched.like_count == 0
+        assert 'Checked 2 posts, fixed 1' in out.getvalue()
+    
+    def test_lowers_counters_above_the_real_value(self):
+        post = PostFactory()
+        Post.objects.filter(pk=post.pk).update(like_count=5, comment_count=5)
+        
+        call_command('recount_post_counters', stdout=StringIO())
+        
+        post.refresh_from_db()
+        assert post.like_count == 0
+        assert post.comment_count == 0
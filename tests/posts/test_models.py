@@ -1,5 +1,6 @@
 import pytest
 from django.core.exceptions import ValidationError
+from posts.models import Post
 
 
 pytestmark = pytest.mark.django_db
@@ -113,4 +114,40 @@ class TestPostModel:
                                 author=user,
                                 read_permission='invalid_permission',
                                 edit_permission='invalid_permission')
-        assert str(e.value) == "['Invalid permission specified.']"
\ No newline at end of file
+        assert str(e.value) == "['Invalid permission specified.']"
+    
+    @pytest.mark.django_db
+    def test_post_model_copies_author_team(self, post_factory, user_factory):
+        user = user_factory(username='test-user', team='team-a')
+        post = post_factory(title='test-post', content='test-content', author=user)
+        post.refresh_from_db()
+        assert post.team == 'team-a'
+    
+    @pytest.mark.django_db
+    def test_post_model_team_follows_author_team_change(self, post_factory, user_factory):
+        user = user_factory(username='test-user', team='team-a')
+        post = post_factory(title='test-post', content='test-content', author=user)
+        user.team = 'team-b'
+        user.save()
+        post.refresh_from_db()
+        assert post.team == 'team-b'
+
+    @pytest.mark.django_db
+    def test_post_model_save_keeps_counter_increments(self, post_factory):
+        post = post_factory(title='test-post', content='test-content')
+        Post.objects.filter(pk=post.pk).add_to_counter('like_count', 2)
+        post.title = 'edited'
+        post.save()
+        post.refresh_from_db()
+        assert post.title == 'edited'
+        assert post.like_count == 2
+
+    @pytest.mark.django_db
+    def test_post_model_save_reinserts_a_deleted_row(self, post_factory):
+        post = post_factory(title='test-post', content='test-content')
+        Post.objects.filter(pk=post.pk).add_to_counter('like_count', 2)
+        post.refresh_from_db()
+        Post.objects.filter(pk=post.pk).delete()
+        post.save()
+        post.refresh_from_db()
+        assert post.like_count == 2
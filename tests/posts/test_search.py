@@ -0,0 +1,116 @@
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from posts.models import Post
+from posts.search import get_search_backend, search_terms
+from tests.factories import PostFactory, UserFactory
+from tests.markers import sqlite_only
+pytestmark = pytest.mark.django_db
+
+
+class TestSearchTerms:
+    def test_drops_operators_and_punctuation(self):
+        assert search_terms('Django AND "rest"* -api') == ['django', 'and', 'rest', 'api']
+
+    def test_empty_query(self):
+        assert search_terms(' !? ') == []
+
+
+class TestPostSearchView(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(team='red')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('post-search')
+
+    def search(self, query, **params):
+        return self.client.get(self.url, {'q': query, **params})
+
+    def titles(self, response):
+        return [post['title'] for post in response.data['results']]
+
+    # Ranking y acentos son del indice FTS5; las otras bases usan ContainsSearchBackend
+    @sqlite_only
+    def test_matches_title_and_content(self):
+        PostFactory(title='Caching in Django', content='Nothing here', read_permission='public')
+        PostFactory(title='Weekly notes', content='We tried django caching', read_permission='public')
+        PostFactory(title='Unrelated', content='Nothing here', read_permission='public')
+
+        response = self.search('django caching')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        # Una coincidencia en el titulo pesa mas que una en el contenido
+        self.assertEqual(self.titles(response)[0], 'Caching in Django')
+
+    def test_applies_list_visibility(self):
+        PostFactory(title='Team secret', read_permission='team', author__team='red')
+        PostFactory(title='Other secret', read_permission='team', author__team='blue')
+
+        self.assertEqual(self.titles(self.search('secret')), ['Team secret'])
+
+    def test_follows_edits_and_deletes(self):
+        post = PostFactory(title='Draft', read_permission='public')
+        post.title = 'Published'
+        post.save()
+
+        self.assertEqual(self.search('draft').data['count'], 0)
+        self.assertEqual(self.search('published').data['count'], 1)
+        post.delete()
+        self.assertEqual(self.search('published').data['count'], 0)
+
+    @sqlite_only
+    def test_ignores_accents(self):
+        PostFactory(title='Publicación', read_permission='public')
+
+        self.assertEqual(self.search('publicacion').data['count'], 1)
+
+    def test_paginates(self):
+        PostFactory.create_batch(3, title='Paged post', read_permission='public')
+
+        response = self.search('paged', page_size=2)
+        self.assertEqual(response.data['count'], 3)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_requires_query(self):
+        response = self.search('   ')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('q', response.data)
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(user=None)
+        self.assertEqual(self.search('post').status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(POST_SEARCH_RANK_MAX_MATCHES=1)
+    def test_broad_queries_are_newest_first(self):
+        PostFactory(title='Caching in Django', read_permission='public')
+        PostFactory(title='Weekly notes', content='Django caching', read_permission='public')
+
+        self.assertEqual(self.titles(self.search('django')), ['Weekly notes', 'Caching in Django'])
+
+    @override_settings(POST_SEARCH_BACKEND='posts.search.ContainsSearchBackend')
+    def test_fallback_backend(self):
+        PostFactory(title='Caching in Django', read_permission='public')
+        PostFactory(title='Unrelated', read_permission='public')
+
+        self.assertEqual(self.titles(self.search('django')), ['Caching in Django'])
+
+
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5 index is SQLite only')
+class TestRebuildSearchIndex(APITestCase):
+    def test_indexes_bulk_created_posts(self):
+        author = UserFactory()
+        Post.objects.bulk_create([Post(title='Imported', content='Bulk', author=author, team=author.team)])
+        backend = get_search_backend()
+        self.assertEqual(backend.search(Post.objects.all(), ['imported']).count(), 0)
+
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+
+        self.assertIn('Indexed 1 posts', out.getvalue())
+        self.assertEqual(backend.search(Post.objects.all(), ['imported']).count(), 1)
@@ -1,4 +1,5 @@
 import pytest
+from posts.models import Post
 from posts.serializers import PostSerializer
 from tests.factories import PostFactory, UserFactory
 from django.test import TestCase
@@ -40,4 +41,14 @@ class TestPostSerializer(TestCase):
                                     })
         assert not serializer.is_valid()
         assert 'content' in serializer.errors
-        
\ No newline at end of file
+        
+    def test_update_post_keeps_counters_changed_since_the_load(self):
+        Post.objects.filter(pk=self.post.pk).add_to_counter('comment_count', 1)
+        serializer = PostSerializer(instance=self.post,
+                                    data={'title': 'Updated Title', 'content': 'Updated Content',
+                                          'read_permission': 'public', 'edit_permission': 'public'})
+        assert serializer.is_valid()
+        serializer.save()
+        self.post.refresh_from_db()
+        assert self.post.title == 'Updated Title'
+        assert self.post.comment_count == 1
@@ -0,0 +1,149 @@
+from io import StringIO
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from posts import timeline
+from posts.models import Post, TeamTimelineEntry
+from tests.factories import PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+def timeline_ids(team):
+    return list(TeamTimelineEntry.objects.filter(team=team).order_by('-created_at', '-post_id')
+                .values_list('post_id', flat=True))
+
+
+@override_settings(POST_TEAM_TIMELINE=True, POST_TEAM_TIMELINE_DEPTH=3)
+class TestFanOut(APITestCase):
+    def setUp(self):
+        self.author = UserFactory(team='red')
+
+    def test_team_posts_are_written_to_their_team(self):
+        team_post = PostFactory(author=self.author, read_permission='team')
+        # Los posts 'author' solo los ve su autor: no van al timeline del equipo
+        PostFactory(author=self.author, read_permission='author')
+        PostFactory(author=self.author, read_permission='public')
+
+        self.assertEqual(timeline_ids('red'), [team_post.pk])
+
+    def test_restricting_a_post_to_its_author_removes_it(self):
+        posts = PostFactory.create_batch(2, author=self.author, read_permission='team')
+        posts[1].read_permission = 'author'
+        posts[1].save()
+
+        self.assertEqual(timeline_ids('red'), [posts[0].pk])
+
+    def test_timeline_is_trimmed_to_the_depth(self):
+        posts = PostFactory.create_batch(5, author=self.author, read_permission='team')
+
+        self.assertEqual(timeline_ids('red'), [post.pk for post in reversed(posts[2:])])
+
+    def test_sharing_a_post_removes_it_and_refills(self):
+        posts = PostFactory.create_batch(4, author=self.author, read_permission='team')
+        posts[3].read_permission = 'public'
+        posts[3].save()
+
+        self.assertEqual(timeline_ids('red'), [posts[2].pk, posts[1].pk, posts[0].pk])
+
+    def test_deleting_a_post_refills(self):
+        posts = PostFactory.create_batch(4, author=self.author, read_permission='team')
+        posts[3].delete()
+
+        self.assertEqual(timeline_ids('red'), [posts[2].pk, posts[1].pk, posts[0].pk])
+
+    def test_author_team_change_moves_the_entries(self):
+        PostFactory.create_batch(2, author=self.author, read_permission='team')
+        stays = PostFactory(read_permission='team', author__team='red')
+        self.author.team = 'blue'
+        self.author.save()
+
+        self.assertEqual(timeline_ids('red'), [stays.pk])
+        self.assertEqual(len(timeline_ids('blue')), 2)
+
+    def test_author_trimmed_from_the_old_team_fills_the_new_one(self):
+        moved = PostFactory.create_batch(2, author=self.author, read_permission='team')
+        # Tres posts mas nuevos del equipo red sacan los del autor del timeline (profundidad 3)
+        PostFactory.create_batch(3, read_permission='team', author__team='red')
+        self.assertFalse(TeamTimelineEntry.objects.filter(post__author=self.author).exists())
+
+        self.author.team = 'blue'
+        self.author.save()
+
+        self.assertEqual(timeline_ids('blue'), [moved[1].pk, moved[0].pk])
+
+    @override_settings(POST_TEAM_TIMELINE=False)
+    def test_nothing_is_written_when_disabled(self):
+        PostFactory(author=self.author, read_permission='team')
+
+        self.assertFalse(TeamTimelineEntry.objects.exists())
+
+
+@override_settings(POST_TEAM_TIMELINE=True, POST_TEAM_TIMELINE_DEPTH=5)
+class TestTimelineFeed(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(team='red')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        permissions = ['public', 'team', 'authenticated', 'author']
+        for index in range(12):
+            team = ['red', 'blue'][index % 2]
+            PostFactory(read_permission=permissions[index % 4], author__team=team)
+        PostFactory(read_permission='author', author=self.user)
+        # Un post 'author' de un compañero de equipo no aparece en la lista del usuario
+        PostFactory(read_permission='author', author__team='red')
+
+    def titles(self, params):
+        response = self.client.get(reverse('post-create'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data['count'], [post['title'] for post in response.data['results']]
+
+    def test_pages_match_the_live_query(self):
+        for params in ({'page_size': 4}, {'page_size': 4, 'page': 2}, {'page_size': 3, 'page': 3}):
+            with override_settings(POST_TEAM_TIMELINE=False):
+                expected = self.titles(params)
+            self.assertEqual(self.titles(params), expected)
+
+    def test_pages_past_the_depth_use_the_live_query(self):
+        with override_settings(POST_TEAM_TIMELINE=False):
+            expected = self.titles({'page_size': 3, 'page': 3})
+
+        with override_settings(POST_TEAM_TIMELINE_DEPTH=2):
+            self.assertEqual(self.titles({'page_size': 3, 'page': 3}), expected)
+
+    def test_page_runs_one_query_per_stream(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('post-create'), {'page_size': 4})
+        # COUNT + public, authenticated, equipo y propios + pagina
+        self.assertEqual(len(queries), 6)
+
+    def test_admins_use_the_live_query(self):
+        self.client.force_authenticate(user=UserFactory(is_admin=True))
+
+        count, titles = self.titles({'page_size': 20})
+        self.assertEqual(count, Post.objects.count())
+
+
+class TestRebuild:
+    def test_keeps_the_newest_posts_of_every_team(self, settings):
+        settings.POST_TEAM_TIMELINE_DEPTH = 2
+        red = PostFactory.create_batch(3, read_permission='team', author__team='red')
+        blue = PostFactory(read_permission='team', author__team='blue')
+        PostFactory(read_permission='author', author__team='blue')
+        PostFactory(read_permission='public', author__team='red')
+
+        assert timeline.rebuild() == 3
+        assert timeline_ids('red') == [red[2].pk, red[1].pk]
+        assert timeline_ids('blue') == [blue.pk]
+
+    def test_command(self):
+        PostFactory(read_permission='team')
+        out = StringIO()
+
+        call_command('rebuild_team_timelines', stdout=out)
+
+        assert 'Wrote 1 timeline entries' in out.getvalue()
@@ -1,10 +1,16 @@
 import pytest
+from unittest import mock
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 from posts.models import Post
-from tests.factories import LikesFactory, PostFactory, UserFactory
+from tests.factories import CommentsFactory, LikesFactory, PostFactory, UserFactory
 from likes.models import Like
+from comments.models import Comment
+from posts.counters import recount_posts
 pytestmark = pytest.mark.django_db
 
 
@@ -119,6 +125,51 @@ class TestPostCreateView(APITestCase):
         self.assertEqual(response.data['count'], 15)
         self.assertEqual(response.data['next'], None)
         self.assertEqual(response.data['previous'], 'http://testserver/post/')
+    
+    def test_cursor_pagination(self):
+        PostFactory.create_batch(15, read_permission='public')
+        self.client.force_authenticate(user=self.user)
+        url = reverse('post-create') + '?pagination=cursor'
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(response.data['previous'], None)
+        
+        # Siguiente pagina
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual(next_page.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(next_page.data['results']), 5)
+        self.assertEqual(next_page.data['next'], None)
+        titles = [post['title'] for post in response.data['results'] + next_page.data['results']]
+        self.assertEqual(titles, list(Post.objects.values_list('title', flat=True)))
+        
+        # Volver a la pagina anterior
+        previous_page = self.client.get(next_page.data['previous'])
+        self.assertEqual(previous_page.data['results'], response.data['results'])
+        self.assertEqual(previous_page.data['previous'], None)
+    
+    def test_cursor_pagination_is_stable_under_inserts(self):
+        PostFactory.create_batch(15, read_permission='public')
+        self.client.force_authenticate(user=self.user)
+        url = reverse('post-create') + '?pagination=cursor'
+        
+        response = self.client.get(url)
+        PostFactory.create_batch(3, read_permission='public')
+        next_page = self.client.get(response.data['next'])
+        
+        first_titles = {post['title'] for post in response.data['results']}
+        next_titles = {post['title'] for post in next_page.data['results']}
+        self.assertEqual(len(next_page.data['results']), 5)
+        self.assertFalse(first_titles & next_titles)
+    
+    def test_cursor_pagination_with_invalid_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('post-create') + '?cursor=invalid'
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
         
     def test_list_posts_as_authenticated_user(self):
         self.client.force_authenticate(user=self.user)
@@ -133,6 +184,30 @@ class TestPostCreateView(APITestCase):
         # Verificar el comportamiento correcto
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['count'], 3)
+    
+    def test_list_posts_includes_team_posts(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('post-create')
+        
+        PostFactory(read_permission='team', author__team=self.user.team)
+        PostFactory(read_permission='team', author__team='another-team')
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+    
+    def test_list_posts_follows_author_team_change(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('post-create')
+        post = PostFactory(read_permission='team', author__team='another-team')
+        
+        # El autor se cambia al equipo del usuario
+        post.author.team = self.user.team
+        post.author.save()
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
         
     
 #Endpoint (`/blog/<post_id>`) for editing posts
@@ -376,4 +451,395 @@ class TestPostDeleteView(APITestCase):
         
         # Verificar el comportamiento correcto
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertFalse(Post.objects.filter(id=self.post.id).exists(), "Post should be deleted")
\ No newline at end of file
+        self.assertFalse(Post.objects.filter(id=self.post.id).exists(), "Post should be deleted")
+
+
+# The author is loaded in the same query as the post, so the number of queries
+# does not grow with the page size or with team-scoped permission checks.
+class TestPostQueryCount(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='team', edit_permission='team', author__team=self.user.team)
+    
+    def count_list_queries(self, page_size):
+        url = reverse('post-create') + f'?expand=author&page_size={page_size}'
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), page_size)
+        return len(queries)
+    
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        PostFactory.create_batch(19, read_permission='team', author__team=self.user.team)
+        
+        # COUNT + pagina; el ETag sale de la pagina
+        self.assertEqual(self.count_list_queries(5), 2)
+        self.assertEqual(self.count_list_queries(20), 2)
+    
+    def test_list_expands_author(self):
+        url = reverse('post-create') + '?expand=author'
+        response = self.client.get(url)
+        
+        self.assertEqual(response.data['results'][0]['author'], {
+            'id': self.post.author.id,
+            'username': self.post.author.username,
+            'team': self.user.team,
+        })
+    
+    def test_detail_of_team_post(self):
+        url = reverse('post', kwargs={'id': self.post.id}) + '?expand=author'
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['author']['id'], self.post.author.id)
+    
+    def test_edit_team_post(self):
+        url = reverse('post-edit', kwargs={'id': self.post.id})
+        data = {'title': 'Updated Title', 'content': 'Updated Content'}
+        # SELECT + UPDATE + contadores + indice de busqueda (FTS5, solo SQLite)
+        with self.assertNumQueries(4 if connection.vendor == 'sqlite' else 3):
+            response = self.client.put(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_like_team_post(self):
+        url = reverse('like-create-delete', kwargs={'post_id': self.post.id})
+        # SELECT + SAVEPOINT + INSERT + UPDATE like_count + RELEASE
+        with self.assertNumQueries(5):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_comment_team_post(self):
+        url = reverse('comment-create-delete', kwargs={'post_id': self.post.id})
+        # SELECT + SAVEPOINT + INSERT + UPDATE comment_count + RELEASE
+        with self.assertNumQueries(5):
+            response = self.client.post(url, {'content': 'This is a test comment'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TestPostCounters(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='public', edit_permission='public')
+    
+    def test_like_and_unlike_update_like_count(self):
+        url = reverse('like-create-delete', kwargs={'post_id': self.post.id})
+        
+        self.client.post(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        
+        # Un like repetido no cambia el contador
+        self.client.post(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 1)
+        
+        self.client.delete(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+    
+    def test_comment_create_and_delete_update_comment_count(self):
+        url = reverse('comment-create-delete', kwargs={'post_id': self.post.id})
+        
+        self.client.post(url, {'content': 'First comment'})
+        self.client.post(url, {'content': 'Second comment'})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+        
+        self.client.delete(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+    
+    def test_counters_are_serialized(self):
+        self.client.post(reverse('like-create-delete', kwargs={'post_id': self.post.id}))
+        self.client.post(reverse('comment-create-delete', kwargs={'post_id': self.post.id}), {'content': 'A comment'})
+        
+        response = self.client.get(reverse('post', kwargs={'id': self.post.id}))
+        self.assertEqual(response.data['like_count'], 1)
+        self.assertEqual(response.data['comment_count'], 1)
+    
+    def test_edit_response_shows_the_stored_counters(self):
+        url = reverse('post-edit', kwargs={'id': self.post.id})
+        save = Post.save
+        
+        def save_after_a_like(post, *args, **kwargs):
+            # Un like de otra solicitud llega entre la lectura del post y el guardado
+            Post.objects.filter(pk=post.pk).add_to_counter('like_count', 1)
+            save(post, *args, **kwargs)
+        
+        with mock.patch.object(Post, 'save', save_after_a_like):
+            response = self.client.put(url, {'title': 'Updated Title', 'content': 'Updated Content'})
+        self.assertEqual(response.data['like_count'], 1)
+    
+    def test_counters_are_read_only(self):
+        url = reverse('post-edit', kwargs={'id': self.post.id})
+        data = {'title': 'Updated Title', 'content': 'Updated Content', 'like_count': 100}
+        
+        self.client.put(url, data)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.like_count, 0)
+
+
+class TestPostConditionalGet(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='team', author__team=self.user.team)
+        self.detail_url = reverse('post', kwargs={'id': self.post.id})
+        self.list_url = reverse('post-create')
+    
+    def test_detail_not_modified(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        
+        # Solo el SELECT del post, sin serializar
+        with self.assertNumQueries(1):
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+    
+    def test_detail_sends_last_modified(self):
+        response = self.client.get(self.detail_url)
+        
+        self.assertIn('Last-Modified', response)
+    
+    def test_like_changes_detail_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.post(reverse('like-create-delete', kwargs={'post_id': self.post.id}))
+        
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['like_count'], 1)
+    
+    def test_recount_changes_detail_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        # Like guardado sin pasar por la vista: el contador queda desfasado
+        LikesFactory(post=self.post)
+        recount_posts(Post.objects.all(), Like, Comment)
+        
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['like_count'], 1)
+    
+    def test_forbidden_detail_is_not_answered_with_304(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.force_authenticate(user=UserFactory())
+        
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+    
+    def test_list_not_modified(self):
+        etag = self.client.get(self.list_url)['ETag']
+        
+        # COUNT + pagina, sin serializar
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_cursor_list_not_modified_runs_only_the_page(self):
+        url = self.list_url + '?pagination=cursor'
+        etag = self.client.get(url)['ETag']
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+    
+    def test_list_etag_changes_when_a_post_of_the_page_is_edited(self):
+        etag = self.client.get(self.list_url)['ETag']
+        self.post.title = 'Edited'
+        self.post.save()
+        
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_etag_follows_the_count_outside_the_page(self):
+        PostFactory(read_permission='public')
+        url = self.list_url + '?page_size=1'
+        etag = self.client.get(url)['ETag']
+        # self.post es el mas antiguo: la primera pagina no cambia, el total si
+        self.post.delete()
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+    
+    def test_list_etag_changes_on_new_and_deleted_posts(self):
+        etag = self.client.get(self.list_url)['ETag']
+        PostFactory(read_permission='public')
+        new_etag = self.client.get(self.list_url)['ETag']
+        self.post.delete()
+        
+        self.assertNotEqual(new_etag, etag)
+        self.assertNotEqual(self.client.get(self.list_url)['ETag'], new_etag)
+    
+    def test_list_etag_depends_on_page(self):
+        PostFactory.create_batch(2, read_permission='public')
+        
+        first = self.client.get(self.list_url + '?page_size=1')['ETag']
+        second = self.client.get(self.list_url + '?page_size=1&page=2')['ETag']
+        self.assertNotEqual(first, second)
+
+
+@override_settings(POST_RESPONSE_CACHE=True)
+class TestPostResponseCache(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='team', author__team=self.user.team)
+        self.list_url = reverse('post-create')
+    
+    def test_cached_list_runs_only_the_version_queries(self):
+        self.client.get(self.list_url)
+        
+        # COUNT + pagina
+        with self.assertNumQueries(2):
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results']), 1)
+    
+    def test_cache_is_not_shared_between_teams(self):
+        self.client.get(self.list_url)
+        self.client.force_authenticate(user=UserFactory(team='other'))
+        
+        response = self.client.get(self.list_url)
+        self.assertEqual(response.data['results'], [])
+    
+    def test_cache_is_not_shared_between_teammates(self):
+        # liked_by_me depende del usuario, no solo del equipo
+        LikesFactory(post=self.post, user=self.user)
+        self.client.get(self.list_url)
+        self.client.force_authenticate(user=UserFactory(team=self.user.team))
+        
+        response = self.client.get(self.list_url)
+        self.assertFalse(response.data['results'][0]['liked_by_me'])
+    
+    def test_cached_detail_still_checks_permissions(self):
+        url = reverse('post', kwargs={'id': self.post.id})
+        self.client.get(url)
+        self.client.force_authenticate(user=None)
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class TestPostLatestComments(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.post = PostFactory(read_permission='public')
+        self.quiet = PostFactory(read_permission='public')
+        self.comments = CommentsFactory.create_batch(4, post=self.post)
+    
+    def latest_by_title(self, response):
+        return {post['title']: [comment['content'] for comment in post['latest_comments']]
+                for post in response.data['results']}
+    
+    def test_list_embeds_the_newest_comments(self):
+        response = self.client.get(reverse('post-create') + '?comments=2')
+        
+        self.assertEqual(self.latest_by_title(response), {
+            self.post.title: [self.comments[3].content, self.comments[2].content],
+            self.quiet.title: [],
+        })
+    
+    def test_without_the_parameter_no_comments_are_embedded(self):
+        response = self.client.get(reverse('post-create'))
+        
+        self.assertNotIn('latest_comments', response.data['results'][0])
+    
+    def test_query_count_does_not_depend_on_page_size(self):
+        for post in PostFactory.create_batch(8, read_permission='public'):
+            CommentsFactory.create_batch(2, post=post)
+        
+        for page_size in (2, 10):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('post-create') + f'?page_size={page_size}&comments=3')
+            # COUNT + pagina + comentarios de la pagina
+            self.assertEqual(len(queries), 3)
+    
+    def test_invalid_count(self):
+        for value in ('0', 'x', '11'):
+            response = self.client.get(reverse('post-create') + f'?comments={value}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn('comments', response.data)
+    
+    def test_new_comment_changes_the_list_etag(self):
+        url = reverse('post-create') + '?comments=2'
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('comment-create-delete', kwargs={'post_id': self.quiet.id}),
+                         {'content': 'Newest'})
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.latest_by_title(response)[self.quiet.title], ['Newest'])
+
+
+class TestPostLikedByMe(APITestCase):
+    def setUp(self):
+        self.user = UserFactory()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.liked = PostFactory(read_permission='public', edit_permission='public')
+        self.other = PostFactory(read_permission='public')
+        LikesFactory(post=self.liked, user=self.user)
+        # Likes de otros usuarios no cuentan
+        LikesFactory(post=self.other)
+    
+    def liked_by_title(self, response):
+        return {post['title']: post['liked_by_me'] for post in response.data['results']}
+    
+    def test_list_marks_the_posts_the_user_likes(self):
+        response = self.client.get(reverse('post-create'))
+        
+        self.assertEqual(self.liked_by_title(response), {self.liked.title: True, self.other.title: False})
+    
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        PostFactory.create_batch(8, read_permission='public')
+        
+        for page_size in (2, 10):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('post-create') + f'?page_size={page_size}')
+            # COUNT + pagina con liked_by_me
+            self.assertEqual(len(queries), 2)
+    
+    def test_detail(self):
+        response = self.client.get(reverse('post', kwargs={'id': self.liked.id}))
+        
+        self.assertTrue(response.data['liked_by_me'])
+    
+    def test_anonymous_users_like_nothing(self):
+        self.client.force_authenticate(user=None)
+        
+        response = self.client.get(reverse('post', kwargs={'id': self.liked.id}))
+        self.assertFalse(response.data['liked_by_me'])
+    
+    def test_like_changes_the_etag_of_the_user(self):
+        url = reverse('post', kwargs={'id': self.other.id})
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('like-create-delete', kwargs={'post_id': self.other.id}))
+        
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['liked_by_me'])
+    
+    def test_create_and_edit_responses(self):
+        created = self.client.post(reverse('post-create'), {'title': 'New', 'content': 'New post'})
+        edited = self.client.put(reverse('post-edit', kwargs={'id': self.liked.id}),
+                                 {'title': 'Edited', 'content': 'Edited post'})
+        
+        self.assertFalse(created.data['liked_by_me'])
+        self.assertTrue(edited.data['liked_by_me'])
+    
+    @override_settings(LIKE_WRITE_BEHIND=True, LIKE_WRITE_BEHIND_INTERVAL=None)
+    def test_buffered_likes_are_reported(self):
+        from likes.buffer import like_buffer
+        self.addCleanup(like_buffer.clear)
+        self.client.post(reverse('like-create-delete', kwargs={'post_id': self.other.id}))
+        self.client.delete(reverse('like-create-delete', kwargs={'post_id': self.liked.id}))
+        
+        response = self.client.get(reverse('post-create'))
+        
+        self.assertEqual(self.liked_by_title(response), {self.liked.title: False, self.other.title: True})
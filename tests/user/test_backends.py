@@ -0,0 +1,120 @@
+import pytest
+from unittest import mock
+from django.contrib.auth import authenticate
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from user.backends import CACHED_FIELDS, CachedModelBackend, get_user_cache
+from user.models import CustomUser
+from tests.factories import PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+def user_queries(queries):
+    return [query for query in queries if query['sql'].startswith('SELECT') and 'FROM "user_customuser"' in query['sql']]
+
+
+class TestCachedModelBackend(APITestCase):
+    def setUp(self):
+        get_user_cache().clear()
+        self.user = UserFactory(team='red')
+        self.client = APIClient()
+        self.client.force_login(self.user)
+        self.url = reverse('post-create')
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, user_queries(queries)
+
+    def titles(self, response):
+        return [post['title'] for post in response.data['results']]
+
+    def test_user_query_disappears_on_warm_requests(self):
+        _, cold = self.get()
+        _, warm = self.get()
+
+        self.assertEqual(len(cold), 1)
+        self.assertEqual(warm, [])
+
+    def test_team_change_is_visible_immediately(self):
+        blue = PostFactory(read_permission='team', author__team='blue')
+        self.get()
+        self.user.team = 'blue'
+        self.user.save()
+
+        response, queries = self.get()
+        self.assertEqual(self.titles(response), [blue.title])
+        self.assertEqual(len(queries), 1)
+
+    def test_password_change_ends_the_other_sessions(self):
+        self.get()
+        self.user.set_password('new-password')
+        self.user.save()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_last_login_update_keeps_the_entry(self):
+        self.get()
+        self.client.force_login(self.user)
+
+        _, queries = self.get()
+        self.assertEqual(queries, [])
+
+    def test_row_cached_before_the_commit_is_dropped(self):
+        stale = CustomUser.objects.filter(pk=self.user.pk).values_list(*CACHED_FIELDS).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.team = 'blue'
+            self.user.save()
+            # Another request reads the old row before the save commits
+            get_user_cache().set(self.user.pk, stale)
+
+        self.assertIsNone(get_user_cache().get(self.user.pk))
+        self.assertEqual(CachedModelBackend().get_user(self.user.pk).team, 'blue')
+
+    def test_session_of_the_previous_backend_still_authenticates(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_failed_login_checks_the_password_once(self):
+        with mock.patch.object(CustomUser, 'check_password', autospec=True, return_value=False) as check:
+            self.assertIsNone(authenticate(username=self.user.username, password='wrong'))
+
+        self.assertEqual(check.call_count, 1)
+
+    def test_cached_user_reads_is_staff_without_a_query(self):
+        user = CachedModelBackend().get_user(self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(user.is_staff)
+
+    def test_deleted_user_is_logged_out(self):
+        self.get()
+        self.user.delete()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_each_request_gets_its_own_instance(self):
+        backend = CachedModelBackend()
+        first, second = backend.get_user(self.user.pk), backend.get_user(self.user.pk)
+
+        self.assertIsNot(first, second)
+        self.assertEqual((second.username, second.team, second.password),
+                         (self.user.username, 'red', self.user.password))
+
+    def test_changes_made_elsewhere_are_seen_after_the_ttl(self):
+        self.get()
+        CustomUser.objects.filter(pk=self.user.pk).update(team='blue')
+        self.assertEqual(CachedModelBackend().get_user(self.user.pk).team, 'red')
+
+        self.addCleanup(setattr, get_user_cache(), 'ttl', get_user_cache().ttl)
+        get_user_cache().ttl = 0
+        get_user_cache().clear()
+        self.assertEqual(CachedModelBackend().get_user(self.user.pk).team, 'blue')
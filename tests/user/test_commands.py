@@ -0,0 +1,81 @@
+import json
+import pytest
+from io import StringIO
+from django.core.management import CommandError, call_command
+from user.models import CustomUser
+from tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def import_users(path, **options):
+    out, err = StringIO(), StringIO()
+    call_command('import_users', str(path), stdout=out, stderr=err, **options)
+    return out.getvalue(), err.getvalue()
+
+
+class TestImportUsers:
+    def test_imports_csv(self, tmp_path):
+        path = tmp_path / 'users.csv'
+        path.write_text('username,password,team,is_admin\n'
+                        'ana@example.com,Sup3r-Secret!,red,\n'
+                        'ben@example.com,Sup3r-Secret!,blue,true\n')
+
+        out, err = import_users(path, batch_size=1)
+
+        assert 'Created 2 users, skipped 0' in out
+        ana = CustomUser.objects.get(username='ana@example.com')
+        assert ana.team == 'red'
+        assert ana.check_password('Sup3r-Secret!')
+        assert CustomUser.objects.get(username='ben@example.com').is_admin
+
+    def test_imports_jsonl_and_reports_bad_rows(self, tmp_path):
+        path = tmp_path / 'users.jsonl'
+        path.write_text('\n'.join([
+            json.dumps({'username': 'ana@example.com', 'password': 'Sup3r-Secret!', 'team': 'red'}),
+            '{not json',
+            json.dumps({'username': 'not-an-email', 'password': 'Sup3r-Secret!', 'team': 'red'}),
+            json.dumps({'username': 'ben@example.com', 'password': '123', 'team': 'red'}),
+            json.dumps({'username': 'ana@example.com', 'password': 'Sup3r-Secret!', 'team': 'red'}),
+        ]) + '\n')
+
+        out, err = import_users(path)
+
+        assert 'Created 1 users, skipped 4' in out
+        assert 'Row 2' in err and 'Row 3' in err and 'Row 4' in err and 'Row 5' in err
+        assert list(CustomUser.objects.values_list('username', flat=True)) == ['ana@example.com']
+
+    def test_skips_existing_usernames(self, tmp_path):
+        UserFactory(username='ana@example.com')
+        path = tmp_path / 'users.csv'
+        path.write_text('username,password,team\nana@example.com,Sup3r-Secret!,red\n')
+
+        out, err = import_users(path)
+
+        assert 'Created 0 users, skipped 1' in out
+
+    def test_skip_password_validation(self, tmp_path):
+        path = tmp_path / 'users.csv'
+        path.write_text('username,password,team\nana@example.com,password,red\n')
+
+        out, err = import_users(path, skip_password_validation=True)
+
+        assert 'Created 1 users' in out
+
+    def test_hashes_in_worker_processes(self, tmp_path):
+        path = tmp_path / 'users.csv'
+        path.write_text('username,password,team\n' +
+                        ''.join(f'user{n}@example.com,Sup3r-Secret!{n},red\n' for n in range(4)))
+
+        import_users(path, hasher='pbkdf2_sha256', workers=2)
+
+        user = CustomUser.objects.get(username='user3@example.com')
+        assert user.password.startswith('pbkdf2_sha256$')
+        assert user.check_password('Sup3r-Secret!3')
+
+    def test_unknown_hasher(self, tmp_path):
+        path = tmp_path / 'users.csv'
+        path.write_text('username,password,team\n')
+
+        with pytest.raises(CommandError):
+            import_users(path, hasher='rot13')
@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
 from django.db.utils import IntegrityError
+from tests.markers import sqlite_only
 
 pytestmark = pytest.mark.django_db
 
@@ -22,6 +23,7 @@ class TestUserModel:
         assert user.is_admin == is_admin
         assert user.is_superuser == is_superuser
         
+    @sqlite_only
     @pytest.mark.django_db
     def test_validate_unique_username(self, user_factory):
         username = "test2@example.com"
@@ -0,0 +1,81 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+from tests.factories import PostFactory, UserFactory
+pytestmark = pytest.mark.django_db
+
+
+class TestTokenView(APITestCase):
+    def setUp(self):
+        self.user = UserFactory(team='red')
+        self.client = APIClient()
+        self.url = reverse('token')
+
+    def issue(self, password='password'):
+        return self.client.post(self.url, {'username': self.user.username, 'password': password})
+
+    def use(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def test_issues_a_token_for_valid_credentials(self):
+        response = self.issue()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['token_type'], 'Bearer')
+        self.assertEqual(response.data['expires_in'], 3600)
+
+    def test_rejects_invalid_credentials(self):
+        response = self.issue(password='wrong')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_requires_username_and_password(self):
+        response = self.client.post(self.url, {'username': self.user.username})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data)
+
+    def test_token_authenticates_api_requests(self):
+        self.use(self.issue().data['token'])
+        post = PostFactory(read_permission='author', author=self.user)
+
+        response = self.client.get(reverse('post', kwargs={'id': post.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        created = self.client.post(reverse('post-create'), {'title': 'By token', 'content': 'Content'})
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(created.data['author'], self.user.pk)
+
+    def test_delete_revokes_the_token(self):
+        self.use(self.issue().data['token'])
+
+        response = self.client.delete(self.url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        response = self.client.get(reverse('post-create'))
+        # Session authentication goes first, so failures answer 403 like failed Basic auth
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['detail'], 'Token revoked.')
+
+    def test_delete_without_a_token(self):
+        response = self.client.delete(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_team_change_revokes_the_tokens(self):
+        self.use(self.issue().data['token'])
+        self.user.team = 'blue'
+        self.user.save()
+
+        response = self.client.get(reverse('post-create'))
+        self.assertEqual(response.data['detail'], 'Token revoked.')
+        # Un token nuevo lleva el equipo nuevo
+        self.use(self.issue().data['token'])
+        self.assertEqual(self.client.get(reverse('post-create')).status_code, status.HTTP_200_OK)
+
+    def test_login_does_not_revoke_the_tokens(self):
+        self.use(self.issue().data['token'])
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.get(reverse('post-create')).status_code, status.HTTP_200_OK)
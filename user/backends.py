@@ -0,0 +1,80 @@
+"""
+Authentication backend that keeps the rows of logged-in users in a per-process LRU.
+
+AuthenticationMiddleware resolves request.user through the backend's get_user()
+on every request that reads it, which is one CustomUser query per request.
+CachedModelBackend answers it from an LRU of the fields the views, permission
+checks, the admin site and session verification read: id, username, team,
+is_admin, is_superuser, is_staff and the password hash (the session auth hash
+is derived from it). Each request gets a new CustomUser built from the cached
+values, with the other fields deferred, so views never share an instance.
+Reading a deferred field (last_login, created_at, modified_at) runs a query
+each time, so request code should not read them from request.user.
+
+Sessions created before this backend existed carry ModelBackend's path, so
+settings.AUTHENTICATION_BACKENDS keeps ModelBackend to load their users.
+CachedModelBackend stops a failed login itself, so ModelBackend never checks
+the password a second time.
+
+user.signals drops a user's entry when the row is saved or deleted, which also
+covers password changes, and again once the transaction commits, since another
+request may cache the old row in between. The process that made the change
+sees it on the next request. Other processes see it after settings.USER_CACHE_TTL seconds at
+most; rows changed with queryset.update() or raw SQL wait for the TTL as well.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.exceptions import PermissionDenied
+from django.db import DEFAULT_DB_ALIAS
+
+from avanzatech_blog.lru import LRUCache
+from user.models import CustomUser
+
+# In the model's field order, which from_db() expects
+CACHED_FIELDS = tuple(field.attname for field in CustomUser._meta.concrete_fields
+                      if field.attname in {'id', 'username', 'team', 'is_admin', 'is_superuser', 'is_staff',
+                                           'password'})
+
+_users = None
+
+
+def get_user_cache():
+    """
+    Return the process-wide user LRU, created on first use from USER_CACHE_MAX_ENTRIES and USER_CACHE_TTL.
+    """
+    global _users
+    if _users is None:
+        _users = LRUCache(maxsize=settings.USER_CACHE_MAX_ENTRIES, ttl=settings.USER_CACHE_TTL)
+    return _users
+
+
+def forget_user(user_id):
+    if _users is not None:
+        _users.delete(user_id)
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose get_user() reads the user from get_user_cache(), querying only on a miss.
+
+    The permission methods are ModelBackend's.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        user = super().authenticate(request, username=username, password=password, **kwargs)
+        if user is None:
+            # PermissionDenied ends authenticate(): ModelBackend, listed after this backend,
+            # would hash the password again for the same answer
+            raise PermissionDenied
+        return user
+
+    def get_user(self, user_id):
+        cache = get_user_cache()
+        row = cache.get(user_id)
+        if row is None:
+            row = CustomUser._default_manager.filter(pk=user_id).values_list(*CACHED_FIELDS).first()
+            if row is None:
+                return None
+            cache.set(user_id, row)
+        user = CustomUser.from_db(DEFAULT_DB_ALIAS, CACHED_FIELDS, row)
+        return user if self.user_can_authenticate(user) else None
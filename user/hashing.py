@@ -0,0 +1,23 @@
+import django
+from django.apps import apps
+from django.contrib.auth.hashers import get_hasher, make_password
+
+
+def hash_passwords(passwords, algorithm):
+    """
+    Hash a list of passwords with one of settings.PASSWORD_HASHERS.
+
+    Used by the import_users command, also inside its worker processes; this module imports
+    no models so a spawned (not forked) worker can load it before Django is set up.
+
+    Args:
+        passwords (list): Raw passwords.
+        algorithm (str): Hasher algorithm, e.g. 'pbkdf2_sha256'.
+
+    Returns:
+        list: The encoded passwords, in the same order.
+    """
+    if not apps.ready:
+        django.setup()
+    hasher = get_hasher(algorithm)
+    return [make_password(password, hasher=hasher) for password in passwords]
@@ -0,0 +1,153 @@
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from django.contrib.auth.hashers import get_hasher
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email, validate_slug
+from django.db import transaction
+
+from user.hashing import hash_passwords
+from user.models import CustomUser
+
+# Hashers cheap enough that sending the passwords to other processes costs more than hashing them
+FAST_HASHERS = {'md5', 'unsalted_md5', 'unsalted_sha1', 'sha1'}
+TRUE_VALUES = {'1', 'true', 'yes'}
+
+
+def read_rows(path, file_format):
+    """
+    Yield the rows of a CSV file with a header (as dicts) or of a JSON Lines file (as unparsed lines).
+
+    JSON lines are parsed by the caller, so one malformed line does not end the import.
+    """
+    with open(path, newline='', encoding='utf-8') as source:
+        if file_format == 'csv':
+            yield from csv.DictReader(source)
+        else:
+            yield from (line for line in source if line.strip())
+
+
+class Command(BaseCommand):
+    """
+    Creates users in bulk from a CSV or JSON Lines file.
+
+    Each row needs username, password and team; is_admin is optional. Rows are validated
+    like CustomUserManager.create_user, hashed with the chosen hasher and inserted with
+    bulk_create, one batch per transaction. Slow hashers (the default PBKDF2) are spread
+    over a process pool. Invalid rows and usernames that already exist are reported and skipped.
+    """
+    help = 'Import users from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV file with a header row, or a .jsonl file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format; taken from the extension when omitted')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Users hashed and inserted per batch')
+        parser.add_argument('--hasher', default='default',
+                            help="Algorithm of one of settings.PASSWORD_HASHERS, e.g. 'pbkdf2_sha256' or 'md5'")
+        parser.add_argument('--workers', type=int, default=0,
+                            help='Hashing processes; 0 uses one per CPU for slow hashers and none for fast ones')
+        parser.add_argument('--skip-password-validation', action='store_true',
+                            help='Do not run AUTH_PASSWORD_VALIDATORS (e.g. for load-test fixtures)')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        try:
+            algorithm = get_hasher(options['hasher']).algorithm
+        except ValueError as error:
+            raise CommandError(error)
+        workers = options['workers']
+        if workers == 0:
+            workers = 1 if algorithm in FAST_HASHERS else os.cpu_count() or 1
+        self.validate_passwords = not options['skip_password_validation']
+
+        created = skipped = 0
+        rows = self.valid_rows(path, file_format)
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                new_users, existing = self.import_batch(batch, algorithm, executor, workers)
+                created += new_users
+                skipped += existing
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        skipped += self.invalid
+        self.stdout.write(self.style.SUCCESS(f'Created {created} users, skipped {skipped}'))
+
+    def valid_rows(self, path, file_format):
+        """
+        Yield cleaned rows, writing the reason for every rejected one to stderr.
+        """
+        self.invalid = 0
+        seen = set()
+        try:
+            source = read_rows(path, file_format)
+            for number, row in enumerate(source, start=1):
+                try:
+                    row = self.clean_row(json.loads(row) if isinstance(row, str) else row)
+                    if row['username'] in seen:
+                        raise ValidationError('Duplicated username in the file')
+                except (ValidationError, ValueError, AttributeError) as error:
+                    self.invalid += 1
+                    self.stderr.write(f'Row {number}: {self.describe(error)}')
+                    continue
+                seen.add(row['username'])
+                yield row
+        except OSError as error:
+            raise CommandError(error)
+
+    def clean_row(self, row):
+        username = CustomUser.objects.normalize_email((row.get('username') or '').strip())
+        team = (row.get('team') or '').strip()
+        password = row.get('password') or ''
+        if not username:
+            raise ValidationError('Users must have a username')
+        if not team:
+            raise ValidationError('Users must have a team')
+        validate_email(username)
+        validate_slug(team)
+        if self.validate_passwords:
+            validate_password(password)
+        is_admin = str(row.get('is_admin', '')).strip().lower() in TRUE_VALUES
+        return {'username': username, 'team': team, 'password': password, 'is_admin': is_admin}
+
+    def import_batch(self, batch, algorithm, executor, workers):
+        """
+        Hash and insert one batch.
+
+        Returns:
+            tuple: (users created, rows skipped because the username exists).
+        """
+        existing = set(CustomUser.objects.filter(username__in=[row['username'] for row in batch])
+                       .values_list('username', flat=True))
+        batch = [row for row in batch if row['username'] not in existing]
+        passwords = [row['password'] for row in batch]
+        if executor is None:
+            hashes = hash_passwords(passwords, algorithm)
+        else:
+            size = max(1, -(-len(passwords) // workers))
+            chunks = [passwords[start:start + size] for start in range(0, len(passwords), size)]
+            hashes = [hashed for chunk in executor.map(hash_passwords, chunks, [algorithm] * len(chunks))
+                      for hashed in chunk]
+        users = [CustomUser(username=row['username'], team=row['team'], password=hashed,
+                            is_admin=row['is_admin'])
+                 for row, hashed in zip(batch, hashes)]
+        with transaction.atomic():
+            CustomUser.objects.bulk_create(users)
+        return len(users), len(existing)
+
+    def describe(self, error):
+        if isinstance(error, ValidationError):
+            return '; '.join(error.messages)
+        return f'{type(error).__name__}: {error}'
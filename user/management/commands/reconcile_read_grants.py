@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from avanzatech_blog.grants import EDIT_CODENAME, READ_CODENAME, get_post_permissions
+from user.models import CustomUser
+
+
+class Command(BaseCommand):
+    """
+    Grants view_post to every user that holds change_post but not view_post.
+
+    New grants are reconciled by a signal; this command repairs rows written before
+    the signal existed (or written with raw SQL) without waiting for the user's next request.
+    """
+    help = 'Give the read permission on posts to every user with the edit permission'
+
+    def handle(self, *args, **options):
+        permissions = get_post_permissions()
+        if not permissions:
+            raise CommandError('The change_post and view_post permissions do not exist; run migrate first')
+        user_ids = list(CustomUser.objects
+                        .filter(user_permissions=permissions[EDIT_CODENAME])
+                        .exclude(user_permissions=permissions[READ_CODENAME])
+                        .values_list('pk', flat=True))
+        if user_ids:
+            # Goes through the related manager so the cached grant sets are invalidated
+            permissions[READ_CODENAME].user_set.add(*user_ids)
+        self.stdout.write(self.style.SUCCESS(f'Granted read permission to {len(user_ids)} users'))
@@ -1,3 +1,21 @@
 from rest_framework import serializers
 
+from user.models import CustomUser
 
+
+class AuthorSerializer(serializers.ModelSerializer):
+    """
+    Compact read-only representation of a user shown as the author of a post.
+    """
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'username', 'team')
+        read_only_fields = fields
+
+
+class TokenRequestSerializer(serializers.Serializer):
+    """
+    Credentials exchanged for a bearer token at ``user/token/``.
+    """
+    username = serializers.CharField()
+    password = serializers.CharField(trim_whitespace=False)
@@ -0,0 +1,82 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from avanzatech_blog.grants import (EDIT_CODENAME, READ_CODENAME, get_post_permissions,
+                                    invalidate_user_grants, reset_post_permissions)
+from avanzatech_blog.tokens import revoke_user_tokens
+from user.backends import CACHED_FIELDS, forget_user
+from user.models import CustomUser
+
+
+@receiver(m2m_changed, sender=CustomUser.user_permissions.through)
+def sync_user_grants(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Keep the cached grant sets in line with user_permissions and add the read
+    permission whenever the edit permission on posts is granted.
+    """
+    if action == 'pre_clear' and reverse:
+        # Permission.user_set.clear() does not report which users lost the permission
+        invalidate_user_grants(list(instance.user_set.values_list('pk', flat=True)))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if reverse:
+        user_ids = pk_set or ()
+        permission_ids = {instance.pk}
+    else:
+        user_ids = [instance.pk]
+        permission_ids = pk_set or set()
+    invalidate_user_grants(user_ids)
+
+    if action == 'post_add':
+        permissions = get_post_permissions()
+        if permissions and permissions[EDIT_CODENAME].pk in permission_ids:
+            read_permission = permissions[READ_CODENAME]
+            if reverse:
+                read_permission.user_set.add(*user_ids)
+            else:
+                instance.user_permissions.add(read_permission)
+
+
+@receiver(post_delete, sender=CustomUser)
+def drop_deleted_user_grants(sender, instance, **kwargs):
+    user_id = instance.pk
+    invalidate_user_grants([user_id])
+    revoke_user_tokens(user_id)
+    forget_user(user_id)
+    # A request may cache the row or get a token again before the delete commits
+    transaction.on_commit(lambda: (forget_user(user_id), revoke_user_tokens(user_id)))
+
+
+@receiver(post_save, sender=CustomUser)
+def forget_cached_user(sender, instance, update_fields=None, **kwargs):
+    # A new user may reuse the id of a row that was rolled back, so creations drop it too
+    if update_fields is None or set(CACHED_FIELDS) & set(update_fields):
+        user_id = instance.pk
+        forget_user(user_id)
+        # A request may cache the old row again before the save commits
+        transaction.on_commit(lambda: forget_user(user_id))
+
+
+@receiver(post_save, sender=CustomUser)
+def revoke_stale_tokens(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Revoke the user's bearer tokens when a field they carry or the password may have changed.
+
+    A save without update_fields may change any of them. The revocation is
+    recorded again once the transaction commits: a token issued in between
+    carries the old values and would be newer than the first one.
+    """
+    if created or (update_fields is not None and
+                   not {'team', 'is_admin', 'password'} & set(update_fields)):
+        return
+    user_id = instance.pk
+    revoke_user_tokens(user_id)
+    transaction.on_commit(lambda: revoke_user_tokens(user_id))
+
+
+@receiver(post_migrate)
+def forget_post_permissions(sender, **kwargs):
+    reset_post_permissions()
@@ -1,6 +1,14 @@
+from django.conf import settings
 from django.contrib.auth import authenticate, login
 from django.shortcuts import render, redirect
 from django.contrib.auth import logout
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from avanzatech_blog.tokens import TokenAuthentication, issue_token, revoke_token
+from user.serializers import TokenRequestSerializer
 
 
 def login_view(request):
@@ -27,3 +35,33 @@ def logout_view(request):
 #Logout view, log out and redirect to the home
 
 
+class TokenView(APIView):
+    """
+    Issue and revoke the bearer tokens of API clients (see avanzatech_blog.tokens).
+
+    POST exchanges a username and password for a token; DELETE revokes the token sent
+    in the Authorization header.
+    """
+    authentication_classes = [TokenAuthentication]
+    permission_classes = []
+
+    def perform_authentication(self, request):
+        # Only DELETE reads the token, so a stale one does not stop a client from getting a new one
+        pass
+
+    def post(self, request):
+        serializer = TokenRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = authenticate(request, **serializer.validated_data)
+        if user is None:
+            raise AuthenticationFailed('Invalid credentials.')
+        return Response({'token': issue_token(user), 'token_type': TokenAuthentication.keyword,
+                         'expires_in': settings.API_TOKEN_TTL})
+
+    def delete(self, request):
+        if request.auth is None:
+            raise NotAuthenticated()
+        revoke_token(request.auth)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+